@@ -1,6 +1,12 @@
 # backend/blog_generator/admin.py
 
 from django.contrib import admin
-from .models import BlogPost
+from .models import BlogPost, GenerationBatch, GenerationEvent, GenerationJob, GenerationStep, GenerationTrace, RequestBand
 
-admin.site.register(BlogPost)
\ No newline at end of file
+admin.site.register(BlogPost)
+admin.site.register(GenerationJob)
+admin.site.register(GenerationTrace)
+admin.site.register(GenerationEvent)
+admin.site.register(GenerationStep)
+admin.site.register(GenerationBatch)
+admin.site.register(RequestBand)
@@ -1,17 +1,34 @@
 # backend/blog_generator/agents/blog_agents.py
 
-from crewai import Agent, Task, Crew
+from crewai import Agent, Task
+from crewai.types.usage_metrics import UsageMetrics
+from crewai.utilities.llm_utils import create_llm
 from langchain_community.tools import DuckDuckGoSearchRun
-from langchain_core.tools import BaseTool
-from bs4 import BeautifulSoup
-import requests
-from typing import Optional, List, Dict, Any, Union, Type
+from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+from langchain_core.tools import BaseTool, StructuredTool
+from typing import Optional, List, Dict, Any, Union, Type, Callable
 from pydantic import BaseModel, Field
+import asyncio
 import json
 import graphviz
 from io import BytesIO
 import base64
+import threading
+import time
 from langchain.tools import Tool
+from django.conf import settings
+from .checkpoints import get_task_checkpoints, run_key
+from .corpus import get_research_corpus
+from .extractors import get_extractor
+from .fetcher import get_fetcher
+from .passages import get_passage_ranker
+from .llm_cache import CachingLLM, CachingStreamingLLM, get_llm_cache
+from .registry import AgentRegistry, get_agent_registry
+from .research import ResearchFanOut
+from .scheduler import DAGScheduler, TaskGraph
+from .search_cache import get_search_cache
+from .streaming import use_token_sink
+from ..utils.tracing import current_tracer, traced_tool
 
 # Input models for tools
 class SearchInput(BaseModel):
@@ -21,6 +38,7 @@ class SearchInput(BaseModel):
 class ScraperInput(BaseModel):
     """Input for scraper tool"""
     url: str = Field(description="The URL to scrape")
+    query: str = Field(default="", description="What you want to learn from the page; only the most relevant passages are returned")
 
 class DiagramInput(BaseModel):
     """Input for diagram tool"""
@@ -32,44 +50,178 @@ class WebSearchTool(BaseTool):
     name: str = "Web Search"
     description: str = "Search for content across the internet"
     args_schema: Type[BaseModel] = SearchInput
-    search_engine: DuckDuckGoSearchRun = Field(default_factory=DuckDuckGoSearchRun)
+    # Anything with a run(query) method; tests can pass a local stub
+    search_engine: Any = Field(default_factory=DuckDuckGoSearchRun)
+    # Anything with a results(query, max_results) method returning link/title/snippet dicts
+    results_engine: Any = Field(default_factory=DuckDuckGoSearchAPIWrapper)
+    cache: Any = Field(default=None, exclude=True)
 
     def __init__(self, **data):
         super().__init__(**data)
-        self.search_engine = DuckDuckGoSearchRun()
+        if self.cache is None:
+            self.cache = get_search_cache()
 
     def _run(self, query: str) -> str:
-        """Run web search with proper error handling"""
+        """Run web search with proper error handling, serving repeated queries from the cache"""
+        cached = self.cache.get(query)
+        if cached is not None:
+            return cached
         try:
-            return self.search_engine.run(query)
+            result = self.search_engine.run(query)
         except Exception as e:
             return f"Error performing search: {str(e)}"
+        self.cache.set(query, result)
+        return result
+
+    def search_results(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
+        """Structured results (link, title, snippet) for a query; errors propagate"""
+        cache_key = f"results:{max_results}:{query}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+        results = self.results_engine.results(query, max_results)
+        self.cache.set(cache_key, json.dumps(results))
+        return results
+
+    # The DuckDuckGo clients only block, so the async variants run them in a thread
+    async def _arun(self, query: str) -> str:
+        return await asyncio.to_thread(self._run, query)
+
+    async def asearch_results(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
+        return await asyncio.to_thread(self.search_results, query, max_results)
 
 class WebScraperTool(BaseTool):
     name: str = "Web Scraper"
     description: str = "Scrape content from websites"
     args_schema: Type[BaseModel] = ScraperInput
+    fetcher: Any = Field(default=None, exclude=True)
+    extractor: Any = Field(default=None, exclude=True)
+    # Characters returned per page when passages are not ranked
+    max_chars: int = 5000
+    # With a ranker, pages are extracted up to extract_chars and packed into max_tokens
+    ranker: Any = Field(default=None, exclude=True)
+    extract_chars: int = 50000
+    max_tokens: int = 800
+    # Every extracted page is also kept in the local research corpus
+    corpus: Any = Field(default=None, exclude=True)
 
     def __init__(self, **data):
         super().__init__(**data)
+        if self.fetcher is None:
+            self.fetcher = get_fetcher()
+        if self.extractor is None:
+            self.extractor = get_extractor()
+        if self.corpus is None:
+            self.corpus = get_research_corpus()
+        if self.ranker is None:
+            config = settings.BLOG_CONTEXT_PACKING
+            self.ranker = get_passage_ranker()
+            if 'extract_chars' not in data:
+                self.extract_chars = config.get('EXTRACT_CHARS', 50000)
+            if 'max_tokens' not in data:
+                self.max_tokens = config.get('MAX_TOKENS', 800)
+
+    def extract_text(self, html: str) -> str:
+        """Reduce an HTML document to its main readable text"""
+        return self.extractor.extract(html, self.extract_chars if self.ranker else self.max_chars)
 
-    def _run(self, url: str) -> str:
+    def relevant_text(self, text: str, query: str = '') -> str:
+        """The passages of a page most relevant to the query, within the token budget"""
+        if self.ranker is None:
+            return text[:self.max_chars]
+        return self.ranker.pack(text, query, self.max_tokens)
+
+    def remember(self, url: str, text: str):
+        if self.corpus is None or not text:
+            return
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            for script in soup(["script", "style"]):
-                script.decompose()
-                
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            return text[:5000]
+            self.corpus.add_page(url, text)
+        except Exception as e:
+            print(f"Research corpus write error: {str(e)}")
+
+    def _run(self, url: str, query: str = "") -> str:
+        try:
+            result = self.fetcher.fetch(url)
+            text = self.extract_text(result.text)
         except Exception as e:
             return f"Error scraping {url}: {str(e)}"
+        self.remember(url, text)
+        return self.relevant_text(text, query)
+
+    async def _arun(self, url: str, query: str = "") -> str:
+        result = (await self.fetcher.afetch_many([url]))[0]
+        if result.error:
+            return f"Error scraping {url}: {result.error}"
+        text = self.extract_text(result.text)
+        self.remember(url, text)
+        return self.relevant_text(text, query)
+
+    def scrape_many(self, urls: List[str], queries: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Scrape several URLs concurrently, returning text (or an error message) per URL.
+        queries optionally maps a URL to the query its passages are ranked against.
+        """
+        queries = queries or {}
+        scraped = {}
+        for result in self.fetcher.fetch_many(urls):
+            if result.error:
+                scraped[result.url] = f"Error scraping {result.url}: {result.error}"
+            else:
+                text = self.extract_text(result.text)
+                self.remember(result.url, text)
+                scraped[result.url] = self.relevant_text(text, queries.get(result.url, ''))
+        return scraped
+
+    async def ascrape_many(self, urls: List[str], queries: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Async scrape_many: all pages are fetched on the event loop"""
+        queries = queries or {}
+        scraped = {}
+        for result in await self.fetcher.afetch_many(urls):
+            if result.error:
+                scraped[result.url] = f"Error scraping {result.url}: {result.error}"
+            else:
+                text = self.extract_text(result.text)
+                self.remember(result.url, text)
+                scraped[result.url] = self.relevant_text(text, queries.get(result.url, ''))
+        return scraped
+
+class LocalResearchTool(BaseTool):
+    name: str = "Local Research"
+    description: str = "Search previously scraped pages, falling back to a web search"
+    args_schema: Type[BaseModel] = SearchInput
+    search_tool: Any = Field(default=None, exclude=True)
+    corpus: Any = Field(default=None, exclude=True)
+    max_results: int = 5
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        if self.search_tool is None:
+            self.search_tool = WebSearchTool()
+        if self.corpus is None:
+            self.corpus = get_research_corpus()
+
+    def _run(self, query: str) -> str:
+        """Answer from fresh corpus pages; on a miss or only stale pages, search the web"""
+        hits = []
+        if self.corpus is not None:
+            try:
+                hits = self.corpus.search(query, self.max_results)
+            except Exception as e:
+                print(f"Research corpus search error: {str(e)}")
+        if not hits:
+            return f"No local research found; web search results:\n{self.search_tool._run(query)}"
+
+        lines = []
+        for index, hit in enumerate(hits, start=1):
+            fetched = time.strftime('%Y-%m-%d', time.gmtime(hit['fetched_at']))
+            lines.append(f"[{index}] {hit['url']} (fetched {fetched})")
+            lines.append(hit['text'])
+            lines.append("")
+        return '\n'.join(lines)
+
+    async def _arun(self, query: str) -> str:
+        # SQLite and the web search fallback both block
+        return await asyncio.to_thread(self._run, query)
 
 class DiagramGenerator(BaseTool):
     name: str = "Diagram Generator"
@@ -149,45 +301,75 @@ class DiagramGenerator(BaseTool):
                 'description': description
             }
 
+class GenerationError(Exception):
+    """A blog generation failed; completed tasks stay checkpointed for a resume"""
+
 # Main Blog Crew Agent
 class BlogCrewAgent:
     """Agent for generating blog content using CrewAI"""
+
+    # Pipeline stages, in the order their tasks are created
+    STAGES = ['research', 'image_curation', 'organizing', 'writing']
     
-    def __init__(self):
-        self.tools = self.create_tools()
+    def __init__(self, registry: Optional[AgentRegistry] = None):
+        # Tools and agent templates are built once per process and reused
+        self.registry = registry if registry is not None else get_agent_registry(self)
+        self.tools = self.registry.tools
+        # Wall time of the last generate_blog call, split into setup and kickoff
+        self.last_timings: Dict[str, float] = {}
         
     def create_tools(self):
         """Create and initialize all required tools"""
         search_tool = WebSearchTool()
         scraper_tool = WebScraperTool()
+        local_tool = LocalResearchTool(
+            search_tool=search_tool,
+            corpus=scraper_tool.corpus,
+            max_results=settings.BLOG_RESEARCH_CORPUS.get('RESULTS', 5)
+        )
         diagram_tool = DiagramGenerator()
         
-        # Convert tools to CrewAI format
+        # Convert tools to CrewAI format; each call is timed by the current tracer
         return [
+            Tool(
+                name="Local Research",
+                func=traced_tool("Local Research", local_tool._run),
+                coroutine=traced_tool("Local Research", local_tool._arun),
+                description="Search previously scraped pages first; falls back to a web search when nothing fresh is stored. Use before Web Search"
+            ),
             Tool(
                 name="Web Search",
-                func=search_tool._run,
+                func=traced_tool("Web Search", search_tool._run),
+                coroutine=traced_tool("Web Search", search_tool._arun),
                 description="Search for content across the internet"
             ),
-            Tool(
+            # Structured so agents can pass the query the page's passages are ranked against
+            StructuredTool.from_function(
                 name="Web Scraper",
-                func=scraper_tool._run,
-                description="Scrape content from websites"
+                func=traced_tool("Web Scraper", scraper_tool._run),
+                coroutine=traced_tool("Web Scraper", scraper_tool._arun),
+                description="Scrape content from websites; pass a query to get only the relevant passages",
+                args_schema=ScraperInput
             ),
             Tool(
                 name="Diagram Generator",
-                func=diagram_tool._run,
+                func=traced_tool("Diagram Generator", diagram_tool._run),
                 description="Generate technical diagrams in Mermaid format"
             )
         ]
 
     def create_agents(self, tools):
         """Create all required agents with proper tools"""
+        # Every agent answers repeated prompts from the LLM response cache
+        base_llm = create_llm()
+        response_cache = get_llm_cache()
+
         researcher = Agent(
             role='Research Specialist',
             goal='Gather comprehensive information and identify topics needing visual aids',
             backstory="""Expert researcher skilled at finding information and identifying 
             where visuals would enhance understanding.""",
+            llm=CachingLLM.from_llm(base_llm, response_cache),
             tools=tools,
             verbose=True
         )
@@ -197,6 +379,7 @@ class BlogCrewAgent:
             goal='Find and create appropriate visuals with proper metadata',
             backstory="""Visual content specialist who excels at finding relevant images 
             and creating technical diagrams. Ensures proper attribution and formatting.""",
+            llm=CachingLLM.from_llm(base_llm, response_cache),
             tools=tools,
             verbose=True
         )
@@ -206,6 +389,7 @@ class BlogCrewAgent:
             goal='Organize research and visual content into a coherent structure',
             backstory="""Content strategist who excels at organizing information and 
             integrating visuals effectively.""",
+            llm=CachingLLM.from_llm(base_llm, response_cache),
             tools=tools,
             verbose=True
         )
@@ -215,19 +399,27 @@ class BlogCrewAgent:
             goal='Create engaging blog content with properly integrated visuals',
             backstory="""Professional writer skilled at creating content that seamlessly 
             integrates text and visuals. Expert in markdown formatting.""",
+            # Streams the finished post as it is written when a token sink is set
+            llm=CachingStreamingLLM.from_llm(base_llm, response_cache),
             tools=tools,
             verbose=True
         )
 
         return [researcher, image_curator, organizer, writer]
 
-    def create_tasks(self, agents, title: str, prompts: str):
+    def create_tasks(self, agents, title: str, prompts: str, research_context: str = ''):
         """Create all required tasks with proper agents"""
+        research_notes = ""
+        if research_context:
+            research_notes = f"""
+                Searches and page scrapes for this topic were already run in parallel;
+                start from these findings and only search or scrape to fill real gaps:
+                {research_context}"""
         return [
             Task(
                 description=f"""Research {title} and identify key points needing visuals.
                 Consider these aspects: {prompts}
-                Create a list of topics where images or diagrams would be valuable.""",
+                Create a list of topics where images or diagrams would be valuable.{research_notes}""",
                 agent=agents[0],  # researcher
                 expected_output="""A detailed research report containing:
                 1. Key findings about the topic
@@ -254,18 +446,20 @@ class BlogCrewAgent:
                 }"""
             ),
             Task(
-                description="""Create a content outline integrating research and visuals.
-                Use the structured image data to properly place visuals within the content.""",
+                description="""Create a content outline from the research.
+                Mark where the visuals suggested by the research fit within the content;
+                the curated visuals are produced alongside this outline.""",
                 agent=agents[2],  # organizer
                 expected_output="""A structured blog outline containing:
                 1. Main sections and subsections
                 2. Key points for each section
-                3. Integrated visual placements
+                3. Suggested visual placements
                 4. Flow and transition notes"""
             ),
             Task(
-                description="""Write the blog post in markdown format.
-                Use the structured image and diagram data to properly integrate visuals.""",
+                description="""Write the blog post in markdown format following the outline.
+                Use the structured image and diagram data to properly integrate visuals
+                at the placements marked in the outline.""",
                 agent=agents[3],  # writer
                 expected_output="""A complete blog post in markdown format including:
                 1. Engaging title and introduction
@@ -275,23 +469,125 @@ class BlogCrewAgent:
             )
         ]
 
-    def generate_blog(self, title: str, prompts: str) -> str:
-        """Generate a blog post with the given title and prompts"""
+    def create_task_graph(self, agents, title: str, prompts: str, research_context: str = '') -> TaskGraph:
+        """
+        Declare which task outputs each task needs. Image curation and the
+        outline only depend on the research, so they run concurrently; the
+        writer waits for both.
+        """
+        research, curation, outline, writing = self.create_tasks(agents, title, prompts, research_context)
+        graph = TaskGraph()
+        graph.add('research', research)
+        graph.add('image_curation', curation, inputs=['research'])
+        graph.add('organizing', outline, inputs=['research'])
+        graph.add('writing', writing, inputs=['research', 'image_curation', 'organizing'])
+        return graph
+
+    @staticmethod
+    def record_usage(agents, tracer):
+        """Add the agents' LLM token usage to the tracer"""
+        usage = UsageMetrics()
+        for agent in agents:
+            token_process = getattr(agent, '_token_process', None)
+            if token_process is not None:
+                usage.add_usage_metrics(token_process.get_summary())
+        tracer.add_usage(**{
+            name: getattr(usage, name, 0)
+            for name in ('prompt_tokens', 'completion_tokens', 'cached_prompt_tokens',
+                         'total_tokens', 'successful_requests')
+        })
+
+    def research_fanout(self) -> ResearchFanOut:
+        """The warm parallel research stage shared by all requests"""
+        def build():
+            config = settings.BLOG_RESEARCH
+            return ResearchFanOut(
+                WebSearchTool(),
+                WebScraperTool(),
+                corpus=get_research_corpus(),
+                min_local_hits=settings.BLOG_RESEARCH_CORPUS.get('MIN_LOCAL_HITS', 2),
+                max_queries=config.get('MAX_QUERIES', 6),
+                results_per_query=config.get('RESULTS_PER_QUERY', 3),
+                max_workers=config.get('MAX_WORKERS', 8),
+                max_context_chars=config.get('MAX_CONTEXT_CHARS', 12000)
+            )
+        return self.registry.get('research', build)
+
+    def gather_research(self, title: str, prompts: str) -> str:
+        """Run the parallel research stage; on failure the researcher agent works unaided"""
+        if not settings.BLOG_RESEARCH.get('ENABLED', True):
+            return ''
         try:
-            # Create agents with tools
-            agents = self.create_agents(self.tools)
-            
-            # Create tasks
-            tasks = self.create_tasks(agents, title, prompts)
+            # Searches and page fetches share one event loop instead of thread pools
+            return asyncio.run(self.research_fanout().arun(title, prompts))
+        except Exception as e:
+            print(f"Parallel research failed: {str(e)}")
+            return ''
+
+    def generate_blog(self, title: str, prompts: str,
+                      progress_callback: Optional[Callable[[str], None]] = None,
+                      token_callback: Optional[Callable[[str], None]] = None,
+                      checkpoints=None) -> str:
+        """
+        Generate a blog post with the given title and prompts.
+        progress_callback, if given, is called with the comma-separated names of
+        the running stages whenever a stage starts. token_callback, if given,
+        receives the writer's markdown piece by piece as it is generated.
+        checkpoints (load/save/discard, by default the shared TaskCheckpointStore)
+        keeps each task's output so a failed run resumes after its last completed task.
+        """
+        try:
+            tracer = current_tracer()
+            if progress_callback:
+                progress_callback(self.STAGES[0])
+
+            # Checkpoints first: a resumed run with its research already done
+            # must not repeat the searches and scrapes behind it
+            if checkpoints is None:
+                checkpoints = get_task_checkpoints()
+            key = run_key(title, prompts)
+            completed = checkpoints.load(key, self.STAGES)
+
+            # Fan the research searches and scrapes out before the crew starts
+            research_context = '' if 'research' in completed else self.gather_research(title, prompts)
+
+            setup_start = time.perf_counter()
+
+            # Per-request copies of the prebuilt agents
+            agents = self.registry.agents()
             
-            # Create and run crew
-            crew = Crew(
-                agents=agents,
-                tasks=tasks,
-                verbose=True
-            )
+            # Tasks with their declared inputs
+            graph = self.create_task_graph(agents, title, prompts, research_context)
+
+            # Report every stage that is running and time each one
+            running = []
+            running_lock = threading.Lock()
+
+            def on_start(name):
+                with running_lock:
+                    running.append(name)
+                    stage = ','.join(running)
+                if progress_callback:
+                    progress_callback(stage)
+
+            def on_complete(name, output, duration):
+                tracer.record('stage', name, duration)
+                checkpoints.save(key, name, output, duration)
+                with running_lock:
+                    running.remove(name)
+
+            scheduler = DAGScheduler(graph, on_start=on_start, on_complete=on_complete)
+            self.last_timings = {'setup': time.perf_counter() - setup_start}
+            tracer.record('setup', 'crew', self.last_timings['setup'])
 
-            result = crew.kickoff()
+            kickoff_start = time.perf_counter()
+            with use_token_sink(token_callback):
+                outputs = scheduler.run(completed)
+            self.last_timings['kickoff'] = time.perf_counter() - kickoff_start
+            self.record_usage(agents, tracer)
+            result = outputs[graph.sink]
+            # Only failed runs keep checkpoints to resume from
+            checkpoints.discard(key, graph.nodes)
             final_content = str(result)
             
             # Ensure image credits section exists
@@ -301,7 +597,7 @@ class BlogCrewAgent:
             return final_content
             
         except Exception as e:
-            raise Exception(f"Error in blog generation: {str(e)}")
+            raise GenerationError(f"Error in blog generation: {str(e)}") from e
 
 # Test function
 def test_tools():
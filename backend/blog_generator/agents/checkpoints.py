@@ -0,0 +1,101 @@
+# backend/blog_generator/agents/checkpoints.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable
+
+from .search_cache import normalize_query
+
+
+def run_key(title: str, prompts: str) -> str:
+    """Identifies the runs of one request, so a retry finds its predecessor's checkpoints"""
+    normalized = f"{normalize_query(title)}\x00{normalize_query(prompts)}"
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class TaskCheckpointStore:
+    """
+    Output of every task of a run, saved as soon as the task completes.
+    A run that fails part way leaves its checkpoints behind and the next
+    run of the same request resumes after the last completed task; a
+    successful run clears them. Unlike the caches, checkpoints are never
+    evicted to make room; only those of runs abandoned longer than the TTL
+    are removed.
+    """
+    table = 'run_checkpoints'
+
+    def __init__(self, path: str, ttl: float = 24 * 3600):
+        self.path = str(path)
+        self.ttl = ttl
+        self._local = threading.local()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                run_key TEXT NOT NULL,
+                name TEXT NOT NULL,
+                output TEXT NOT NULL,
+                duration REAL NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (run_key, name)
+            );
+            CREATE INDEX IF NOT EXISTS {self.table}_created_at ON {self.table} (created_at);
+        """)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # sqlite3 connections may not be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def load(self, key: str, names: Iterable[str]) -> Dict[str, str]:
+        """Saved outputs of the named tasks of a run"""
+        names = list(names)
+        if not names:
+            return {}
+        rows = self.connection.execute(
+            f"SELECT name, output FROM {self.table} WHERE run_key = ? AND created_at >= ? "
+            f"AND name IN ({', '.join('?' * len(names))})",
+            (key, time.time() - self.ttl, *names)
+        )
+        return dict(rows)
+
+    def save(self, key: str, name: str, output: str, duration: float = 0):
+        now = time.time()
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO {self.table} (run_key, name, output, duration, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, name, output, duration, now)
+        )
+        self.connection.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (now - self.ttl,))
+
+    def discard(self, key: str, names: Iterable[str]):
+        names = list(names)
+        if names:
+            self.connection.execute(
+                f"DELETE FROM {self.table} WHERE run_key = ? AND name IN ({', '.join('?' * len(names))})",
+                (key, *names)
+            )
+
+
+_checkpoints = None
+_checkpoints_lock = threading.Lock()
+
+
+def get_task_checkpoints() -> TaskCheckpointStore:
+    """Return the process-wide task checkpoint store configured in settings"""
+    global _checkpoints
+    with _checkpoints_lock:
+        if _checkpoints is None:
+            from django.conf import settings
+            config = settings.BLOG_TASK_CHECKPOINTS
+            _checkpoints = TaskCheckpointStore(config['PATH'], ttl=config.get('TTL', 24 * 3600))
+        return _checkpoints
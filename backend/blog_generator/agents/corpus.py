@@ -0,0 +1,220 @@
+# backend/blog_generator/agents/corpus.py
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .research import normalize_url
+from ..utils.tracing import trace_count
+
+_TERMS = re.compile(r'\w+')
+# A chunk's rowid is its page id shifted left by CHUNK_BITS plus its index,
+# so a page's chunks are one rowid range of the index
+CHUNK_BITS = 16
+# Very common words are left out of queries; they only add noise to the ranking
+STOPWORDS = frozenset("""
+a an and are as at be by for from how in is it of on or that the this to was what when where
+which who why will with about into than then there these those your you i we our
+""".split())
+
+
+def query_terms(text: str) -> List[str]:
+    terms = []
+    for term in _TERMS.findall(text.lower()):
+        if term not in STOPWORDS and term not in terms:
+            terms.append(term)
+    return terms
+
+
+def split_chunks(text: str, chunk_chars: int = 1200) -> List[str]:
+    """Split text on paragraph and line breaks into chunks of about chunk_chars"""
+    chunks = []
+    current = ''
+    for block in re.split(r'\n\s*\n|\n', text):
+        block = block.strip()
+        if not block:
+            continue
+        if current and len(current) + len(block) + 1 > chunk_chars:
+            chunks.append(current)
+            current = ''
+        while len(block) > chunk_chars:
+            chunks.append(block[:chunk_chars])
+            block = block[chunk_chars:]
+        current = f"{current}\n{block}" if current else block
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class ResearchCorpus:
+    """
+    Every scraped page kept in SQLite (URL, fetch time, extracted text)
+    and split into chunks indexed with FTS5, so recurring topics can be
+    researched locally before searching the web. The oldest pages are
+    evicted beyond max_pages.
+    """
+
+    def __init__(self, path: str, max_age: float = 7 * 24 * 3600,
+                 chunk_chars: int = 1200, max_pages: int = 50000):
+        self.path = str(path)
+        self.max_age = max_age
+        self.chunk_chars = chunk_chars
+        self.max_pages = max_pages
+        self._local = threading.local()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._create_tables()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # sqlite3 connections may not be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def _create_tables(self):
+        connection = self.connection
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(corpus_pages)")]
+        if columns and 'id' not in columns:
+            # Chunks used to be keyed by URL; the corpus is only a cache of
+            # scraped pages, so the old layout is rebuilt by later scrapes
+            connection.executescript("""
+                DROP TABLE corpus_pages;
+                DROP TABLE IF EXISTS corpus_chunks;
+            """)
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS corpus_pages (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                text TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS corpus_pages_fetched_at ON corpus_pages (fetched_at);
+            CREATE VIRTUAL TABLE IF NOT EXISTS corpus_chunks USING fts5(
+                chunk,
+                tokenize = 'porter unicode61'
+            );
+        """)
+
+    def _delete_chunks(self, page_id: int):
+        self.connection.execute(
+            "DELETE FROM corpus_chunks WHERE rowid >= ? AND rowid < ?",
+            (page_id << CHUNK_BITS, (page_id + 1) << CHUNK_BITS)
+        )
+
+    def add_page(self, url: str, text: str):
+        """Store or refresh a page and re-index its chunks"""
+        if not text:
+            return
+        url = normalize_url(url)
+        now = time.time()
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT id FROM corpus_pages WHERE url = ?", (url,)).fetchone()
+            if row is not None:
+                page_id = row[0]
+                self._delete_chunks(page_id)
+                connection.execute(
+                    "UPDATE corpus_pages SET text = ?, fetched_at = ? WHERE id = ?",
+                    (text, now, page_id)
+                )
+            else:
+                page_id = connection.execute(
+                    "INSERT INTO corpus_pages (url, text, fetched_at) VALUES (?, ?, ?)",
+                    (url, text, now)
+                ).lastrowid
+            chunks = split_chunks(text, self.chunk_chars)[:1 << CHUNK_BITS]
+            connection.executemany(
+                "INSERT INTO corpus_chunks (rowid, chunk) VALUES (?, ?)",
+                [((page_id << CHUNK_BITS) + index, chunk) for index, chunk in enumerate(chunks)]
+            )
+            evicted = [row[0] for row in connection.execute(
+                "SELECT id FROM corpus_pages ORDER BY fetched_at DESC LIMIT -1 OFFSET ?",
+                (self.max_pages,)
+            )]
+            for old_id in evicted:
+                self._delete_chunks(old_id)
+                connection.execute("DELETE FROM corpus_pages WHERE id = ?", (old_id,))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def get_page(self, url: str) -> Optional[str]:
+        """Text of a fresh stored page, or None"""
+        row = self.connection.execute(
+            "SELECT text FROM corpus_pages WHERE url = ? AND fetched_at >= ?",
+            (normalize_url(url), time.time() - self.max_age)
+        ).fetchone()
+        return row[0] if row else None
+
+    def search(self, query: str, limit: int = 5, min_coverage: float = 0.5) -> List[Dict]:
+        """
+        Best matching chunks of fresh pages, ranked by BM25. A chunk must
+        contain at least min_coverage of the query's terms to count.
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+        match = ' OR '.join(f'"{term}"' for term in terms)
+        rows = self.connection.execute(
+            "SELECT p.url, c.chunk, p.fetched_at, bm25(corpus_chunks) AS score "
+            f"FROM corpus_chunks AS c JOIN corpus_pages AS p ON p.id = c.rowid >> {CHUNK_BITS} "
+            "WHERE corpus_chunks MATCH ? AND p.fetched_at >= ? "
+            "ORDER BY score LIMIT ?",
+            (match, time.time() - self.max_age, limit * 4)
+        ).fetchall()
+
+        hits = []
+        seen_urls = set()
+        for url, chunk, fetched_at, score in rows:
+            # The index matches stemmed variants; 5-letter prefixes approximate that here
+            prefixes = {word[:5] for word in query_terms(chunk)}
+            coverage = sum(term[:5] in prefixes for term in terms) / len(terms)
+            if coverage < min_coverage or url in seen_urls:
+                continue
+            seen_urls.add(url)
+            hits.append({'url': url, 'text': chunk, 'fetched_at': fetched_at, 'score': -score})
+            if len(hits) == limit:
+                break
+
+        trace_count('corpus_hits' if hits else 'corpus_misses')
+        return hits
+
+    def stats(self) -> Dict[str, int]:
+        pages = self.connection.execute("SELECT COUNT(*) FROM corpus_pages").fetchone()[0]
+        fresh = self.connection.execute(
+            "SELECT COUNT(*) FROM corpus_pages WHERE fetched_at >= ?",
+            (time.time() - self.max_age,)
+        ).fetchone()[0]
+        return {'pages': pages, 'fresh_pages': fresh}
+
+
+_corpus = None
+_corpus_lock = threading.Lock()
+
+
+def get_research_corpus() -> Optional[ResearchCorpus]:
+    """Return the process-wide research corpus configured in settings, or None when disabled"""
+    global _corpus
+    from django.conf import settings
+    config = settings.BLOG_RESEARCH_CORPUS
+    if not config.get('ENABLED', True):
+        return None
+    with _corpus_lock:
+        if _corpus is None:
+            _corpus = ResearchCorpus(
+                config['PATH'],
+                max_age=config.get('MAX_AGE', 7 * 24 * 3600),
+                chunk_chars=config.get('CHUNK_CHARS', 1200),
+                max_pages=config.get('MAX_PAGES', 50000)
+            )
+        return _corpus
@@ -0,0 +1,259 @@
+# backend/blog_generator/agents/extractors.py
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Type
+
+from bs4 import BeautifulSoup
+
+# Elements that never hold article text
+SKIP_TAGS = {
+    'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe', 'head',
+    'nav', 'header', 'footer', 'aside', 'form', 'button', 'select', 'textarea',
+}
+
+# Elements that start a new block of text
+BLOCK_TAGS = {
+    'p', 'div', 'section', 'article', 'main', 'li', 'ul', 'ol', 'dl', 'dt', 'dd',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'pre', 'blockquote', 'table', 'tr', 'td',
+    'th', 'figcaption', 'br', 'hr',
+}
+
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+# Elements whose items are judged together: a list item or table cell is
+# often short, but a list or table of them is worth keeping unless it is
+# mostly links (a menu)
+CONTAINER_TAGS = {'ul', 'ol', 'dl', 'table'}
+
+# Table cells; a row's cells are joined into one block
+CELL_TAGS = {'td', 'th'}
+
+# Elements that mark the main content of a page
+MAIN_TAGS = {'main', 'article'}
+
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'param', 'source', 'track', 'wbr',
+}
+
+# Elements that wrap the whole document and are never skipped as chrome
+ROOT_TAGS = {'html', 'body'}
+
+# A class or id token that names navigation, ads or other page chrome:
+# "sidebar" or "sidebar-left", but not a modifier such as "has-sidebar"
+BOILERPLATE_RE = re.compile(
+    r'(nav|navbar|menu|footer|header|sidebar|cookie|banner|comments?|share|'
+    r'social|advert|ads?|promo|breadcrumbs?|related|subscribe|newsletter|popup|modal)($|[_-])',
+    re.IGNORECASE
+)
+
+
+def is_boilerplate(attributes: Dict[str, str]) -> bool:
+    """True if any whole class/id token of an element marks page chrome"""
+    tokens = f"{attributes.get('class') or ''} {attributes.get('id') or ''}".split()
+    return any(BOILERPLATE_RE.match(token) for token in tokens)
+
+
+class TextExtractor:
+    """Turns an HTML document into at most max_chars of readable text"""
+
+    def extract(self, html: str, max_chars: int = 5000) -> str:
+        raise NotImplementedError
+
+
+class SoupExtractor(TextExtractor):
+    """The original extraction: full BeautifulSoup parse, then get_text()"""
+
+    def extract(self, html: str, max_chars: int = 5000) -> str:
+        soup = BeautifulSoup(html, 'html.parser')
+
+        for script in soup(["script", "style"]):
+            script.decompose()
+
+        text = soup.get_text()
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        text = ' '.join(chunk for chunk in chunks if chunk)
+
+        return text[:max_chars]
+
+
+class _ContentParser(HTMLParser):
+    """
+    Event-based parser that collects text blocks while skipping page chrome.
+    Once a <main> or <article> element is seen, blocks collected before it are
+    dropped and only main content counts towards the budget. The blocks of a
+    list or table are kept or dropped as one group.
+    """
+
+    def __init__(self, max_chars: int, min_block_chars: int, max_link_density: float):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.min_block_chars = min_block_chars
+        self.max_link_density = max_link_density
+
+        self.blocks: List[str] = []
+        self.collected = 0
+        self.done = False
+
+        self._skip_stack: List[str] = []
+        self._main_depth = 0
+        self._seen_main = False
+        self._link_depth = 0
+        self._block: List[str] = []
+        self._block_link_chars = 0
+        self._block_is_heading = False
+        self._container_depth = 0
+        self._group: List[str] = []
+        self._group_link_chars = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_stack:
+            # Track nesting of the skipped element's own tag to find its end
+            if tag == self._skip_stack[-1] and tag not in VOID_TAGS:
+                self._skip_stack.append(tag)
+            return
+
+        if tag in SKIP_TAGS or (
+            tag not in MAIN_TAGS and tag not in ROOT_TAGS and is_boilerplate(dict(attrs))
+        ):
+            if tag not in VOID_TAGS:
+                self._flush()
+                self._skip_stack.append(tag)
+            return
+
+        if tag in CONTAINER_TAGS:
+            self._flush()
+            self._container_depth += 1
+        elif tag in MAIN_TAGS:
+            self._flush()
+            if not self._seen_main:
+                self._seen_main = True
+                self.blocks = []
+                self.collected = 0
+            self._main_depth += 1
+        elif tag in CELL_TAGS:
+            if ''.join(self._block).strip():
+                self._block.append(' | ')
+        elif tag in BLOCK_TAGS:
+            self._flush()
+        if tag in HEADING_TAGS:
+            self._block_is_heading = True
+        if tag == 'a':
+            self._link_depth += 1
+
+    def handle_endtag(self, tag):
+        if self._skip_stack:
+            if tag == self._skip_stack[-1]:
+                self._skip_stack.pop()
+            return
+
+        if (tag in BLOCK_TAGS and tag not in CELL_TAGS) or tag in MAIN_TAGS:
+            self._flush()
+        if tag in CONTAINER_TAGS and self._container_depth:
+            self._container_depth -= 1
+            if not self._container_depth:
+                self._flush_group()
+        if tag in MAIN_TAGS and self._main_depth:
+            self._main_depth -= 1
+        if tag == 'a' and self._link_depth:
+            self._link_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_stack or self.done:
+            return
+        self._block.append(data)
+        if self._link_depth:
+            self._block_link_chars += len(data.strip())
+
+    def _flush(self):
+        text = ' '.join(''.join(self._block).split())
+        link_chars = self._block_link_chars
+        is_heading = self._block_is_heading
+        self._block = []
+        self._block_link_chars = 0
+        self._block_is_heading = False
+
+        if not text or self.done:
+            return
+        # After a main element was seen, ignore anything outside it
+        if self._seen_main and not self._main_depth:
+            return
+        if self._container_depth:
+            self._group.append(text)
+            self._group_link_chars += link_chars
+            return
+        if not is_heading:
+            if len(text) < self.min_block_chars:
+                return
+            if link_chars / len(text) > self.max_link_density:
+                return
+        self._add(text)
+
+    def _flush_group(self):
+        """Keep a finished list or table unless it is mostly links"""
+        group = self._group
+        link_chars = self._group_link_chars
+        self._group = []
+        self._group_link_chars = 0
+
+        chars = sum(len(text) for text in group)
+        if not chars or link_chars / chars > self.max_link_density:
+            return
+        for text in group:
+            if self.done:
+                return
+            self._add(text)
+
+    def _add(self, text: str):
+        self.blocks.append(text)
+        self.collected += len(text) + 1
+        if self.collected >= self.max_chars:
+            self.done = True
+
+    def close(self):
+        super().close()
+        self._flush()
+        self._flush_group()
+
+
+class StreamingExtractor(TextExtractor):
+    """
+    Feeds the document to an event-based parser in chunks, skips non-content
+    elements as they stream past, drops link-heavy and tiny blocks, prefers
+    <main>/<article> content and stops parsing once the budget is filled.
+    """
+
+    def __init__(self, chunk_size: int = 16 * 1024, min_block_chars: int = 25,
+                 max_link_density: float = 0.5):
+        self.chunk_size = chunk_size
+        self.min_block_chars = min_block_chars
+        self.max_link_density = max_link_density
+
+    def extract(self, html: str, max_chars: int = 5000) -> str:
+        parser = _ContentParser(max_chars, self.min_block_chars, self.max_link_density)
+        for start in range(0, len(html), self.chunk_size):
+            parser.feed(html[start:start + self.chunk_size])
+            if parser.done:
+                break
+        else:
+            parser.close()
+        return '\n'.join(parser.blocks)[:max_chars]
+
+
+EXTRACTORS: Dict[str, Type[TextExtractor]] = {
+    'soup': SoupExtractor,
+    'streaming': StreamingExtractor,
+}
+
+
+def get_extractor(name: str = None) -> TextExtractor:
+    """Build the extractor named in settings (or the given name)"""
+    if name is None:
+        from django.conf import settings
+        name = getattr(settings, 'BLOG_SCRAPER_EXTRACTOR', 'streaming')
+    try:
+        return EXTRACTORS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown text extractor: {name}")
@@ -0,0 +1,306 @@
+# backend/blog_generator/agents/fetcher.py
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..utils.render_cache import DiskCache
+from ..utils.tracing import trace_count
+
+
+class FetchResult:
+    """Outcome of fetching one URL"""
+
+    def __init__(self, url: str, status: int = 0, text: str = '',
+                 from_cache: bool = False, error: Optional[str] = None):
+        self.url = url
+        self.status = status
+        self.text = text
+        self.from_cache = from_cache
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 300
+
+    def __repr__(self):
+        return f"FetchResult({self.url!r}, status={self.status}, from_cache={self.from_cache})"
+
+
+def parse_cache_control(header: str) -> Dict[str, Optional[str]]:
+    """Split a Cache-Control header into a directive -> value dict"""
+    directives = {}
+    for part in header.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, value = part.partition('=')
+        directives[name.strip().lower()] = value.strip().strip('"') or None
+    return directives
+
+
+class HTTPCache:
+    """
+    On-disk HTTP response cache. Stores the body and the validators
+    (ETag, Last-Modified) plus a freshness deadline from Cache-Control max-age.
+    Works with requests and httpx responses alike. Entries not written for
+    max_age seconds are removed, then the least recently written ones until
+    the cache fits in max_bytes. Pruning runs on the first write and then
+    after every max_bytes / 20 (at least 1 MiB) written, so the directory can
+    exceed max_bytes by that much in between.
+    """
+
+    def __init__(self, location, max_bytes: int = 256 * 1024 * 1024, max_age: float = 7 * 24 * 3600):
+        self.store = DiskCache(location)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._prune_after = max(max_bytes // 20, 1024 * 1024)
+        self._written = self._prune_after
+        self._prune_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def get(self, url: str):
+        """Return (meta, body) for a cached URL, or None"""
+        key = self.make_key(url)
+        meta = self.store.get(f"{key}.meta")
+        body = self.store.get(f"{key}.body")
+        if meta is None or body is None:
+            return None
+        return json.loads(meta), body
+
+    def set(self, url: str, response):
+        """Store a 200 response unless it forbids caching"""
+        directives = parse_cache_control(response.headers.get('Cache-Control', ''))
+        if 'no-store' in directives:
+            return
+        meta = {
+            'url': url,
+            'status': response.status_code,
+            'encoding': response.encoding,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        meta['expires_at'] = self.expires_at(directives)
+        key = self.make_key(url)
+        self.store.set(f"{key}.body", response.content)
+        self.store.set(f"{key}.meta", json.dumps(meta).encode('utf-8'))
+        self._wrote(len(response.content))
+
+    def _wrote(self, size: int):
+        with self._prune_lock:
+            self._written += size
+            if self._written < self._prune_after:
+                return
+            self._written = 0
+        self.prune()
+
+    def prune(self):
+        """Remove expired entries, then the oldest ones beyond max_bytes"""
+        # An entry is its .body and .meta files; its age is that of the newer one
+        entries = {}
+        for root, _, files in os.walk(self.store.location):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                key = name.split('.', 1)[0]
+                mtime, size, paths = entries.get(key, (0, 0, []))
+                entries[key] = (max(mtime, stat.st_mtime), size + stat.st_size, paths + [path])
+
+        cutoff = time.time() - self.max_age
+        total = sum(size for _, size, _ in entries.values())
+        for mtime, size, paths in sorted(entries.values()):
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            for path in paths:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            total -= size
+            trace_count('fetch_cache_evictions')
+
+    def refresh(self, url: str, meta: dict, response):
+        """Update the freshness of a cached entry after a 304"""
+        directives = parse_cache_control(response.headers.get('Cache-Control', ''))
+        meta['expires_at'] = self.expires_at(directives)
+        self.store.set(f"{self.make_key(url)}.meta", json.dumps(meta).encode('utf-8'))
+
+    @staticmethod
+    def expires_at(directives: Dict[str, Optional[str]]) -> float:
+        # Without max-age every reuse is revalidated with a conditional request
+        if 'no-cache' in directives:
+            return 0
+        max_age = directives.get('s-maxage') or directives.get('max-age')
+        try:
+            return time.time() + int(max_age) if max_age else 0
+        except ValueError:
+            return 0
+
+
+class Fetcher:
+    """
+    Shared HTTP client for the scraper: one keep-alive connection pool,
+    a cap on concurrent requests per host, an optional on-disk HTTP cache
+    and a batch API that fetches many URLs concurrently. afetch and
+    afetch_many do the same on an event loop with httpx, without a thread
+    per request in flight.
+    """
+
+    def __init__(self, cache: Optional[HTTPCache] = None, max_per_host: int = 4,
+                 pool_size: int = 20, timeout: float = 10, max_workers: int = 8):
+        self.cache = cache
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.pool_size = pool_size
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._host_limits = {}
+        self._host_limits_lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_limits[host]
+
+    def _conditional_headers(self, cached) -> Dict[str, str]:
+        headers = {}
+        if cached:
+            meta, _ = cached
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    @staticmethod
+    def _fresh(cached) -> bool:
+        return bool(cached) and time.time() < cached[0].get('expires_at', 0)
+
+    def _result(self, url: str, cached, response) -> FetchResult:
+        """Turn a requests or httpx response into a result, updating the cache"""
+        if cached and response.status_code == 304:
+            meta, body = cached
+            self.cache.refresh(url, meta, response)
+            return self._cached_result(url, meta, body)
+
+        trace_count('fetch_cache_misses')
+        response.raise_for_status()
+        if self.cache and response.status_code == 200:
+            self.cache.set(url, response)
+        return FetchResult(url, response.status_code, response.text)
+
+    def fetch(self, url: str) -> FetchResult:
+        """Fetch a URL, serving fresh or revalidated copies from the cache. Raises on HTTP errors."""
+        cached = self.cache.get(url) if self.cache else None
+        if self._fresh(cached):
+            return self._cached_result(url, *cached)
+
+        with self._host_limit(url):
+            response = self.session.get(url, headers=self._conditional_headers(cached), timeout=self.timeout)
+        return self._result(url, cached, response)
+
+    async def afetch(self, url: str, client: httpx.AsyncClient,
+                     host_limits: Dict[str, asyncio.Semaphore]) -> FetchResult:
+        """Async fetch through the given client; host_limits holds one semaphore per host"""
+        # The cache is on disk; its reads and writes run in a thread, off the event loop
+        cached = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+        if self._fresh(cached):
+            return self._cached_result(url, *cached)
+
+        host = urlparse(url).netloc.lower()
+        limit = host_limits.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        async with limit:
+            response = await client.get(url, headers=self._conditional_headers(cached))
+        return await asyncio.to_thread(self._result, url, cached, response)
+
+    @staticmethod
+    def _cached_result(url: str, meta: dict, body: bytes) -> FetchResult:
+        trace_count('fetch_cache_hits')
+        text = body.decode(meta.get('encoding') or 'utf-8', errors='replace')
+        return FetchResult(url, meta.get('status', 200), text, from_cache=True)
+
+    def fetch_many(self, urls: List[str]) -> List[FetchResult]:
+        """Fetch URLs concurrently; results keep the input order and carry errors instead of raising"""
+        def fetch_one(url):
+            try:
+                return self.fetch(url)
+            except Exception as e:
+                return FetchResult(url, error=str(e))
+
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            # Run each fetch in a copy of the caller's context so tracing still applies
+            futures = [
+                executor.submit(contextvars.copy_context().run, fetch_one, url)
+                for url in urls
+            ]
+            return [future.result() for future in futures]
+
+    async def afetch_many(self, urls: List[str]) -> List[FetchResult]:
+        """Async fetch_many: every URL in flight at once, limited only per host"""
+        async def fetch_one(url):
+            try:
+                return await self.afetch(url, client, host_limits)
+            except Exception as e:
+                return FetchResult(url, error=str(e))
+
+        if not urls:
+            return []
+        host_limits = {}
+        # A client lives on one event loop, so each batch opens its own
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=self.pool_size)
+        ) as client:
+            return list(await asyncio.gather(*(fetch_one(url) for url in urls)))
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> Fetcher:
+    """Return the process-wide fetcher configured in settings"""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            from django.conf import settings
+            config = settings.BLOG_FETCH
+            _fetcher = Fetcher(
+                cache=HTTPCache(
+                    config['CACHE_DIR'],
+                    max_bytes=config.get('CACHE_MAX_BYTES', 256 * 1024 * 1024),
+                    max_age=config.get('CACHE_MAX_AGE', 7 * 24 * 3600)
+                ) if config.get('CACHE_DIR') else None,
+                max_per_host=config.get('MAX_PER_HOST', 4),
+                pool_size=config.get('POOL_SIZE', 20),
+                timeout=config.get('TIMEOUT', 10),
+                max_workers=config.get('MAX_WORKERS', 8)
+            )
+        return _fetcher
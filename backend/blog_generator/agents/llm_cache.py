@@ -0,0 +1,105 @@
+# backend/blog_generator/agents/llm_cache.py
+
+import json
+import threading
+from typing import Optional
+
+from crewai import LLM
+
+from .search_cache import SearchCache
+from .streaming import FinalAnswerFilter, StreamingLLM, current_token_sink
+
+
+class LLMResponseCache(SearchCache):
+    """
+    SQLite-backed cache of LLM completions keyed by a hash of the exact
+    request (model, sampling settings and messages), with a TTL and a
+    bound on the number of entries.
+    """
+    table = 'llm_cache'
+    # The request is already hashed into the key; don't keep a second copy
+    store_query = False
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        # Prompts are cached verbatim; case and spacing change the completion
+        return query
+
+
+class CachingLLM(LLM):
+    """
+    LLM that answers repeated requests from an LLMResponseCache. Replaying a
+    failed run therefore costs nothing for the calls that already succeeded,
+    and a warm cache makes runs deterministic for offline benchmarks.
+    """
+    response_cache: Optional[LLMResponseCache] = None
+
+    @classmethod
+    def from_llm(cls, llm: LLM, response_cache: Optional[LLMResponseCache] = None) -> 'CachingLLM':
+        """Caching copy of an existing LLM, keeping its model and settings"""
+        caching = cls.__new__(cls)
+        caching.__dict__.update(llm.__dict__)
+        caching.response_cache = response_cache
+        return caching
+
+    def cache_key(self, messages) -> str:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        return json.dumps({
+            'model': self.model,
+            'temperature': self.temperature,
+            'top_p': self.top_p,
+            'stop': self.stop,
+            'max_tokens': self.max_tokens or self.max_completion_tokens,
+            'messages': messages,
+        }, sort_keys=True)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        # Native tool calls execute functions, so their results are never replayed
+        if self.response_cache is None or tools:
+            return super().call(messages, tools, callbacks, available_functions)
+
+        key = self.cache_key(messages)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            self.replay(cached)
+            return cached
+
+        response = super().call(messages, tools, callbacks, available_functions)
+        if isinstance(response, str) and response:
+            self.response_cache.set(key, response)
+        return response
+
+    def replay(self, cached: str):
+        """Called with a completion answered from the cache"""
+
+
+class CachingStreamingLLM(CachingLLM, StreamingLLM):
+    """Cached LLM whose completions, cached or not, are streamed to the token sink"""
+
+    def replay(self, cached: str):
+        # Only the writer streams; the other agents' answers never reach the sink
+        sink = current_token_sink()
+        if sink is not None:
+            FinalAnswerFilter(sink).feed(cached)
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the process-wide LLM response cache configured in settings, or None when disabled"""
+    global _llm_cache
+    from django.conf import settings
+    config = settings.BLOG_LLM_CACHE
+    if not config.get('ENABLED', True):
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMResponseCache(
+                config['PATH'],
+                ttl=config.get('TTL', 7 * 24 * 3600),
+                max_entries=config.get('MAX_ENTRIES', 20000)
+            )
+        return _llm_cache
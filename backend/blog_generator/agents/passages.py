@@ -0,0 +1,101 @@
+# backend/blog_generator/agents/passages.py
+
+import math
+import re
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from .corpus import query_terms, split_chunks
+
+# Rough size of a token in English text; good enough for budgeting prompts
+CHARS_PER_TOKEN = 4
+
+_SUFFIXES = ('ing', 'ed', 'es', 's')
+
+
+def stem(word: str) -> str:
+    """Strip a common English suffix so 'scaling' and 'scales' match 'scale'"""
+    for suffix in _SUFFIXES:
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class PassageRanker:
+    """
+    Splits a page's extracted text into passages, scores each against a
+    query with BM25 (the passages of the page are the collection), and
+    packs the best ones into a token budget. Without usable query terms
+    the start of the page is kept, as before.
+    """
+
+    def __init__(self, passage_chars: int = 600, k1: float = 1.5, b: float = 0.75):
+        self.passage_chars = passage_chars
+        self.k1 = k1
+        self.b = b
+
+    def passages(self, text: str) -> List[str]:
+        return split_chunks(text, self.passage_chars)
+
+    def rank(self, text: str, query: str) -> List[Tuple[float, int, str]]:
+        """(score, position, passage) for every passage, best first"""
+        passages = self.passages(text)
+        terms = {stem(term) for term in query_terms(query)}
+        if not passages or not terms:
+            return [(0.0, index, passage) for index, passage in enumerate(passages)]
+
+        counts = [Counter(stem(word) for word in re.findall(r'\w+', passage.lower())) for passage in passages]
+        lengths = [sum(count.values()) for count in counts]
+        average = sum(lengths) / len(lengths) or 1
+        frequency = {term: sum(1 for count in counts if term in count) for term in terms}
+
+        scored = []
+        for index, (passage, count, length) in enumerate(zip(passages, counts, lengths)):
+            score = 0.0
+            for term in terms:
+                tf = count.get(term, 0)
+                if not tf:
+                    continue
+                idf = math.log(1 + (len(passages) - frequency[term] + 0.5) / (frequency[term] + 0.5))
+                score += idf * tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / average))
+            scored.append((score, index, passage))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return scored
+
+    def pack(self, text: str, query: str, max_tokens: int) -> str:
+        """
+        The most relevant passages that fit in max_tokens, best first.
+        Passages that match no query term are only used while nothing
+        else matched at all.
+        """
+        budget = max_tokens * CHARS_PER_TOKEN
+        ranked = self.rank(text, query)
+        if ranked and ranked[0][0] > 0:
+            ranked = [item for item in ranked if item[0] > 0]
+        else:
+            ranked.sort(key=lambda item: item[1])
+
+        packed = []
+        used = 0
+        for _, _, passage in ranked:
+            if used + len(passage) > budget:
+                if not packed:
+                    packed.append(passage[:budget])
+                    used = budget
+                continue
+            packed.append(passage)
+            used += len(passage) + 2
+        return '\n\n'.join(packed)
+
+
+def get_passage_ranker() -> Optional[PassageRanker]:
+    """The ranker configured in settings, or None when context packing is disabled"""
+    from django.conf import settings
+    config = settings.BLOG_CONTEXT_PACKING
+    if not config.get('ENABLED', True):
+        return None
+    return PassageRanker(passage_chars=config.get('PASSAGE_CHARS', 600))
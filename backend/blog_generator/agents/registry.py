@@ -0,0 +1,69 @@
+# backend/blog_generator/agents/registry.py
+
+import threading
+from typing import Any, Callable, List
+
+
+class AgentRegistry:
+    """
+    Process-wide warm tools and agent templates.
+
+    Tools (search engine, fetcher, caches) are built once and shared; they are
+    safe to call from several threads. Agents keep per-run state once a crew
+    starts, so each request gets cheap copies of prebuilt templates that
+    reuse the template's LLM client and tool instances.
+    """
+
+    def __init__(self, builder):
+        # builder provides create_tools() and create_agents(tools)
+        self.builder = builder
+        self._lock = threading.Lock()
+        self._tools = None
+        self._templates = None
+        self._extras = {}
+
+    def _ensure_built(self):
+        if self._templates is not None:
+            return
+        with self._lock:
+            if self._templates is None:
+                tools = self.builder.create_tools()
+                self._templates = self.builder.create_agents(tools)
+                self._tools = tools
+
+    @property
+    def tools(self) -> List[Any]:
+        self._ensure_built()
+        return self._tools
+
+    def agents(self) -> List[Any]:
+        """Fresh per-request copies of the agent templates"""
+        self._ensure_built()
+        return [template.copy() for template in self._templates]
+
+    def get(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Return a named warm object, building it with factory on first use"""
+        with self._lock:
+            if name not in self._extras:
+                self._extras[name] = factory()
+            return self._extras[name]
+
+    def reset(self):
+        """Drop the warm instances; they are rebuilt on next use"""
+        with self._lock:
+            self._tools = None
+            self._templates = None
+            self._extras = {}
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_agent_registry(builder) -> AgentRegistry:
+    """Return the process-wide registry, created with the first builder that asks for it"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = AgentRegistry(builder)
+        return _registry
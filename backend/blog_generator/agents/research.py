@@ -0,0 +1,198 @@
+# backend/blog_generator/agents/research.py
+
+import asyncio
+import hashlib
+import re
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from .search_cache import normalize_query
+from ..utils.tracing import current_tracer
+
+
+def decompose_prompt(title: str, prompts: str, max_queries: int = 6) -> List[str]:
+    """
+    Split a title and free-form prompts into independent search queries:
+    the title itself plus one query per aspect mentioned in the prompts.
+    """
+    aspects = re.split(r'[\n;]|(?<=[.?!])\s+|,\s+', prompts)
+    queries = [title]
+    for aspect in aspects:
+        aspect = aspect.strip(' \t-*•.')
+        if len(aspect) > 3:
+            queries.append(f"{title} {aspect}")
+
+    unique = []
+    seen = set()
+    for query in queries:
+        key = normalize_query(query)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(query)
+    return unique[:max_queries]
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used to deduplicate URLs found by different queries"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+
+class ResearchFanOut:
+    """
+    Parallel research stage, run on an event loop by arun: runs every
+    sub-query's search concurrently, scrapes the union of result pages
+    concurrently, then merges and deduplicates everything into a single
+    context for the agents. Sub-queries with at least min_local_hits fresh
+    pages in the research corpus are answered from it and skip the web.
+    """
+
+    def __init__(self, search_tool, scraper_tool, max_queries: int = 6,
+                 results_per_query: int = 3, max_workers: int = 8,
+                 max_context_chars: int = 12000,
+                 decomposer: Optional[Callable[[str, str], List[str]]] = None,
+                 corpus=None, min_local_hits: int = 2):
+        self.search_tool = search_tool
+        self.scraper_tool = scraper_tool
+        self.max_queries = max_queries
+        self.results_per_query = results_per_query
+        self.max_workers = max_workers
+        self.max_context_chars = max_context_chars
+        self.decomposer = decomposer
+        self.corpus = corpus
+        self.min_local_hits = min_local_hits
+
+    def queries(self, title: str, prompts: str) -> List[str]:
+        if self.decomposer:
+            return self.decomposer(title, prompts)[:self.max_queries]
+        return decompose_prompt(title, prompts, self.max_queries)
+
+    def search_local(self, queries: List[str]) -> Dict[str, List[Dict]]:
+        """Fresh corpus hits for the queries that have enough of them"""
+        if self.corpus is None:
+            return {}
+        local = {}
+        for query in queries:
+            try:
+                hits = self.corpus.search(query, self.results_per_query)
+            except Exception as e:
+                print(f"Research corpus search failed for {query!r}: {str(e)}")
+                continue
+            if len(hits) >= self.min_local_hits:
+                local[query] = hits
+        return local
+
+    def stored_page(self, url: str) -> Optional[str]:
+        if self.corpus is None:
+            return None
+        try:
+            return self.corpus.get_page(url)
+        except Exception as e:
+            print(f"Research corpus read failed for {url}: {str(e)}")
+            return None
+
+    async def asearch_all(self, queries: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        """Run the searches concurrently; a failing query just yields no results"""
+        # Searches run in threads (the search client is blocking); bound how many
+        limit = asyncio.Semaphore(max(1, self.max_workers))
+
+        async def search(query):
+            try:
+                async with limit:
+                    return await self.search_tool.asearch_results(query, self.results_per_query)
+            except Exception as e:
+                print(f"Research search failed for {query!r}: {str(e)}")
+                return []
+
+        results = await asyncio.gather(*(search(query) for query in queries))
+        return dict(zip(queries, results))
+
+    def collect_sources(self, queries, local, results):
+        """
+        Deduplicated sources to scrape and the page text already at hand:
+        corpus hits stand in for search results, their chunks for scraped text.
+        """
+        stored = {}
+        for query, hits in local.items():
+            results[query] = [
+                {'link': hit['url'], 'title': hit['url'], 'snippet': ' '.join(hit['text'].split())[:200]}
+                for hit in hits
+            ]
+            for hit in hits:
+                stored.setdefault(hit['url'], hit['text'])
+
+        # Deduplicate pages found by several queries, keeping first-seen order
+        sources = {}
+        for query in queries:
+            for result in results.get(query, []):
+                link = result.get('link')
+                if not link:
+                    continue
+                sources.setdefault(normalize_url(link), dict(result, query=query))
+
+        # Pages fetched recently by another run are not fetched again
+        for source in sources.values():
+            if source['link'] not in stored:
+                page = self.stored_page(source['link'])
+                if page:
+                    stored[source['link']] = self.scraper_tool.relevant_text(page, source['query'])
+        return sources, stored
+
+    @staticmethod
+    def scrape_plan(sources, stored):
+        """URLs still to scrape, and the sub-query each page's passages are ranked against"""
+        urls = [source['link'] for source in sources.values() if source['link'] not in stored]
+        return urls, {source['link']: source['query'] for source in sources.values()}
+
+    async def arun(self, title: str, prompts: str) -> str:
+        """
+        Gather research for a topic and return it as one merged context
+        string. All searches, then all page fetches, are in flight at once.
+        """
+        tracer = current_tracer()
+        with tracer.span('research', 'fanout'):
+            queries = self.queries(title, prompts)
+            # Corpus reads are blocking SQLite queries; keep them off the event loop
+            with tracer.span('research', 'local'):
+                local = await asyncio.to_thread(self.search_local, queries)
+            with tracer.span('research', 'search'):
+                results = await self.asearch_all([query for query in queries if query not in local])
+
+            sources, stored = await asyncio.to_thread(self.collect_sources, queries, local, results)
+            with tracer.span('research', 'scrape'):
+                scraped = await self.scraper_tool.ascrape_many(*self.scrape_plan(sources, stored))
+            scraped.update(stored)
+
+            return self.merge(title, queries, results, sources, scraped)
+
+    def merge(self, title, queries, results, sources, scraped) -> str:
+        lines = [f"# Pre-gathered research: {title}", "", "## Search results"]
+        for query in queries:
+            lines.append(f"### {query}")
+            for result in results.get(query, []):
+                lines.append(f"- {result.get('title', '')} ({result.get('link', '')}): {result.get('snippet', '')}")
+        lines.extend(["", "## Source excerpts"])
+
+        # Drop failed scrapes and pages whose text duplicates one already included
+        seen_text = set()
+        budget = self.max_context_chars - sum(len(line) + 1 for line in lines)
+        per_source = max(budget // max(len(sources), 1), 500)
+        for index, source in enumerate(sources.values(), start=1):
+            text = scraped.get(source['link'], '')
+            if not text or text.startswith('Error scraping'):
+                continue
+            fingerprint = hashlib.sha1(' '.join(text.lower().split())[:1000].encode('utf-8')).hexdigest()
+            if fingerprint in seen_text:
+                continue
+            seen_text.add(fingerprint)
+
+            if budget < 200:
+                break
+            excerpt = text[:min(per_source, budget)]
+            lines.append(f"[{index}] {source.get('title', '')} ({source['link']})")
+            lines.append(excerpt)
+            lines.append("")
+            budget -= len(excerpt)
+
+        return '\n'.join(lines)[:self.max_context_chars]
@@ -0,0 +1,131 @@
+# backend/blog_generator/agents/scheduler.py
+
+import contextvars
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class TaskNode:
+    """A crew task plus the names of the tasks whose output it needs"""
+
+    def __init__(self, name: str, task: Any, inputs: Iterable[str] = ()):
+        self.name = name
+        self.task = task
+        self.inputs = list(inputs)
+
+
+class TaskGraph:
+    """
+    Tasks with declared inputs. Inputs must already be in the graph when a
+    task is added, so the graph is acyclic by construction.
+    """
+
+    def __init__(self):
+        self.nodes: "OrderedDict[str, TaskNode]" = OrderedDict()
+
+    def add(self, name: str, task: Any, inputs: Iterable[str] = ()) -> TaskNode:
+        if name in self.nodes:
+            raise ValueError(f"Duplicate task name: {name}")
+        node = TaskNode(name, task, inputs)
+        missing = [dependency for dependency in node.inputs if dependency not in self.nodes]
+        if missing:
+            raise ValueError(f"Task {name} depends on unknown tasks: {', '.join(missing)}")
+        self.nodes[name] = node
+        return node
+
+    @property
+    def sink(self) -> str:
+        """Name of the last task added, whose output is the graph's result"""
+        return next(reversed(self.nodes))
+
+    def levels(self) -> List[List[str]]:
+        """Tasks grouped so that each group only depends on earlier groups"""
+        depth: Dict[str, int] = {}
+        for name, node in self.nodes.items():
+            depth[name] = 1 + max((depth[dependency] for dependency in node.inputs), default=-1)
+        levels: List[List[str]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for name, level in depth.items():
+            levels[level].append(name)
+        return levels
+
+
+class DAGScheduler:
+    """
+    Runs a TaskGraph on a thread pool: every task starts as soon as all of
+    its inputs are done, with the inputs' outputs passed as its context.
+    Independent tasks therefore run concurrently.
+    """
+
+    def __init__(self, graph: TaskGraph, max_workers: int = 4,
+                 on_start: Optional[Callable[[str], None]] = None,
+                 on_complete: Optional[Callable[[str, str, float], None]] = None):
+        self.graph = graph
+        self.max_workers = max_workers
+        self.on_start = on_start
+        self.on_complete = on_complete
+
+    def context_for(self, node: TaskNode, outputs: Dict[str, str]) -> str:
+        return '\n\n'.join(outputs[dependency] for dependency in node.inputs)
+
+    def execute(self, node: TaskNode, context: str) -> str:
+        output = node.task.execute_sync(agent=node.task.agent, context=context)
+        return output.raw if hasattr(output, 'raw') else str(output)
+
+    def run(self, completed: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Execute the graph and return every task's output by name.
+        Tasks listed in completed are not run again; their outputs are reused.
+        """
+        outputs: Dict[str, str] = dict(completed or {})
+        pending = [name for name in self.graph.nodes if name not in outputs]
+        running = {}
+
+        def timed(node, context):
+            start = time.perf_counter()
+            result = self.execute(node, context)
+            return result, time.perf_counter() - start
+
+        failure = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while running or (pending and failure is None):
+                # After a failure no new task starts, but the running ones finish
+                ready = [] if failure is not None else [
+                    name for name in pending
+                    if all(dependency in outputs for dependency in self.graph.nodes[name].inputs)
+                ]
+                for name in ready:
+                    pending.remove(name)
+                    node = self.graph.nodes[name]
+                    if self.on_start:
+                        self.on_start(name)
+                    # Copy the caller's context so tracing reaches worker threads
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        timed,
+                        node,
+                        self.context_for(node, outputs)
+                    )
+                    running[future] = name
+
+                if not running:
+                    raise ValueError(f"Tasks can never run: {', '.join(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        failure = failure or error
+                        continue
+                    result, duration = future.result()
+                    outputs[name] = result
+                    # Also for tasks finishing after a sibling failed, so their
+                    # outputs are checkpointed for the next run
+                    if self.on_complete:
+                        self.on_complete(name, result, duration)
+
+        if failure is not None:
+            raise failure
+        return outputs
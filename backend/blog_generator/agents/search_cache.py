@@ -0,0 +1,172 @@
+# backend/blog_generator/agents/search_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from ..utils.tracing import trace_count
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries share an entry"""
+    return ' '.join(query.lower().split())
+
+
+class SearchCache:
+    """
+    SQLite-backed cache of web search results with a TTL and a bound on the
+    number of entries. The database file is shared by every worker process,
+    so results survive restarts and are reused across generations.
+
+    Subclasses store other text results under their own table name.
+    """
+    table = 'search_cache'
+    # Whether the query text is stored next to its key (for inspection)
+    store_query = True
+
+    def __init__(self, path: str, ttl: float = 24 * 3600, max_entries: int = 10000):
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._create_tables()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # sqlite3 connections may not be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def _create_tables(self):
+        table = self.table
+        # The entry count is kept by triggers, so a write can tell whether
+        # the cache is over its bound without counting the table
+        self.connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS {table}_last_access ON {table} (last_access);
+            CREATE INDEX IF NOT EXISTS {table}_created_at ON {table} (created_at);
+            CREATE TABLE IF NOT EXISTS {table}_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO {table}_stats (name, value) SELECT 'entries', COUNT(*) FROM {table};
+            CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {table}_stats (name, value) VALUES ('entries', 1)
+                    ON CONFLICT(name) DO UPDATE SET value = value + 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON {table} BEGIN
+                UPDATE {table}_stats SET value = value - 1 WHERE name = 'entries';
+            END;
+        """)
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return normalize_query(query)
+
+    def make_key(self, query: str) -> str:
+        return hashlib.sha256(self.normalize(query).encode('utf-8')).hexdigest()
+
+    def _count(self, name: str):
+        self.connection.execute(
+            f"INSERT INTO {self.table}_stats (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def get(self, query: str) -> Optional[str]:
+        """Return the cached result for a query, or None on a miss or expired entry"""
+        key = self.make_key(query)
+        now = time.time()
+        row = self.connection.execute(
+            f"SELECT result, created_at FROM {self.table} WHERE key = ?",
+            (key,)
+        ).fetchone()
+
+        if row is None or now - row[1] > self.ttl:
+            self._count('misses')
+            trace_count(f'{self.table}_misses')
+            return None
+
+        self.connection.execute(
+            f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+            (now, key)
+        )
+        self._count('hits')
+        trace_count(f'{self.table}_hits')
+        return row[0]
+
+    def set(self, query: str, result: str):
+        """Store a result and evict expired and least recently used entries"""
+        now = time.time()
+        key = self.make_key(query)
+        connection = self.connection
+        connection.execute(
+            f"INSERT INTO {self.table} (key, query, result, created_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+            "result = excluded.result, created_at = excluded.created_at, last_access = excluded.last_access",
+            (key, self.normalize(query) if self.store_query else key, result, now, now)
+        )
+        connection.execute(
+            f"DELETE FROM {self.table} WHERE created_at < ?",
+            (now - self.ttl,)
+        )
+        entries = connection.execute(
+            f"SELECT value FROM {self.table}_stats WHERE name = 'entries'"
+        ).fetchone()
+        if entries is not None and entries[0] > self.max_entries:
+            connection.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY last_access LIMIT ?)",
+                (entries[0] - self.max_entries,)
+            )
+
+    def delete(self, query: str):
+        self.connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (self.make_key(query),))
+
+    def clear(self):
+        self.connection.execute(f"DELETE FROM {self.table}")
+        self.connection.execute(f"DELETE FROM {self.table}_stats")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters plus the current number of entries"""
+        stats = dict(self.connection.execute(f"SELECT name, value FROM {self.table}_stats"))
+        return {
+            'hits': stats.get('hits', 0),
+            'misses': stats.get('misses', 0),
+            'entries': stats.get('entries', 0),
+        }
+
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache configured in settings"""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            from django.conf import settings
+            config = settings.BLOG_SEARCH_CACHE
+            _search_cache = SearchCache(
+                config['PATH'],
+                ttl=config.get('TTL', 24 * 3600),
+                max_entries=config.get('MAX_ENTRIES', 10000)
+            )
+        return _search_cache
@@ -0,0 +1,122 @@
+# backend/blog_generator/agents/streaming.py
+
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+import litellm
+from crewai import LLM
+
+_token_sink: contextvars.ContextVar = contextvars.ContextVar('blog_token_sink', default=None)
+
+
+def current_token_sink() -> Optional[Callable[[str], None]]:
+    """The callable receiving streamed answer text in this context, if any"""
+    return _token_sink.get()
+
+
+@contextmanager
+def use_token_sink(sink: Optional[Callable[[str], None]]):
+    """Send the answer text of streaming LLM calls made inside the block to sink"""
+    token = _token_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _token_sink.reset(token)
+
+
+class FinalAnswerFilter:
+    """
+    Forwards only the text after the ReAct "Final Answer:" marker, so the
+    agent's thoughts and tool calls never reach the reader.
+    """
+    MARKER = 'Final Answer:'
+
+    def __init__(self, sink: Callable[[str], None]):
+        self.sink = sink
+        self.buffer = ''
+        self.answering = False
+        self.started = False
+
+    def feed(self, text: str):
+        if not self.answering:
+            self.buffer += text
+            index = self.buffer.find(self.MARKER)
+            if index < 0:
+                return
+            self.answering = True
+            text = self.buffer[index + len(self.MARKER):]
+            self.buffer = ''
+
+        if not self.started:
+            text = text.lstrip()
+            if not text:
+                return
+            self.started = True
+        self.sink(text)
+
+
+class StreamingLLM(LLM):
+    """
+    LLM that streams its completion when a token sink is set, forwarding the
+    final answer as it is generated. Without a sink, or for native tool
+    calls, it behaves exactly like crewai's LLM.
+    """
+
+    @classmethod
+    def from_llm(cls, llm: LLM) -> 'StreamingLLM':
+        """Streaming copy of an existing LLM, keeping its model and settings"""
+        streaming = cls.__new__(cls)
+        streaming.__dict__.update(llm.__dict__)
+        return streaming
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        sink = current_token_sink()
+        if sink is None or tools:
+            return super().call(messages, tools, callbacks, available_functions)
+
+        self._validate_call_params()
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        if callbacks:
+            self.set_callbacks(callbacks)
+
+        formatted_messages = self._format_messages_for_provider(messages)
+        params = {
+            "model": self.model,
+            "messages": formatted_messages,
+            "timeout": self.timeout,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "stop": self.stop,
+            "max_tokens": self.max_tokens or self.max_completion_tokens,
+            "seed": self.seed,
+            "api_base": self.api_base,
+            "base_url": self.base_url,
+            "api_version": self.api_version,
+            "api_key": self.api_key,
+            **self.additional_params,
+            "stream": True,
+        }
+        params = {k: v for k, v in params.items() if v is not None}
+
+        answer = FinalAnswerFilter(sink)
+        chunks = []
+        for chunk in litellm.completion(**params):
+            chunks.append(chunk)
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                answer.feed(delta)
+
+        # Rebuild the full response so token usage is still counted
+        response = litellm.stream_chunk_builder(chunks, messages=formatted_messages)
+        usage = getattr(response, 'usage', None)
+        for callback in callbacks or []:
+            if usage and hasattr(callback, 'log_success_event'):
+                callback.log_success_event(
+                    kwargs=params,
+                    response_obj={"usage": usage},
+                    start_time=0,
+                    end_time=0,
+                )
+        return response.choices[0].message.content or ""
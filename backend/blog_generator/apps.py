@@ -0,0 +1,31 @@
+# backend/blog_generator/apps.py
+
+import os
+import sys
+
+from django.apps import AppConfig
+from django.conf import settings
+
+
+def serves_requests() -> bool:
+    """
+    True in a web server process: any WSGI/ASGI server, or the serving child
+    of manage.py runserver. Other management commands (migrate, shell,
+    run_job_workers, ...) start no workers of their own from here.
+    """
+    if os.path.basename(sys.argv[0]) not in ('manage.py', 'django-admin'):
+        return True
+    if sys.argv[1:2] != ['runserver']:
+        return False
+    # The autoreloader's parent process only watches files
+    return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
+
+
+class BlogGeneratorConfig(AppConfig):
+    name = 'blog_generator'
+
+    def ready(self):
+        # Jobs queued before a restart start without waiting for a new request
+        if settings.BLOG_JOB_WORKERS > 0 and serves_requests():
+            from .utils.job_queue import get_job_queue
+            get_job_queue().start()
@@ -0,0 +1,44 @@
+# backend/blog_generator/management/commands/bench_agent_setup.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog_generator.agents.blog_agents import BlogCrewAgent
+from blog_generator.agents.registry import AgentRegistry
+
+
+class Command(BaseCommand):
+    help = "Compare per-request crew setup cost with and without the warm agent registry"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        builder = BlogCrewAgent.__new__(BlogCrewAgent)
+
+        def build_crew(agents):
+            return builder.create_task_graph(agents, "Benchmark title", "Benchmark prompts")
+
+        # Before: every request rebuilt the tools, the agents and the tasks
+        start = time.perf_counter()
+        for _ in range(iterations):
+            tools = builder.create_tools()
+            build_crew(builder.create_agents(tools))
+        cold = (time.perf_counter() - start) / iterations
+
+        # After: tools and agent templates are warm, requests copy agents and build tasks
+        registry = AgentRegistry(builder)
+        start = time.perf_counter()
+        registry.agents()
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            build_crew(registry.agents())
+        warm = (time.perf_counter() - start) / iterations
+
+        self.stdout.write(f"Rebuilt per request:  {cold * 1000:8.1f} ms")
+        self.stdout.write(f"Registry first use:   {first * 1000:8.1f} ms (one-off)")
+        self.stdout.write(f"Registry per request: {warm * 1000:8.1f} ms")
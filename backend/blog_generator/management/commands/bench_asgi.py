@@ -0,0 +1,207 @@
+# backend/blog_generator/management/commands/bench_asgi.py
+
+import asyncio
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import httpx
+import uvicorn
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import override_settings
+
+from blog_generator.agents.fetcher import Fetcher
+from blog_generator.models import GenerationEvent, GenerationJob
+from blog_generator.utils.job_events import done_data
+
+STUB_PAGE = b"<html><body><main><h1>Stub page</h1><p>" + b"Some article text. " * 200 + b"</p></main></body></html>"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small article after the server's delay, like a slow website"""
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(STUB_PAGE)))
+        self.end_headers()
+        self.wfile.write(STUB_PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class PooledWSGIServer(WSGIServer):
+    """wsgiref server with a fixed pool of request threads, like a threaded WSGI worker"""
+    threads = 8
+
+    def server_bind(self):
+        self.pool = ThreadPoolExecutor(max_workers=self.threads)
+        super().server_bind()
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test against local stub servers: scraping many slow pages with the threaded "
+        "fetcher versus the async one, and concurrent event streams served by a threaded "
+        "WSGI server versus uvicorn (ASGI)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delay', type=float, default=0.5, help="Seconds each stub page takes")
+        parser.add_argument('--pages', type=int, default=64, help="Pages scraped in the fetch test")
+        parser.add_argument('--hosts', type=int, default=8, help="Distinct stub hosts (127.0.0.x)")
+        parser.add_argument('--clients', type=int, default=64, help="Concurrent event streams")
+        parser.add_argument('--job-seconds', type=float, default=2.0,
+                            help="How long each streamed job runs before it is done")
+        parser.add_argument('--threads', type=int, default=8, help="WSGI request threads")
+
+    def handle(self, *args, **options):
+        self.bench_fetch(options)
+        self.bench_servers(options)
+
+    def bench_fetch(self, options):
+        stub = StubServer(('', free_port()), StubHandler)
+        stub.delay = options['delay']
+        threading.Thread(target=stub.serve_forever, daemon=True).start()
+        port = stub.server_address[1]
+        urls = [
+            f"http://127.0.0.{index % options['hosts'] + 1}:{port}/page/{index}"
+            for index in range(options['pages'])
+        ]
+        fetcher = Fetcher(max_per_host=4, max_workers=8)
+
+        self.stdout.write(f"Scraping {len(urls)} pages over {options['hosts']} hosts, {options['delay']}s each")
+        for label, fetch in (
+            ('threads', lambda: fetcher.fetch_many(urls)),
+            ('asyncio', lambda: asyncio.run(fetcher.afetch_many(urls))),
+        ):
+            start = time.perf_counter()
+            results = fetch()
+            elapsed = time.perf_counter() - start
+            failed = sum(1 for result in results if result.error)
+            self.stdout.write(f"  {label:<8}{elapsed:8.2f}s {len(results) / elapsed:8.1f} pages/s  {failed} failed")
+        stub.shutdown()
+
+    def bench_servers(self, options):
+        self.stdout.write(
+            f"{options['clients']} concurrent event streams, jobs finishing after "
+            f"{options['job_seconds']}s, plus status requests while they are open"
+        )
+        for label, serve in (('wsgi', self.serve_wsgi), ('asgi', self.serve_asgi)):
+            port = free_port()
+            # What asgi.py sets for a real ASGI deployment
+            with override_settings(BLOG_ASYNC_STREAMING=label == 'asgi'):
+                stop = serve(port, options)
+                try:
+                    self.load(label, f"http://127.0.0.1:{port}", options)
+                finally:
+                    stop()
+
+    def serve_wsgi(self, port, options):
+        PooledWSGIServer.threads = options['threads']
+        server = make_server('127.0.0.1', port, get_wsgi_application(),
+                             server_class=PooledWSGIServer, handler_class=QuietHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server.shutdown
+
+    def serve_asgi(self, port, options):
+        server = uvicorn.Server(uvicorn.Config(
+            get_asgi_application(), host='127.0.0.1', port=port, log_level='warning', lifespan='off'
+        ))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        def stop():
+            server.should_exit = True
+            thread.join()
+        return stop
+
+    def load(self, label, base_url, options):
+        jobs = [
+            GenerationJob.objects.create(title=f"Load test {index}", prompts='load test')
+            for index in range(options['clients'])
+        ]
+
+        def finish_jobs():
+            time.sleep(options['job_seconds'])
+            for job in jobs:
+                job.status = GenerationJob.STATUS_SUCCEEDED
+                job.save(update_fields=['status'])
+                GenerationEvent.objects.create(job=job, kind=GenerationEvent.KIND_DONE, data=done_data(job))
+            connection.close()
+
+        async def stream(client, job):
+            async with client.stream('GET', f"{base_url}/api/jobs/{job.id}/events/") as response:
+                async for _ in response.aiter_bytes():
+                    pass
+            return response.status_code
+
+        async def status(client, job):
+            start = time.perf_counter()
+            response = await client.get(f"{base_url}/api/jobs/{job.id}/")
+            return response.status_code, time.perf_counter() - start
+
+        async def run():
+            limits = httpx.Limits(max_connections=None)
+            async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+                streams = [asyncio.create_task(stream(client, job)) for job in jobs]
+                await asyncio.sleep(0.2)
+                # Short requests issued while every stream is open
+                statuses = await asyncio.gather(*(status(client, job) for job in jobs[:16]))
+                return await asyncio.gather(*streams), statuses
+
+        finisher = threading.Thread(target=finish_jobs)
+        try:
+            start = time.perf_counter()
+            finisher.start()
+            stream_codes, statuses = asyncio.run(run())
+            elapsed = time.perf_counter() - start
+        finally:
+            finisher.join()
+            GenerationJob.objects.filter(id__in=[job.id for job in jobs]).delete()
+
+        ok = sum(1 for code in stream_codes if code == 200) + sum(1 for code, _ in statuses if code == 200)
+        total = len(stream_codes) + len(statuses)
+        latencies = [seconds * 1000 for _, seconds in statuses]
+        self.stdout.write(
+            f"  {label:<8}{elapsed:8.2f}s {total / elapsed:8.1f} req/s  {ok}/{total} ok  "
+            f"status p50 {statistics.median(latencies):.0f} ms, max {max(latencies):.0f} ms"
+        )
@@ -0,0 +1,82 @@
+# backend/blog_generator/management/commands/bench_context_packing.py
+
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_generator.agents.corpus import query_terms
+from blog_generator.agents.extractors import get_extractor
+from blog_generator.agents.passages import PassageRanker, estimate_tokens, stem
+
+
+def term_coverage(text: str, query: str) -> float:
+    """Share of the query's terms that appear in the text"""
+    terms = {stem(term) for term in query_terms(query)}
+    if not terms:
+        return 0.0
+    words = {stem(word) for word in query_terms(text)}
+    return len(terms & words) / len(terms)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the first-5000-characters scraper output with ranked passage packing "
+        "over a directory of saved HTML pages. A page's query is read from a .query file "
+        "next to it, or given with --query."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('corpus', help="Directory containing saved .html pages")
+        parser.add_argument('--query', default='', help="Query for pages without a .query file")
+        parser.add_argument('--max-tokens', type=int, default=800, help="Token budget per page when packing")
+        parser.add_argument('--passage-chars', type=int, default=600)
+        parser.add_argument('--max-chars', type=int, default=5000, help="Truncation length of the old output")
+        parser.add_argument('--extract-chars', type=int, default=50000)
+
+    def handle(self, *args, **options):
+        corpus = options['corpus']
+        if not os.path.isdir(corpus):
+            raise CommandError(f"Not a directory: {corpus}")
+
+        pages = []
+        for name in sorted(os.listdir(corpus)):
+            if not name.endswith(('.html', '.htm')):
+                continue
+            with open(os.path.join(corpus, name), encoding='utf-8', errors='replace') as f:
+                html = f.read()
+            query = options['query']
+            query_path = os.path.join(corpus, os.path.splitext(name)[0] + '.query')
+            if os.path.exists(query_path):
+                with open(query_path, encoding='utf-8') as f:
+                    query = f.read().strip()
+            if query:
+                pages.append((html, query))
+        if not pages:
+            raise CommandError(f"No .html pages with a query found in {corpus}")
+
+        extractor = get_extractor()
+        ranker = PassageRanker(passage_chars=options['passage_chars'])
+        texts = [(extractor.extract(html, options['extract_chars']), query) for html, query in pages]
+
+        strategies = (
+            ('truncate', lambda text, query: text[:options['max_chars']]),
+            ('packed', lambda text, query: ranker.pack(text, query, options['max_tokens'])),
+        )
+        self.stdout.write(f"{len(pages)} pages")
+        self.stdout.write(f"{'strategy':<12}{'tokens/page':>13}{'coverage':>10}{'ms/page':>10}")
+        for label, strategy in strategies:
+            tokens = 0
+            coverage = 0.0
+            start = time.perf_counter()
+            outputs = [strategy(text, query) for text, query in texts]
+            elapsed = time.perf_counter() - start
+            for output, (_, query) in zip(outputs, texts):
+                tokens += estimate_tokens(output)
+                coverage += term_coverage(output, query)
+            self.stdout.write(
+                f"{label:<12}"
+                f"{tokens / len(texts):>13.0f}"
+                f"{coverage / len(texts):>10.2f}"
+                f"{elapsed / len(texts) * 1000:>10.2f}"
+            )
@@ -0,0 +1,93 @@
+# backend/blog_generator/management/commands/bench_extractors.py
+
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_generator.agents.extractors import EXTRACTORS
+
+ARTICLE = "<h1>Cold brew at home</h1><p>Steep coarse grounds in cold water for sixteen hours.</p>"
+SIDEBAR = '<div class="sidebar"><p>Popular posts this week</p></div>'
+SPECS = (
+    "<h2>Stack</h2><ul><li>Python 3.11</li><li>PostgreSQL 16</li><li>Redis 7</li></ul>"
+    "<table><tr><th>Setting</th><th>Value</th></tr><tr><td>work_mem</td><td>64MB</td></tr></table>"
+)
+
+# Built-in pages checked before the benchmark, with the text every extractor
+# must keep: class modifiers on the document's wrappers must not hide the
+# article, and short list items and table cells must survive
+CHECK_PAGES = [
+    ('plain', f"<html><body>{ARTICLE}</body></html>", ["sixteen hours"]),
+    ('body-class', f'<html><body class="post-template has-sidebar">{ARTICLE}{SIDEBAR}</body></html>',
+     ["sixteen hours"]),
+    ('wrapper-class', f'<html><body><div id="page" class="site-wrapper with-nav">{ARTICLE}</div>{SIDEBAR}</body></html>',
+     ["sixteen hours"]),
+    ('article', f"<html><body><nav>Home</nav><article>{ARTICLE}</article></body></html>", ["sixteen hours"]),
+    ('lists-tables', f"<html><body><article>{ARTICLE}{SPECS}</article></body></html>",
+     ["PostgreSQL 16", "Redis 7", "work_mem", "64MB"]),
+]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the scraper's text extractors over a directory of saved HTML pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument('corpus', help="Directory containing saved .html pages")
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per page and extractor")
+        parser.add_argument('--max-chars', type=int, default=5000, help="Character budget per page")
+
+    def handle(self, *args, **options):
+        corpus = options['corpus']
+        if not os.path.isdir(corpus):
+            raise CommandError(f"Not a directory: {corpus}")
+
+        pages = []
+        for name in sorted(os.listdir(corpus)):
+            if name.endswith(('.html', '.htm')):
+                with open(os.path.join(corpus, name), encoding='utf-8', errors='replace') as f:
+                    pages.append(f.read())
+        if not pages:
+            raise CommandError(f"No .html files found in {corpus}")
+
+        checks_passed = self.check_pages(options['max_chars'])
+
+        total_bytes = sum(len(page) for page in pages)
+        self.stdout.write(f"{len(pages)} pages, {total_bytes / 1024:.0f} KiB, {options['repeat']} runs each")
+        self.stdout.write(f"{'extractor':<12}{'ms/page':>10}{'MiB/s':>10}{'chars/page':>12}")
+
+        for name, extractor_class in EXTRACTORS.items():
+            extractor = extractor_class()
+            output_chars = 0
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                for page in pages:
+                    output_chars += len(extractor.extract(page, options['max_chars']))
+            elapsed = time.perf_counter() - start
+
+            runs = len(pages) * options['repeat']
+            self.stdout.write(
+                f"{name:<12}"
+                f"{elapsed / runs * 1000:>10.2f}"
+                f"{total_bytes * options['repeat'] / elapsed / 1024 / 1024:>10.1f}"
+                f"{output_chars / runs:>12.0f}"
+            )
+
+        if not checks_passed:
+            raise CommandError("An extractor lost content on the built-in check pages")
+
+    def check_pages(self, max_chars) -> bool:
+        """Report built-in pages on which an extractor loses content; True if none did"""
+        passed = True
+        for name, extractor_class in EXTRACTORS.items():
+            extractor = extractor_class()
+            lost = []
+            for page_name, html, expected in CHECK_PAGES:
+                text = extractor.extract(html, max_chars)
+                missing = [phrase for phrase in expected if phrase not in text]
+                if missing:
+                    lost.append(f"{page_name} ({', '.join(missing)})")
+            passed = passed and not lost
+            summary = f"lost content on: {'; '.join(lost)}" if lost else 'ok'
+            self.stdout.write(f"check {name:<12}{len(CHECK_PAGES) - len(lost)}/{len(CHECK_PAGES)} {summary}")
+        return passed
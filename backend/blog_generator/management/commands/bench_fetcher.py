@@ -0,0 +1,213 @@
+# backend/blog_generator/management/commands/bench_fetcher.py
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_generator.agents.fetcher import Fetcher, HTTPCache
+
+PAGE = b"<html><body><main><h1>Fixture page</h1><p>" + b"Some article text. " * 400 + b"</p></main></body></html>"
+ETAG = '"fixture-v1"'
+LAST_MODIFIED = 'Mon, 05 Oct 2026 10:00:00 GMT'
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Local website whose pages exercise each caching header; counts what it serves"""
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, delay: float):
+        super().__init__(('127.0.0.1', 0), FixtureHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.hits = {}
+        self.not_modified = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, counter: dict, kind: str):
+        with self.lock:
+            counter[kind] = counter.get(kind, 0) + 1
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """
+    /fresh/*: max-age=60; /etag/*: ETag, revalidated on every use;
+    /modified/*: Last-Modified, revalidated on every use; /nostore/*: no-store;
+    /slow/*: uncacheable page served after the server's delay.
+    """
+
+    def do_GET(self):
+        kind = self.path.split('/')[1]
+        self.server.count(self.server.hits, kind)
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        try:
+            if kind == 'slow':
+                time.sleep(self.server.delay)
+            headers = {
+                'fresh': {'Cache-Control': 'max-age=60'},
+                'etag': {'Cache-Control': 'no-cache', 'ETag': ETAG},
+                'modified': {'Cache-Control': 'max-age=0', 'Last-Modified': LAST_MODIFIED},
+                'nostore': {'Cache-Control': 'no-store'},
+            }.get(kind, {'Cache-Control': 'no-store'})
+
+            if (self.headers.get('If-None-Match') == ETAG and kind == 'etag') or \
+                    (self.headers.get('If-Modified-Since') == LAST_MODIFIED and kind == 'modified'):
+                self.server.count(self.server.not_modified, kind)
+                self.send_response(304)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(PAGE)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(PAGE)
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+def directory_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path) for name in files
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Time bare requests against the pooled, concurrent fetcher on a local http.server "
+        "fixture, and check its HTTP cache (ETag, Last-Modified, Cache-Control, size and age bounds)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--urls', type=int, default=24, help="Slow pages fetched per run")
+        parser.add_argument('--delay', type=float, default=0.1, help="Seconds the fixture takes per slow page")
+
+    def handle(self, *args, **options):
+        server = FixtureServer(options['delay'])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            with tempfile.TemporaryDirectory() as location:
+                self.benchmark(server, location, options['urls'])
+            with tempfile.TemporaryDirectory() as location:
+                errors = self.check_cache(server, location)
+            with tempfile.TemporaryDirectory() as location:
+                errors += self.check_bounds(server, location)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        for error in errors:
+            self.stderr.write(f"  {error}")
+        if errors:
+            raise CommandError("The fetcher's HTTP cache misbehaved on the fixture")
+        self.stdout.write("Cache checks: fresh, ETag, Last-Modified, no-store, per-host limit, size and age bounds")
+
+    def benchmark(self, server: FixtureServer, location: str, count: int):
+        urls = [f"{server.base_url}/slow/{index}" for index in range(count)]
+
+        # Before: one bare request after another, a new connection each
+        start = time.perf_counter()
+        for url in urls:
+            requests.get(url, timeout=10).raise_for_status()
+        bare = time.perf_counter() - start
+
+        fetcher = Fetcher(cache=HTTPCache(location), max_per_host=8)
+        start = time.perf_counter()
+        results = fetcher.fetch_many(urls)
+        pooled = time.perf_counter() - start
+
+        start = time.perf_counter()
+        asyncio.run(fetcher.afetch_many(urls))
+        pooled_async = time.perf_counter() - start
+
+        failed = sum(not result.ok for result in results)
+        self.stdout.write(f"Bare requests.get:  {bare:6.2f} s for {count} pages")
+        self.stdout.write(f"fetch_many:         {pooled:6.2f} s ({failed} failed)")
+        self.stdout.write(f"afetch_many:        {pooled_async:6.2f} s")
+
+    @staticmethod
+    def check_cache(server: FixtureServer, location: str) -> list:
+        fetcher = Fetcher(cache=HTTPCache(location), max_per_host=2)
+        base = server.base_url
+        errors = []
+
+        def twice(kind: str):
+            url = f"{base}/{kind}/page"
+            first, second = fetcher.fetch(url), fetcher.fetch(url)
+            if first.from_cache or first.text != second.text:
+                errors.append(f"{kind}: the first fetch came from the cache or the copies differ")
+            return second
+
+        if not twice('fresh').from_cache or server.hits.get('fresh') != 1:
+            errors.append(f"fresh: max-age=60 page requested {server.hits.get('fresh')} times, expected once")
+        if not twice('etag').from_cache or server.not_modified.get('etag') != 1:
+            errors.append("etag: the second fetch was not revalidated with If-None-Match and a 304")
+        if not twice('modified').from_cache or server.not_modified.get('modified') != 1:
+            errors.append("modified: the second fetch was not revalidated with If-Modified-Since and a 304")
+        if twice('nostore').from_cache or server.hits.get('nostore') != 2:
+            errors.append("nostore: a no-store page was served from the cache")
+
+        # The async path shares the cache
+        cached = asyncio.run(fetcher.afetch_many([f"{base}/fresh/page"]))[0]
+        if not cached.from_cache or server.hits.get('fresh') != 1:
+            errors.append("afetch_many did not serve the fresh page from the cache")
+
+        server.max_in_flight = 0
+        fetcher.fetch_many([f"{base}/slow/limit-{index}" for index in range(8)])
+        if server.max_in_flight > fetcher.max_per_host:
+            errors.append(f"{server.max_in_flight} requests in flight to one host, limit {fetcher.max_per_host}")
+        return errors
+
+    @staticmethod
+    def check_bounds(server: FixtureServer, location: str) -> list:
+        max_bytes = 20 * len(PAGE)
+        cache = HTTPCache(location, max_bytes=max_bytes, max_age=3600)
+        fetcher = Fetcher(cache=cache)
+        errors = []
+
+        # Pruning runs on the first write, then once per _prune_after bytes written
+        urls = [f"{server.base_url}/fresh/bound-{index}" for index in range(200)]
+        for url in urls:
+            fetcher.fetch(url)
+            if directory_size(location) > max_bytes + cache._prune_after + 2 * len(PAGE):
+                errors.append(f"cache grew to {directory_size(location)} bytes, bound {max_bytes}")
+                break
+
+        cache.prune()
+        if directory_size(location) > max_bytes:
+            errors.append(f"cache holds {directory_size(location)} bytes after pruning, bound {max_bytes}")
+        if cache.get(urls[-1]) is None or cache.get(urls[0]) is not None:
+            errors.append("pruning did not keep the newest entries and drop the oldest")
+
+        # Entries not written for max_age are dropped even under the size bound
+        stale = time.time() - 2 * cache.max_age
+        for root, _, files in os.walk(location):
+            for name in files:
+                os.utime(os.path.join(root, name), (stale, stale))
+        fetcher.fetch(f"{server.base_url}/fresh/bound-new")
+        cache.prune()
+        if cache.get(urls[-1]) is not None or cache.get(f"{server.base_url}/fresh/bound-new") is None:
+            errors.append("pruning did not drop expired entries while keeping new ones")
+        return errors
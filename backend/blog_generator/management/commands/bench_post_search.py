@@ -0,0 +1,76 @@
+# backend/blog_generator/management/commands/bench_post_search.py
+
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from blog_generator.models import BlogPost
+from blog_generator.views import BlogPostViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the post list API with ?q=/?since=/?until= filters against the stored posts "
+        "(seed them with seed_posts), and full-text search against a LIKE scan of titles and prompts"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--query', action='append', dest='queries',
+                            help="Search query to time (repeatable; default: a rare and a common one)")
+
+    def handle(self, *args, **options):
+        total = BlogPost.objects.count()
+        if not total:
+            raise CommandError("No posts stored; run seed_posts first")
+
+        factory = APIRequestFactory()
+        view = BlogPostViewSet.as_view({'get': 'list'})
+        now = timezone.now()
+        window = {
+            'since': (now - timedelta(days=30)).date().isoformat(),
+            'until': (now - timedelta(days=20)).date().isoformat(),
+        }
+        queries = options['queries'] or ['retnet tuning', 'term250']
+
+        cases = [('newest page', {}), ('date window', window)]
+        for query in queries:
+            cases.append((f"q={query}", {'q': query}))
+            cases.append((f"q={query} + window", dict(window, q=query)))
+
+        self.stdout.write(f"{total} posts, {options['repeat']} runs per case")
+        self.stdout.write(f"{'case':<36}{'results':>9}{'p50 ms':>10}{'max ms':>10}")
+        for label, params in cases:
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                response = view(factory.get('/api/blogs/', params))
+                response.render()
+                timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"{label}: HTTP {response.status_code} {response.data}")
+            self.stdout.write(
+                f"{label:<36}{len(response.data['results']):>9}"
+                f"{statistics.median(timings):>10.2f}{max(timings):>10.2f}"
+            )
+
+        # What a search costs without the full-text index (content is compressed, so
+        # a scan can only look at titles and prompts)
+        for query in queries:
+            timings = []
+            for _ in range(max(options['repeat'] // 4, 1)):
+                start = time.perf_counter()
+                scan = BlogPost.objects.only('id', 'title', 'created_at')
+                for word in query.split():
+                    scan = scan.filter(Q(title__icontains=word) | Q(prompts__icontains=word))
+                list(scan.order_by('-created_at', '-id')[:20])
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(
+                f"{'LIKE scan ' + query:<36}{'':>9}"
+                f"{statistics.median(timings):>10.2f}{max(timings):>10.2f}"
+            )
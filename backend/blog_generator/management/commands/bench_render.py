@@ -0,0 +1,73 @@
+# backend/blog_generator/management/commands/bench_render.py
+
+import time
+
+import markdown
+from django.core.management.base import BaseCommand
+from weasyprint import HTML
+
+from blog_generator.utils.markdown_utils import MARKDOWN_EXTENSIONS, MarkdownConverter, RenderEngine
+
+SAMPLE = """# Benchmark post
+
+An introduction with **bold**, *italic* and `inline code`, plus a [link](https://example.com).
+
+## Section with a table
+
+| Column | Value |
+|--------|-------|
+| alpha  | 1     |
+| beta   | 2     |
+
+## Section with code
+
+```python
+def hello(name):
+    return f"Hello {name}"
+```
+
+> A quote to close the section.
+
+- first item
+- second item
+- third item
+"""
+
+
+class Command(BaseCommand):
+    help = "Per-document render time with a fresh parser and stylesheet per call versus the reusable render engine"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--file', help="Markdown document to render (default: a built-in sample)")
+        parser.add_argument('--html-only', action='store_true',
+                            help="Only time markdown to HTML, not the PDF")
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        text = SAMPLE
+        if options['file']:
+            with open(options['file'], encoding='utf-8') as f:
+                text = f.read()
+
+        # Before: new parser and extensions each call, stylesheet inlined and re-parsed
+        def before():
+            html_content = markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS)
+            if not options['html_only']:
+                HTML(string=MarkdownConverter.get_styled_html(html_content)).write_pdf()
+
+        # After: thread-local parser, parsed stylesheet and font configuration
+        engine = RenderEngine()
+
+        def after():
+            html_content = engine.markdown_to_html(text)
+            if not options['html_only']:
+                engine.write_pdf(MarkdownConverter.get_styled_html(html_content, inline_css=False))
+
+        for label, render in (('Per call', before), ('Engine', after)):
+            render()  # warm up imports and the engine's one-off setup
+            start = time.perf_counter()
+            for _ in range(iterations):
+                render()
+            elapsed = (time.perf_counter() - start) / iterations
+            self.stdout.write(f"{label + ':':10} {elapsed * 1000:8.2f} ms per document")
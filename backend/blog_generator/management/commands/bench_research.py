@@ -0,0 +1,214 @@
+# backend/blog_generator/management/commands/bench_research.py
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_generator.agents.blog_agents import WebScraperTool, WebSearchTool
+from blog_generator.agents.corpus import ResearchCorpus
+from blog_generator.agents.fetcher import Fetcher
+from blog_generator.agents.research import ResearchFanOut, decompose_prompt
+from blog_generator.agents.search_cache import SearchCache
+
+TITLE = "Vector databases"
+PROMPTS = "Indexing with HNSW; filtering and hybrid search"
+
+
+def fixture_page(marker: str) -> bytes:
+    paragraph = (
+        f"Vector databases store embeddings for similarity search. {marker} explains "
+        "indexing with HNSW graphs, metadata filtering and hybrid search that mixes "
+        "keyword and vector scores. "
+    )
+    return f"<html><body><article><h1>{marker}</h1><p>{paragraph * 4}</p></article></body></html>".encode('utf-8')
+
+
+# /dup serves the same article as /alpha under another URL; /missing is a 404
+PAGES = {
+    '/alpha': fixture_page('ALPHA-MARKER'),
+    '/bravo': fixture_page('BRAVO-MARKER'),
+    '/charlie': fixture_page('CHARLIE-MARKER'),
+    '/dup': fixture_page('ALPHA-MARKER'),
+}
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Local website serving PAGES after a delay; counts requests per path"""
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, delay: float):
+        super().__init__(('127.0.0.1', 0), FixtureHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.hits = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            page = PAGES.get(self.path)
+            self.send_response(200 if page else 404)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Cache-Control', 'no-store')
+            self.send_header('Content-Length', str(len(page or b'')))
+            self.end_headers()
+            self.wfile.write(page or b'')
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class FixtureSearch:
+    """
+    Stands in for the search API: every sub-query takes the given delay and
+    returns fixture links, overlapping between queries (also up to a
+    trailing slash), plus a duplicate page and a broken link.
+    """
+
+    def __init__(self, server: FixtureServer, delay: float):
+        self.delay = delay
+        queries = decompose_prompt(TITLE, PROMPTS)
+        links = [['/alpha', '/bravo'], ['/bravo/', '/charlie'], ['/dup', '/missing']]
+        self.links = {query: [server.url(path) for path in paths] for query, paths in zip(queries, links)}
+        self.lock = threading.Lock()
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def results(self, query: str, max_results: int):
+        with self.lock:
+            self.calls.append(query)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            return [
+                {'link': link, 'title': f"Result {index}", 'snippet': "About vector databases"}
+                for index, link in enumerate(self.links.get(query, [])[:max_results])
+            ]
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the parallel research stage against sequential searches and scrapes, using a "
+        "stub search API and local http.server pages, and check how it merges the findings"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delay', type=float, default=0.3,
+                            help="Seconds each search and each page fetch takes")
+
+    def handle(self, *args, **options):
+        delay = options['delay']
+        server = FixtureServer(delay)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            with tempfile.TemporaryDirectory() as location:
+                self.benchmark(server, location, delay)
+            server.hits.clear()
+            server.max_in_flight = 0
+            with tempfile.TemporaryDirectory() as location:
+                errors = self.check_fanout(server, location, delay)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        for error in errors:
+            self.stderr.write(f"  {error}")
+        if errors:
+            raise CommandError("The research fan-out lost, repeated or serialized work on the fixture")
+        self.stdout.write("Fan-out checks: concurrent searches and fetches, deduplicated pages, corpus reuse")
+
+    @staticmethod
+    def fanout(server: FixtureServer, location: str, delay: float):
+        search = FixtureSearch(server, delay)
+        search_tool = WebSearchTool(
+            results_engine=search,
+            cache=SearchCache(os.path.join(location, 'search.sqlite3'))
+        )
+        scraper_tool = WebScraperTool(
+            fetcher=Fetcher(),
+            corpus=ResearchCorpus(os.path.join(location, 'corpus.sqlite3'))
+        )
+        return ResearchFanOut(search_tool, scraper_tool, corpus=scraper_tool.corpus), search
+
+    def benchmark(self, server: FixtureServer, location: str, delay: float):
+        os.makedirs(os.path.join(location, 'sequential'))
+        fanout, _ = self.fanout(server, os.path.join(location, 'sequential'), delay)
+
+        # Before: the researcher searched and scraped one call at a time
+        start = time.perf_counter()
+        for query in fanout.queries(TITLE, PROMPTS):
+            for result in fanout.search_tool.search_results(query, fanout.results_per_query):
+                fanout.scraper_tool._run(result['link'], query)
+        sequential = time.perf_counter() - start
+
+        os.makedirs(os.path.join(location, 'parallel'))
+        fanout, _ = self.fanout(server, os.path.join(location, 'parallel'), delay)
+        start = time.perf_counter()
+        asyncio.run(fanout.arun(TITLE, PROMPTS))
+        parallel = time.perf_counter() - start
+
+        self.stdout.write(f"Sequential research: {sequential:6.2f} s")
+        self.stdout.write(f"Parallel fan-out:    {parallel:6.2f} s")
+
+    def check_fanout(self, server: FixtureServer, location: str, delay: float) -> list:
+        fanout, search = self.fanout(server, location, delay)
+        context = asyncio.run(fanout.arun(TITLE, PROMPTS))
+        queries = fanout.queries(TITLE, PROMPTS)
+        errors = []
+
+        if sorted(search.calls) != sorted(queries):
+            errors.append(f"searched {search.calls}, expected each of {queries} once")
+        if search.max_in_flight < 2:
+            errors.append("the searches ran one at a time")
+        if server.max_in_flight < 2:
+            errors.append("the pages were fetched one at a time")
+        fetched = {path: count for path, count in server.hits.items() if count != 1}
+        if fetched or '/bravo/' in server.hits:
+            errors.append(f"pages not fetched exactly once: {fetched or server.hits}")
+
+        for query in queries:
+            if f"### {query}" not in context:
+                errors.append(f"the search results of {query!r} are missing")
+        for marker in ('ALPHA-MARKER', 'BRAVO-MARKER', 'CHARLIE-MARKER'):
+            if marker not in context:
+                errors.append(f"{marker} is missing from the merged context")
+        # One excerpt per page: /bravo/ is /bravo, /dup repeats /alpha, /missing failed
+        excerpt_urls = [line for line in context.splitlines() if line.startswith('[')]
+        expected = [server.url(path) for path in ('/alpha', '/bravo', '/charlie')]
+        if [line.rsplit('(', 1)[-1].rstrip(')') for line in excerpt_urls] != expected:
+            errors.append(f"excerpts from {excerpt_urls}, expected one each from {expected}")
+
+        # A second run of the same topic is answered from the corpus, not the web
+        server.hits.clear()
+        fanout, _ = self.fanout(server, location, delay)
+        again = asyncio.run(fanout.arun(TITLE, PROMPTS))
+        if server.hits:
+            errors.append(f"the second run fetched {sorted(server.hits)} again")
+        if 'BRAVO-MARKER' not in again:
+            errors.append("the second run lost the stored pages")
+        return errors
@@ -0,0 +1,122 @@
+# backend/blog_generator/management/commands/bench_scheduler.py
+
+import time
+
+from crewai import LLM
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_generator.agents.blog_agents import BlogCrewAgent
+from blog_generator.agents.scheduler import DAGScheduler, TaskGraph
+
+
+class FakeLLM(LLM):
+    """Answers every call after a fixed delay, standing in for one LLM round-trip"""
+
+    def __init__(self, delay: float):
+        super().__init__(model='fake-model')
+        self.delay = delay
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        time.sleep(self.delay)
+        return "Thought: I now know the final answer\nFinal Answer: fake output"
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+
+class FailingLLM(FakeLLM):
+    """Fails every call after a fixed delay, like an LLM request that errors out"""
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        time.sleep(self.delay)
+        raise RuntimeError("fake LLM failure")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the critical path of the task graph against a sequential crew, using a fake LLM, "
+        "and check that a failing task does not lose the outputs of its siblings"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delay', type=float, default=0.5,
+                            help="Seconds each fake LLM call takes")
+
+    def handle(self, *args, **options):
+        delay = options['delay']
+        builder = BlogCrewAgent.__new__(BlogCrewAgent)
+
+        def agents():
+            fake_agents = builder.create_agents([])
+            for agent in fake_agents:
+                agent.llm = FakeLLM(delay)
+                agent.verbose = False
+            return fake_agents
+
+        # Before: every task waited for the previous one
+        tasks = builder.create_tasks(agents(), "Benchmark title", "Benchmark prompts")
+        chain = TaskGraph()
+        previous = []
+        for name, task in zip(BlogCrewAgent.STAGES, tasks):
+            chain.add(name, task, inputs=previous)
+            previous = [name]
+
+        # After: curation and outlining only wait for the research
+        graph = builder.create_task_graph(agents(), "Benchmark title", "Benchmark prompts")
+
+        for label, task_graph in (('Sequential', chain), ('Task graph', graph)):
+            start = time.perf_counter()
+            DAGScheduler(task_graph).run()
+            elapsed = time.perf_counter() - start
+            levels = ' -> '.join('+'.join(level) for level in task_graph.levels())
+            self.stdout.write(f"{label + ':':12} {elapsed:6.2f} s  ({elapsed / delay:4.1f} LLM round-trips)  {levels}")
+
+        errors = self.check_sibling_failure(builder.create_task_graph(agents(), "Check title", "Check prompts"), delay)
+        for error in errors:
+            self.stderr.write(f"  {error}")
+        if errors:
+            raise CommandError("The scheduler lost or misreported task outcomes after a failure")
+        self.stdout.write("Sibling failure: outputs kept, failure raised, resume runs only the rest")
+
+    @staticmethod
+    def check_sibling_failure(graph: TaskGraph, delay: float) -> list:
+        """
+        Image curation fails while the outline, its sibling, is still running.
+        The outline must still be reported as complete, the writer must never
+        start, the failure must be raised, and a resume from the reported
+        outputs must only run the failed task and the writer.
+        """
+        curation = graph.nodes['image_curation'].task.agent
+        curation.llm = FailingLLM(delay / 2)
+        # No agent-level retries, so the failure lands before the sibling finishes
+        curation.max_retry_limit = 0
+
+        started, completed = [], {}
+        scheduler = DAGScheduler(
+            graph,
+            on_start=started.append,
+            on_complete=lambda name, output, duration: completed.__setitem__(name, output)
+        )
+        errors = []
+        try:
+            scheduler.run()
+            errors.append("the run succeeded although image curation failed")
+        except Exception as e:
+            if 'fake LLM failure' not in str(e):
+                errors.append(f"unexpected error raised: {e!r}")
+        if sorted(completed) != ['organizing', 'research']:
+            errors.append(f"completed tasks reported: {sorted(completed)}, expected organizing and research")
+        if 'writing' in started:
+            errors.append("the writer started after a failed input")
+
+        curation.llm = FakeLLM(delay / 2)
+        started.clear()
+        resumed = DAGScheduler(graph, on_start=started.append).run(completed=completed)
+        if sorted(started) != ['image_curation', 'writing']:
+            errors.append(f"resume ran {sorted(started)}, expected image_curation and writing")
+        if resumed.get('organizing') != completed.get('organizing'):
+            errors.append("resume did not reuse the outline")
+        return errors
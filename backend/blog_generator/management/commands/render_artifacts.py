@@ -0,0 +1,33 @@
+# backend/blog_generator/management/commands/render_artifacts.py
+
+from django.core.management.base import BaseCommand
+
+from blog_generator.models import BlogPost
+
+
+class Command(BaseCommand):
+    help = "Render and store HTML/PDF artifacts for posts that are missing or stale"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help="Re-render every post, not only missing or stale ones"
+        )
+
+    def handle(self, *args, **options):
+        rendered = failed = skipped = 0
+        queryset = BlogPost.objects.exclude(content_size=0).order_by('id')
+
+        for blog_post in queryset.iterator(chunk_size=100):
+            if not options['all'] and not blog_post.artifacts_stale:
+                skipped += 1
+                continue
+            try:
+                blog_post.render_artifacts()
+                rendered += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Error rendering blog {blog_post.id}: {str(e)}")
+
+        self.stdout.write(f"Rendered {rendered}, skipped {skipped}, failed {failed}")
@@ -0,0 +1,33 @@
+# backend/blog_generator/management/commands/run_job_workers.py
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_generator.utils.job_queue import get_job_queue
+
+
+class Command(BaseCommand):
+    help = "Run the blog generation worker pool in the foreground"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.BLOG_JOB_WORKERS,
+            help="Number of concurrent generation workers"
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError("--workers must be at least 1")
+        queue = get_job_queue()
+        queue.max_workers = options['workers']
+        queue.start()
+        self.stdout.write(f"Started {queue.max_workers} generation workers, press Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping generation workers")
@@ -0,0 +1,78 @@
+# backend/blog_generator/management/commands/seed_posts.py
+
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from blog_generator.models import BlogPost
+from blog_generator.utils.generation_cache import request_key
+from blog_generator.utils.post_search import index_posts
+
+TOPICS = [
+    'kubernetes', 'postgres', 'retnet', 'transformers', 'rust', 'django', 'kafka', 'redis',
+    'graphql', 'webassembly', 'terraform', 'prometheus', 'sqlite', 'react', 'pytorch', 'spark',
+    'elasticsearch', 'nginx', 'grpc', 'docker', 'airflow', 'snowflake', 'clickhouse', 'golang',
+]
+ASPECTS = [
+    'performance', 'architecture', 'scaling', 'security', 'testing', 'deployment', 'monitoring',
+    'caching', 'migration', 'internals', 'benchmarks', 'pitfalls', 'patterns', 'tuning',
+]
+
+
+def synthetic_words(rng: random.Random, count: int):
+    # A long-tailed vocabulary, so some words are rare and others common
+    return [f"term{int(rng.paretovariate(1.2)) % 5000}" for _ in range(count)]
+
+
+class Command(BaseCommand):
+    help = "Insert synthetic blog posts (default 100,000) spread over the past year, for benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100000)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--days', type=int, default=365, help="Spread created_at over this many days")
+        parser.add_argument('--words', type=int, default=300, help="Words of markdown per post")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+        span = options['days'] * 24 * 3600
+        start = time.perf_counter()
+        created = 0
+
+        while created < options['count']:
+            size = min(options['batch_size'], options['count'] - created)
+            posts = []
+            for _ in range(size):
+                topic = rng.choice(TOPICS)
+                aspect = rng.choice(ASPECTS)
+                title = f"{topic.title()} {aspect} notes #{rng.randrange(10 ** 6)}"
+                prompts = f"Write about {topic} {aspect}"
+                body = ' '.join([topic, aspect] + synthetic_words(rng, options['words']))
+                posts.append(BlogPost(
+                    title=title,
+                    prompts=prompts,
+                    markdown_content=f"# {title}\n\n{body}",
+                    request_key=request_key(title, prompts),
+                ))
+
+            with transaction.atomic():
+                posts = BlogPost.objects.bulk_create(posts)
+                # bulk_create skips save(), which keeps the search index current
+                index_posts((post.id, post.title, post.prompts, post.markdown_content) for post in posts)
+                # created_at is auto_now_add, so spread the dates with a second pass
+                for post in posts:
+                    post.created_at = now - timedelta(seconds=rng.randrange(span))
+                BlogPost.objects.bulk_update(posts, ['created_at'], batch_size=500)
+            created += size
+            self.stdout.write(f"{created} posts", ending='\r')
+
+        self.stdout.write(
+            f"Inserted {created} posts in {time.perf_counter() - start:.1f}s "
+            f"({BlogPost.objects.count()} in total)"
+        )
@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-18 13:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_generator', '0002_generationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='pdf_file',
+            field=models.FileField(blank=True, upload_to='blog_pdfs/'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='rendered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='rendered_html',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='renderer_version',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-18 13:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_generator', '0003_blogpost_artifacts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationTrace',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('succeeded', models.BooleanField(default=True)),
+                ('total_seconds', models.FloatField(default=0)),
+                ('prompt_tokens', models.PositiveIntegerField(default=0)),
+                ('completion_tokens', models.PositiveIntegerField(default=0)),
+                ('cached_prompt_tokens', models.PositiveIntegerField(default=0)),
+                ('total_tokens', models.PositiveIntegerField(default=0)),
+                ('llm_requests', models.PositiveIntegerField(default=0)),
+                ('spans', models.JSONField(default=list)),
+                ('counters', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('blog_post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='traces', to='blog_generator.blogpost')),
+                ('job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='traces', to='blog_generator.generationjob')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='generationtrace',
+            index=models.Index(fields=['created_at'], name='blog_genera_created_3b8eb1_idx'),
+        ),
+    ]
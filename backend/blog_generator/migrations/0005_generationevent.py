@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-18 13:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_generator', '0004_generationtrace'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('data', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='blog_generator.generationjob')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='generationevent',
+            index=models.Index(fields=['job', 'id'], name='blog_genera_job_id_92559d_idx'),
+        ),
+    ]
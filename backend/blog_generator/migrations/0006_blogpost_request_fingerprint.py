@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-18 13:30
+
+from django.db import migrations, models
+
+
+def fingerprint_existing_posts(apps, schema_editor):
+    from blog_generator.utils.generation_cache import request_key, request_signature
+
+    BlogPost = apps.get_model('blog_generator', 'BlogPost')
+    for post in BlogPost.objects.only('id', 'title', 'prompts').iterator():
+        post.request_key = request_key(post.title, post.prompts)
+        post.request_signature = request_signature(post.title, post.prompts)
+        post.save(update_fields=['request_key', 'request_signature'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_generator', '0005_generationevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='request_key',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='request_signature',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(fingerprint_existing_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-18 13:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_generator', '0006_blogpost_request_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationStep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('output', models.TextField()),
+                ('duration', models.FloatField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='steps', to='blog_generator.generationjob')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='generationstep',
+            constraint=models.UniqueConstraint(fields=('job', 'name'), name='unique_generation_step'),
+        ),
+    ]
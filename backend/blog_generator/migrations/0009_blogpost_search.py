@@ -0,0 +1,85 @@
+# Generated by Django 4.2 on 2026-10-18 13:42
+
+from django.db import migrations, models
+
+
+# The index as first created; migration 0010 replaces it
+FTS_TABLE = 'blog_generator_blogpost_fts'
+POST_TABLE = 'blog_generator_blogpost'
+
+# SQLite: an external-content FTS5 table over the post columns, kept in sync
+# by triggers so every save (ORM or not) updates the index
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, prompts, markdown_content,
+        content='{POST_TABLE}', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {POST_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, prompts, markdown_content)
+        VALUES (new.id, new.title, new.prompts, new.markdown_content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {POST_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, prompts, markdown_content)
+        VALUES ('delete', old.id, old.title, old.prompts, old.markdown_content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF title, prompts, markdown_content ON {POST_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, prompts, markdown_content)
+        VALUES ('delete', old.id, old.title, old.prompts, old.markdown_content);
+        INSERT INTO {FTS_TABLE} (rowid, title, prompts, markdown_content)
+        VALUES (new.id, new.title, new.prompts, new.markdown_content);
+    END""",
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# PostgreSQL: a generated tsvector column, so the database keeps it current
+POSTGRES_CREATE = [
+    f"""ALTER TABLE {POST_TABLE} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(prompts, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(markdown_content, '')), 'C')
+    ) STORED""",
+    f"CREATE INDEX {POST_TABLE}_search_vector ON {POST_TABLE} USING GIN (search_vector)",
+]
+POSTGRES_DROP = [
+    f"DROP INDEX IF EXISTS {POST_TABLE}_search_vector",
+    f"ALTER TABLE {POST_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def create_search_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_generator', '0008_generationbatch'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blogpost',
+            name='title',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['created_at', 'id'], name='blog_genera_created_6d5ac4_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 4.2 on 2026-10-18 13:46
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def batched_posts(BlogPost, fields):
+    # Ids first: SQLite cannot safely update a table while iterating over it
+    ids = list(BlogPost.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield list(BlogPost.objects.filter(id__in=ids[start:start + BATCH_SIZE]).only('id', *fields))
+
+
+def compact_content(apps, schema_editor):
+    """Store each post's content once, compressed, and re-index it"""
+    from blog_generator.utils.content_store import compress_text
+    from blog_generator.utils.post_search import create_search_index, index_posts
+
+    # The first index was kept current by the database from the text columns
+    import_module('blog_generator.migrations.0009_blogpost_search').drop_search_index(apps, schema_editor)
+    create_search_index(apps, schema_editor)
+
+    BlogPost = apps.get_model('blog_generator', 'BlogPost')
+    for posts in batched_posts(BlogPost, ['title', 'prompts', 'generated_content', 'markdown_content']):
+        for post in posts:
+            post.content_data = compress_text(post.markdown_content)
+            post.content_size = len(post.markdown_content)
+            if post.generated_content != post.markdown_content:
+                post.generated_data = compress_text(post.generated_content)
+        BlogPost.objects.bulk_update(posts, ['content_data', 'content_size', 'generated_data'])
+        index_posts(
+            [(post.id, post.title, post.prompts, post.markdown_content) for post in posts],
+            using=schema_editor.connection
+        )
+
+
+def expand_content(apps, schema_editor):
+    from blog_generator.utils.content_store import decompress_text
+    from blog_generator.utils.post_search import drop_search_index
+
+    drop_search_index(apps, schema_editor)
+
+    BlogPost = apps.get_model('blog_generator', 'BlogPost')
+    for posts in batched_posts(BlogPost, ['content_data', 'generated_data']):
+        for post in posts:
+            post.markdown_content = decompress_text(post.content_data)
+            post.generated_content = (
+                post.markdown_content if post.generated_data is None else decompress_text(post.generated_data)
+            )
+        BlogPost.objects.bulk_update(posts, ['generated_content', 'markdown_content'])
+
+    import_module('blog_generator.migrations.0009_blogpost_search').create_search_index(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_generator', '0009_blogpost_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_data',
+            field=models.BinaryField(blank=True, default=b''),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_size',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='generated_data',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.RunPython(compact_content, expand_content),
+        migrations.RemoveField(
+            model_name='blogpost',
+            name='generated_content',
+        ),
+        migrations.RemoveField(
+            model_name='blogpost',
+            name='markdown_content',
+        ),
+    ]
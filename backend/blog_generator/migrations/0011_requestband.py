@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-18 14:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 500
+
+
+def band_existing_posts(apps, schema_editor):
+    from blog_generator.utils.generation_cache import band_keys
+
+    BlogPost = apps.get_model('blog_generator', 'BlogPost')
+    RequestBand = apps.get_model('blog_generator', 'RequestBand')
+    posts = BlogPost.objects.exclude(request_signature=None).order_by('id').values_list('id', 'request_signature')
+    bands = []
+    for post_id, signature in posts.iterator():
+        bands.extend(RequestBand(post_id=post_id, key=key) for key in band_keys(signature))
+        if len(bands) >= BATCH_SIZE:
+            RequestBand.objects.bulk_create(bands)
+            bands = []
+    RequestBand.objects.bulk_create(bands)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_generator', '0010_blogpost_compressed_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField(db_index=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='request_bands', to='blog_generator.blogpost')),
+            ],
+        ),
+        migrations.RunPython(band_existing_posts, migrations.RunPython.noop),
+    ]
@@ -1,17 +1,378 @@
 # blog_generator/models.py
 
-from django.db import models
+from django.core.files.base import ContentFile
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from .utils.content_store import compress_text, decompress_text
+
+ARTIFACT_FIELDS = ['rendered_html', 'pdf_file', 'content_hash', 'rendered_at', 'renderer_version']
+# Columns behind markdown_content and generated_content
+CONTENT_FIELDS = ['content_data', 'content_size', 'generated_data']
+# Columns covered by the full-text search index
+SEARCH_FIELDS = {'title', 'prompts', 'content_data'}
 
 class BlogPost(models.Model):
-    title = models.CharField(max_length=200)
+    title = models.CharField(max_length=200, db_index=True)
     prompts = models.TextField()
-    generated_content = models.TextField(blank=True)
-    markdown_content = models.TextField(blank=True)
+    # The markdown is stored once, compressed; read and write it through
+    # markdown_content. The raw generated text is only kept separately
+    # when it differs from the markdown (i.e. after the post was edited).
+    content_data = models.BinaryField(blank=True, default=b'')
+    content_size = models.PositiveIntegerField(default=0)
+    generated_data = models.BinaryField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Rendered artifacts, produced once at write time instead of on every read
+    rendered_html = models.TextField(blank=True)
+    pdf_file = models.FileField(upload_to='blog_pdfs/', blank=True)
+    content_hash = models.CharField(max_length=64, blank=True)
+    rendered_at = models.DateTimeField(null=True, blank=True)
+    renderer_version = models.CharField(max_length=64, blank=True)
+
+    # Normalized request fingerprints, used to reuse earlier generations
+    request_key = models.CharField(max_length=64, blank=True, db_index=True)
+    request_signature = models.JSONField(null=True, blank=True)
+
     def __str__(self):
         return self.title
 
+    @property
+    def markdown_content(self) -> str:
+        # Decompressed once per stored value
+        cached = getattr(self, '_markdown_cache', None)
+        if cached is None or cached[0] is not self.content_data:
+            cached = (self.content_data, decompress_text(self.content_data))
+            self._markdown_cache = cached
+        return cached[1]
+
+    @markdown_content.setter
+    def markdown_content(self, value: str):
+        value = value or ''
+        previous = self.markdown_content
+        if self.generated_data is None and previous and previous != value:
+            # The generated text was shared with the old markdown; keep it
+            self.generated_data = compress_text(previous)
+        elif self.generated_data is not None and decompress_text(self.generated_data) == value:
+            self.generated_data = None
+        self.content_data = compress_text(value)
+        self.content_size = len(value)
+        self._markdown_cache = (self.content_data, value)
+
+    @property
+    def generated_content(self) -> str:
+        if self.generated_data is None:
+            return self.markdown_content
+        return decompress_text(self.generated_data)
+
+    @generated_content.setter
+    def generated_content(self, value: str):
+        value = value or ''
+        self.generated_data = None if value == self.markdown_content else compress_text(value)
+
+    @property
+    def artifacts_stale(self) -> bool:
+        """True if the stored HTML/PDF do not match the current markdown and renderer"""
+        from .utils.markdown_utils import MarkdownConverter
+        if not self.markdown_content:
+            return False
+        if not self.pdf_file or not self.rendered_html:
+            return True
+        return self.content_hash != MarkdownConverter.cache_key(self.markdown_content)
+
+    def render_artifacts(self):
+        """Render markdown to HTML and PDF once and store them on the post"""
+        from .utils.markdown_utils import MarkdownConverter
+
+        pdf_bytes, html_content = MarkdownConverter.render(self.markdown_content)
+        self.store_artifacts(pdf_bytes, html_content)
+
+    def store_artifacts(self, pdf_bytes: bytes, html_content: str):
+        """Store a render of the current markdown, e.g. one made in another process"""
+        from .utils.markdown_utils import MarkdownConverter
+
+        content_hash = MarkdownConverter.cache_key(self.markdown_content)
+
+        # Replace, rather than accumulate, PDFs from earlier renders
+        if self.pdf_file:
+            self.pdf_file.delete(save=False)
+        self.pdf_file.save(f"{content_hash}.pdf", ContentFile(pdf_bytes), save=False)
+
+        self.rendered_html = html_content
+        self.content_hash = content_hash
+        self.rendered_at = timezone.now()
+        self.renderer_version = MarkdownConverter.renderer_fingerprint()
+        self.save(update_fields=ARTIFACT_FIELDS)
+
+    def read_pdf(self) -> bytes:
+        """Return the stored PDF bytes"""
+        with self.pdf_file.open('rb') as f:
+            return f.read()
+
+    def save(self, *args, **kwargs):
+        from .utils.post_search import update_search_index
+
+        update_fields = kwargs.get('update_fields')
+        indexed = update_fields is None or bool(SEARCH_FIELDS & set(update_fields))
+        fingerprinted = update_fields is None or bool({'title', 'prompts'} & set(update_fields))
+        if fingerprinted:
+            self.set_request_fingerprint()
+            if update_fields is not None:
+                kwargs['update_fields'] = list(update_fields) + ['request_key', 'request_signature']
+
+        with transaction.atomic():
+            if indexed:
+                lock_for_write(BlogPost, self.pk)
+            previous = self.stored_search_values() if indexed else None
+            # Drop the cached render of the previous markdown when it changes
+            if previous and previous[2] and previous[2] != self.markdown_content:
+                invalidate_render(previous[2])
+
+            super().save(*args, **kwargs)
+            if indexed:
+                update_search_index(self.pk, (self.title, self.prompts, self.markdown_content), previous)
+            if fingerprinted:
+                self.update_request_bands()
+
+    def stored_search_values(self):
+        """(title, prompts, markdown) as last saved, i.e. as currently indexed"""
+        if not self.pk:
+            return None
+        row = BlogPost.objects.filter(pk=self.pk).values_list('title', 'prompts', 'content_data').first()
+        if row is None:
+            return None
+        return row[0], row[1], decompress_text(row[2])
+
+    def set_request_fingerprint(self):
+        from .utils.generation_cache import request_key, request_signature
+        self.request_key = request_key(self.title, self.prompts)
+        self.request_signature = request_signature(self.title, self.prompts)
+
+    def update_request_bands(self):
+        """Replace the stored LSH band keys with those of the current signature"""
+        from .utils.generation_cache import band_keys
+        self.request_bands.all().delete()
+        RequestBand.objects.bulk_create(
+            RequestBand(post=self, key=key) for key in band_keys(self.request_signature)
+        )
+
+    def delete(self, *args, **kwargs):
+        from .utils.post_search import update_search_index
+
+        if self.markdown_content:
+            invalidate_render(self.markdown_content)
+        if self.pdf_file:
+            self.pdf_file.delete(save=False)
+        with transaction.atomic():
+            lock_for_write(BlogPost, self.pk)
+            update_search_index(self.pk, None, self.stored_search_values())
+            return super().delete(*args, **kwargs)
+
+    class Meta:
+        app_label = 'blog_generator'
+        # Serves the newest-first cursor pagination and the ?since=/?until= filters;
+        # full-text search uses the index maintained by utils.post_search
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
+
+
+class RequestBand(models.Model):
+    """An LSH band key of a post's request signature, to find near-duplicate requests by index"""
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='request_bands')
+    key = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return f"Band {self.key} of post {self.post_id}"
+
+    class Meta:
+        app_label = 'blog_generator'
+
+
+def lock_for_write(model, pk):
+    """
+    Start the current transaction with a write on SQLite. A transaction that
+    reads first cannot later upgrade to a write lock while another
+    connection writes: SQLite fails it with "database is locked" at once
+    instead of waiting for the busy timeout.
+    """
+    if pk is not None and connection.vendor == 'sqlite':
+        model.objects.filter(pk=pk).update(id=models.F('id'))
+
+
+def invalidate_render(markdown_text: str):
+    """Remove a cached render; failures are logged, never raised"""
+    try:
+        from .utils.markdown_utils import MarkdownConverter
+        MarkdownConverter.invalidate(markdown_text)
+    except Exception as e:
+        print(f"Error invalidating render cache: {str(e)}")
+
+
+class GenerationBatch(models.Model):
+    """A group of generations submitted together, with its own concurrency limit"""
+    max_concurrency = models.PositiveIntegerField(default=4)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Batch {self.id}"
+
+    class Meta:
+        app_label = 'blog_generator'
+
+
+class GenerationJob(models.Model):
+    """A queued blog generation, picked up by the local worker pool"""
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    title = models.CharField(max_length=200)
+    prompts = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    stage = models.CharField(max_length=50, blank=True)
+    error = models.TextField(blank=True)
+    blog_post = models.ForeignKey(
+        BlogPost,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='jobs'
+    )
+    batch = models.ForeignKey(
+        GenerationBatch,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name='jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.title} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+    def set_stage(self, stage: str):
+        """Record the current pipeline stage without touching other columns"""
+        self.stage = stage
+        GenerationJob.objects.filter(pk=self.pk).update(stage=stage, updated_at=timezone.now())
+
+    class Meta:
+        app_label = 'blog_generator'
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+
+class GenerationTrace(models.Model):
+    """Timing, token and cache statistics recorded for one generation run"""
+    job = models.ForeignKey(
+        GenerationJob,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='traces'
+    )
+    blog_post = models.ForeignKey(
+        BlogPost,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='traces'
+    )
+    succeeded = models.BooleanField(default=True)
+    total_seconds = models.FloatField(default=0)
+    prompt_tokens = models.PositiveIntegerField(default=0)
+    completion_tokens = models.PositiveIntegerField(default=0)
+    cached_prompt_tokens = models.PositiveIntegerField(default=0)
+    total_tokens = models.PositiveIntegerField(default=0)
+    llm_requests = models.PositiveIntegerField(default=0)
+    # [{"kind": "stage"|"tool"|..., "name": ..., "offset": s, "duration": s}, ...]
+    spans = models.JSONField(default=list)
+    counters = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Trace {self.id} ({self.total_seconds:.1f}s)"
+
+    @classmethod
+    def from_tracer(cls, tracer, **fields):
+        """Build an unsaved trace row from a Tracer"""
+        usage = tracer.usage
+        return cls(
+            total_seconds=tracer.elapsed,
+            prompt_tokens=usage.get('prompt_tokens', 0),
+            completion_tokens=usage.get('completion_tokens', 0),
+            cached_prompt_tokens=usage.get('cached_prompt_tokens', 0),
+            total_tokens=usage.get('total_tokens', 0),
+            llm_requests=usage.get('successful_requests', 0),
+            spans=tracer.spans,
+            counters=tracer.counters,
+            **fields
+        )
+
+    class Meta:
+        app_label = 'blog_generator'
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
+
+class GenerationEvent(models.Model):
+    """
+    A progress event of a generation job, replayed to Server-Sent Events
+    clients. Stored in the database so the stream works whichever process
+    runs the job.
+    """
+    KIND_STAGE = 'stage'
+    KIND_TOKENS = 'tokens'
+    KIND_DONE = 'done'
+    KIND_RESUMED = 'resumed'
+
+    job = models.ForeignKey(GenerationJob, on_delete=models.CASCADE, related_name='events')
+    kind = models.CharField(max_length=20)
+    data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.kind} event of job {self.job_id}"
+
+    class Meta:
+        app_label = 'blog_generator'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['job', 'id']),
+        ]
+
+
+class GenerationStep(models.Model):
+    """Output of one completed task of a job, so a failed job can resume after it"""
+    job = models.ForeignKey(GenerationJob, on_delete=models.CASCADE, related_name='steps')
+    name = models.CharField(max_length=50)
+    output = models.TextField()
+    duration = models.FloatField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} step of job {self.job_id}"
+
     class Meta:
-        app_label = 'blog_generator'
\ No newline at end of file
+        app_label = 'blog_generator'
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'name'], name='unique_generation_step'),
+        ]
@@ -0,0 +1,11 @@
+# backend/blog_generator/pagination.py
+
+from rest_framework.pagination import CursorPagination
+
+
+class BlogPostCursorPagination(CursorPagination):
+    """Newest-first cursor pagination; stays O(page size) however deep the client pages"""
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,80 @@
+# backend/blog_generator/renderers.py
+
+import json
+
+from rest_framework import renderers
+
+
+class PassthroughRenderer(renderers.BaseRenderer):
+    """
+    Accept any Accept header for actions that return raw Django responses
+    (PDF/HTML/markdown downloads). Error payloads are still sent as JSON.
+    """
+    media_type = '*/*'
+    format = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or isinstance(data, bytes):
+            return data
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = 'application/json'
+        return json.dumps(data).encode('utf-8')
+
+
+class EventStreamRenderer(PassthroughRenderer):
+    """Content negotiation for Server-Sent Events streams; errors are sent as JSON"""
+    media_type = 'text/event-stream'
+    format = 'sse'
+
+
+class PrometheusRenderer(renderers.BaseRenderer):
+    """Render aggregated generation metrics in the Prometheus text exposition format"""
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    SUMMARIES = [
+        ('stages', 'blog_stage_duration_seconds', 'stage', "Wall time per generation stage"),
+        ('tools', 'blog_tool_call_duration_seconds', 'tool', "Wall time per agent tool call"),
+        ('tokens', 'blog_generation_tokens', 'type', "LLM tokens per generation"),
+    ]
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if 'generations' not in data:
+            # Errors and other payloads are not metrics
+            return json.dumps(data).encode('utf-8')
+
+        lines = []
+        self.write_summary(
+            lines,
+            'blog_generation_duration_seconds',
+            "Wall time per blog generation",
+            [({}, data['generations'])]
+        )
+        for key, metric, label, help_text in self.SUMMARIES:
+            series = [({label: name}, summary) for name, summary in sorted(data[key].items())]
+            self.write_summary(lines, metric, help_text, series)
+
+        lines.append("# HELP blog_generation_events Cache hits, misses and other counters in the window")
+        lines.append("# TYPE blog_generation_events gauge")
+        for name, value in sorted(data['counters'].items()):
+            lines.append(f'blog_generation_events{{event="{name}"}} {value}')
+
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+    @staticmethod
+    def write_summary(lines, metric, help_text, series):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} summary")
+        for labels, summary in series:
+            for quantile, key in (('0.5', 'p50'), ('0.95', 'p95')):
+                if summary[key] is not None:
+                    quantile_labels = ','.join(
+                        [f'{name}="{value}"' for name, value in labels.items()] + [f'quantile="{quantile}"']
+                    )
+                    lines.append(f"{metric}{{{quantile_labels}}} {summary[key]}")
+            label_text = ','.join(f'{name}="{value}"' for name, value in labels.items())
+            label_text = f"{{{label_text}}}" if label_text else ''
+            lines.append(f"{metric}_sum{label_text} {summary['sum']}")
+            lines.append(f"{metric}_count{label_text} {summary['count']}")
@@ -1,7 +1,125 @@
+from django.urls import reverse
 from rest_framework import serializers
-from .models import BlogPost
+from django.conf import settings
+from .models import BlogPost, GenerationBatch, GenerationJob, GenerationStep
+
+class DynamicFieldsMixin:
+    """
+    Restrict serialized fields to the `fields` keyword argument
+    (the view passes the comma separated ?fields= query parameter).
+    Falls back to default_fields when no selection is given.
+    """
+    default_fields = None
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = fields if fields is not None else self.default_fields
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+class BlogPostSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    # Stored compressed; the model decompresses them on access
+    generated_content = serializers.CharField(required=False, allow_blank=True)
+    markdown_content = serializers.CharField(required=False, allow_blank=True)
+    links = serializers.SerializerMethodField()
 
-class BlogPostSerializer(serializers.ModelSerializer):
     class Meta:
         model = BlogPost
-        fields = '__all__'
\ No newline at end of file
+        # Rendered artifacts are downloaded from the endpoints in `links`;
+        # the request fingerprints are internal to generation reuse
+        exclude = [
+            'rendered_html', 'pdf_file', 'content_data', 'content_size', 'generated_data',
+            'request_key', 'request_signature',
+        ]
+        read_only_fields = ['content_hash', 'rendered_at', 'renderer_version']
+
+    def get_links(self, obj):
+        request = self.context.get('request')
+        links = {}
+        for kind in ('pdf', 'html', 'markdown'):
+            url = reverse(f'blog-{kind}', args=[obj.pk])
+            links[kind] = request.build_absolute_uri(url) if request else url
+        return links
+
+class BlogPostSummarySerializer(BlogPostSerializer):
+    """Lightweight representation for list pages; expects a `size` annotation"""
+    size = serializers.IntegerField(read_only=True)
+    hash = serializers.CharField(source='content_hash', read_only=True)
+
+    default_fields = ['id', 'title', 'created_at', 'size', 'hash']
+
+    class Meta(BlogPostSerializer.Meta):
+        pass
+
+class GenerationStepSerializer(serializers.ModelSerializer):
+    """A completed step; its output is large and only kept for resuming"""
+
+    class Meta:
+        model = GenerationStep
+        fields = ['name', 'duration', 'created_at']
+
+class GenerationJobSerializer(serializers.ModelSerializer):
+    result = serializers.SerializerMethodField()
+    steps = GenerationStepSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = GenerationJob
+        fields = [
+            'id', 'title', 'prompts', 'status', 'stage', 'error', 'blog_post',
+            'result', 'steps', 'created_at', 'started_at', 'finished_at', 'updated_at'
+        ]
+
+    def get_result(self, obj):
+        if obj.status != GenerationJob.STATUS_SUCCEEDED or obj.blog_post is None:
+            return None
+        return BlogPostSerializer(obj.blog_post, context=self.context).data
+
+class BatchItemSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=200)
+    prompts = serializers.CharField()
+
+class BatchRequestSerializer(serializers.Serializer):
+    """Input of generate_batch"""
+    items = BatchItemSerializer(many=True, allow_empty=False)
+    max_concurrency = serializers.IntegerField(min_value=1, required=False)
+    reuse = serializers.ChoiceField(choices=['exact', 'never'], default='exact')
+
+    def validate_items(self, items):
+        if len(items) > settings.BLOG_BATCH_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"A batch holds at most {settings.BLOG_BATCH_MAX_ITEMS} items"
+            )
+        return items
+
+    def validate_max_concurrency(self, value):
+        return min(value, settings.BLOG_BATCH_MAX_CONCURRENCY)
+
+class BatchJobSerializer(serializers.ModelSerializer):
+    """Progress of one item of a batch"""
+
+    class Meta:
+        model = GenerationJob
+        fields = ['id', 'title', 'status', 'stage', 'error', 'blog_post', 'started_at', 'finished_at']
+
+class GenerationBatchSerializer(serializers.ModelSerializer):
+    counts = serializers.SerializerMethodField()
+    progress = serializers.SerializerMethodField()
+    jobs = BatchJobSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = GenerationBatch
+        fields = ['id', 'max_concurrency', 'created_at', 'counts', 'progress', 'jobs']
+
+    def get_counts(self, obj):
+        counts = {status: 0 for status, _ in GenerationJob.STATUS_CHOICES}
+        for job in obj.jobs.all():
+            counts[job.status] += 1
+        return counts
+
+    def get_progress(self, obj):
+        """Fraction of items that have finished, successfully or not"""
+        jobs = obj.jobs.all()
+        if not jobs:
+            return 1.0
+        return sum(job.is_finished for job in jobs) / len(jobs)
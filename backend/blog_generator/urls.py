@@ -2,11 +2,14 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BlogPostViewSet
+from .views import BlogPostViewSet, GenerationBatchViewSet, GenerationJobViewSet, MetricsView
 
 router = DefaultRouter()
 router.register(r'blogs', BlogPostViewSet, basename='blog')
+router.register(r'jobs', GenerationJobViewSet, basename='job')
+router.register(r'batches', GenerationBatchViewSet, basename='batch')
 
 urlpatterns = [
+    path('metrics/', MetricsView.as_view(), name='metrics'),
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
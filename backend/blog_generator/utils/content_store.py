@@ -0,0 +1,21 @@
+# backend/blog_generator/utils/content_store.py
+
+import zlib
+from typing import Optional
+
+# Markdown compresses to roughly a quarter of its size at this level;
+# higher levels cost noticeably more CPU for a few percent
+COMPRESSION_LEVEL = 6
+
+
+def compress_text(text: str) -> bytes:
+    if not text:
+        return b''
+    return zlib.compress(text.encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def decompress_text(data: Optional[bytes]) -> str:
+    # PostgreSQL hands binary columns back as memoryview
+    if not data:
+        return ''
+    return zlib.decompress(bytes(data)).decode('utf-8')
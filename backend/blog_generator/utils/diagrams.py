@@ -0,0 +1,150 @@
+# backend/blog_generator/utils/diagrams.py
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+from .render_cache import content_key, get_render_cache
+from .tracing import current_tracer, trace_count
+
+DIAGRAM_FENCE = re.compile(
+    r'^(?P<fence>`{3,}|~{3,})[ \t]*(?P<lang>mermaid|dot|graphviz)[ \t]*\n'
+    r'(?P<source>.*?)\n[ \t]*(?P=fence)[ \t]*$',
+    re.MULTILINE | re.DOTALL
+)
+_XML_PROLOG = re.compile(r'^\s*(<\?xml[^>]*\?>|<!DOCTYPE[^>]*>|<!--.*?-->\s*)*', re.DOTALL)
+
+
+class DiagramRenderer:
+    """
+    Turns ```mermaid and ```dot/```graphviz fences into inline SVG before
+    the markdown is converted, so HTML and PDF show the diagram instead of
+    its source. Mermaid needs the mermaid-cli (mmdc), graphviz the dot
+    binary; when a tool is missing the fence is left as a code block.
+    SVGs are cached by a hash of the diagram source.
+    """
+
+    def __init__(self, cache=None, mermaid_cli: str = 'mmdc', timeout: float = 30):
+        self.cache = cache
+        self.mermaid_cli = mermaid_cli
+        self.timeout = timeout
+
+    def available(self) -> Dict[str, bool]:
+        return {
+            'mermaid': bool(shutil.which(self.mermaid_cli)),
+            'graphviz': bool(shutil.which('dot')),
+        }
+
+    def fingerprint(self) -> str:
+        """Which diagram kinds can be rendered; part of the renderer fingerprint"""
+        return ','.join(kind for kind, ok in sorted(self.available().items()) if ok)
+
+    @staticmethod
+    def cache_key(kind: str, source: str) -> str:
+        return f"{content_key('diagram', kind, source.strip())}.svg"
+
+    def render_svg(self, kind: str, source: str) -> Optional[str]:
+        """SVG markup for a diagram, or None if it cannot be rendered here"""
+        key = self.cache_key(kind, source)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                trace_count('diagram_cache_hits')
+                return cached.decode('utf-8')
+            trace_count('diagram_cache_misses')
+
+        try:
+            with current_tracer().span('render', f'diagram_{kind}'):
+                if kind == 'mermaid':
+                    svg = self._render_mermaid(source)
+                else:
+                    svg = self._render_graphviz(source)
+        except Exception as e:
+            print(f"Error rendering {kind} diagram: {str(e)}")
+            return None
+        if svg is None:
+            return None
+
+        svg = _XML_PROLOG.sub('', svg, count=1)
+        if self.cache is not None:
+            try:
+                self.cache.set(key, svg.encode('utf-8'))
+            except Exception as e:
+                print(f"Diagram cache write error: {str(e)}")
+        return svg
+
+    def _render_mermaid(self, source: str) -> Optional[str]:
+        if not shutil.which(self.mermaid_cli):
+            return None
+        with tempfile.TemporaryDirectory() as directory:
+            source_path = os.path.join(directory, 'diagram.mmd')
+            output_path = os.path.join(directory, 'diagram.svg')
+            with open(source_path, 'w', encoding='utf-8') as f:
+                f.write(source)
+            subprocess.run(
+                [self.mermaid_cli, '-i', source_path, '-o', output_path, '-b', 'transparent'],
+                check=True,
+                capture_output=True,
+                timeout=self.timeout
+            )
+            with open(output_path, encoding='utf-8') as f:
+                return f.read()
+
+    def _render_graphviz(self, source: str) -> Optional[str]:
+        if not shutil.which('dot'):
+            return None
+        import graphviz
+        return graphviz.Source(source).pipe(format='svg').decode('utf-8')
+
+    def substitute(self, markdown_text: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Replace renderable diagram fences with placeholder paragraphs.
+        Returns the new markdown and the SVG for each placeholder.
+        """
+        diagrams = {}
+
+        def replace(match):
+            kind = 'mermaid' if match.group('lang') == 'mermaid' else 'graphviz'
+            svg = self.render_svg(kind, match.group('source'))
+            if svg is None:
+                return match.group(0)
+            placeholder = f"DIAGRAM{len(diagrams)}X{content_key(svg)[:12]}"
+            diagrams[placeholder] = svg
+            return f"\n{placeholder}\n"
+
+        if '```' not in markdown_text and '~~~' not in markdown_text:
+            return markdown_text, diagrams
+        return DIAGRAM_FENCE.sub(replace, markdown_text), diagrams
+
+    @staticmethod
+    def inline(html_content: str, diagrams: Dict[str, str]) -> str:
+        """Put the SVGs in place of their placeholder paragraphs"""
+        for placeholder, svg in diagrams.items():
+            html_content = html_content.replace(
+                f"<p>{placeholder}</p>",
+                f'<div class="diagram">{svg}</div>'
+            )
+        return html_content
+
+
+_diagram_renderer = None
+_diagram_renderer_lock = threading.Lock()
+
+
+def get_diagram_renderer() -> DiagramRenderer:
+    """Return the process-wide diagram renderer configured in settings"""
+    global _diagram_renderer
+    with _diagram_renderer_lock:
+        if _diagram_renderer is None:
+            from django.conf import settings
+            config = settings.BLOG_DIAGRAMS
+            _diagram_renderer = DiagramRenderer(
+                cache=get_render_cache(),
+                mermaid_cli=config.get('MERMAID_CLI', 'mmdc'),
+                timeout=config.get('TIMEOUT', 30)
+            )
+        return _diagram_renderer
@@ -0,0 +1,122 @@
+# backend/blog_generator/utils/export.py
+
+import multiprocessing
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+from django.utils.text import slugify
+
+from ..models import BlogPost
+from .render_worker import render_markdown, setup_worker
+
+EXPORT_FORMATS = ('pdf', 'html', 'md')
+
+# PDFs are already compressed; deflating them again only costs CPU
+COMPRESSION = {
+    'pdf': zipfile.ZIP_STORED,
+    'html': zipfile.ZIP_DEFLATED,
+    'md': zipfile.ZIP_DEFLATED,
+}
+
+
+class ZipStream:
+    """
+    Write-only file object for zipfile that hands out what has been
+    written so far, so an archive can be streamed entry by entry.
+    zipfile writes data descriptors because the stream is not seekable.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def export_name(post: BlogPost, extension: str) -> str:
+    return f"{post.id}-{slugify(post.title) or 'blog'}.{extension}"
+
+
+def export_posts(posts: Iterable[BlogPost], formats: Iterable[str] = EXPORT_FORMATS,
+                 max_workers: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of the posts' PDF/HTML/markdown piece by piece.
+
+    Posts whose stored artifacts match their markdown are exported as they
+    are; the others are rendered across a process pool, a bounded number
+    ahead of the writer, and their new artifacts are stored.
+    """
+    formats = [fmt for fmt in EXPORT_FORMATS if fmt in set(formats)]
+    workers = max_workers or os.cpu_count() or 1
+    # Markdown-only exports never render, so they need no worker processes.
+    # Workers are spawned: forking a process with job worker threads running
+    # can copy locks held by those threads into the child
+    executor = None
+    if {'pdf', 'html'} & set(formats):
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=setup_worker
+        )
+    stream = ZipStream()
+    archive = zipfile.ZipFile(stream, 'w')
+    pending = deque()
+    posts = iter(posts)
+
+    def fill():
+        while len(pending) < 2 * workers:
+            post = next(posts, None)
+            if post is None:
+                return
+            future = None
+            if executor is not None and post.markdown_content and post.artifacts_stale:
+                future = executor.submit(render_markdown, post.markdown_content)
+            pending.append((post, future))
+
+    try:
+        fill()
+        while pending:
+            post, future = pending.popleft()
+            rendered = True
+            if future is not None:
+                try:
+                    pdf_bytes, html_content = future.result()
+                    post.store_artifacts(pdf_bytes, html_content)
+                except Exception as e:
+                    # Keep the archive going; this post is exported as markdown only
+                    print(f"Error rendering blog {post.id} for export: {str(e)}")
+                    rendered = False
+            fill()
+
+            for fmt in formats:
+                if fmt == 'md':
+                    data = post.markdown_content.encode('utf-8')
+                elif not rendered:
+                    continue
+                elif fmt == 'html':
+                    data = post.rendered_html.encode('utf-8')
+                elif post.pdf_file:
+                    data = post.read_pdf()
+                else:
+                    continue
+                archive.writestr(export_name(post, fmt), data, compress_type=COMPRESSION[fmt])
+            yield stream.drain()
+
+        archive.close()
+        yield stream.drain()
+    finally:
+        # Also reached when the client disconnects mid-download
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
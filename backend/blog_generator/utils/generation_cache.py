@@ -0,0 +1,137 @@
+# backend/blog_generator/utils/generation_cache.py
+
+import hashlib
+import random
+import re
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+from django.utils import timezone
+
+from ..models import BlogPost, RequestBand
+
+# Signature length of the MinHash of a request; stored on every post
+NUM_PERM = 64
+SHINGLE_SIZE = 5
+# LSH banding of the signature: requests sharing a band are compared exactly.
+# 16 bands of 4 rows find a pair at similarity 0.8 with probability > 0.999.
+BANDS = 16
+BAND_ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+_WORDS = re.compile(r'\w+')
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase words only, so case, punctuation and spacing do not matter"""
+    return ' '.join(_WORDS.findall(text.lower()))
+
+
+def request_key(title: str, prompts: str) -> str:
+    """Exact-match key of a (title, prompts) request"""
+    normalized = f"{normalize_text(title)}\x00{normalize_text(prompts)}"
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class MinHasher:
+    """MinHash signatures over character shingles, for Jaccard similarity estimates"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.permutations = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_perm)
+        ]
+
+    @staticmethod
+    def shingles(text: str) -> set:
+        if len(text) <= SHINGLE_SIZE:
+            return {text}
+        return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+    def signature(self, text: str) -> List[int]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+            for shingle in self.shingles(text)
+        ]
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self.permutations]
+
+    @staticmethod
+    def similarity(first: List[int], second: List[int]) -> float:
+        if not first or len(first) != len(second):
+            return 0.0
+        return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+_minhasher = MinHasher()
+
+
+def request_signature(title: str, prompts: str) -> List[int]:
+    return _minhasher.signature(normalize_text(f"{title} {prompts}"))
+
+
+def band_keys(signature: List[int]) -> List[int]:
+    """Indexed LSH keys of a signature, one per band (signed 64-bit, as stored)"""
+    if not signature or len(signature) != BANDS * BAND_ROWS:
+        return []
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * BAND_ROWS:(band + 1) * BAND_ROWS]
+        digest = hashlib.blake2b(f"{band}:{rows}".encode('utf-8'), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+class GenerationCache:
+    """
+    Finds earlier blog posts generated for the same request (exact match on
+    the normalized title and prompts) or a near-identical one (MinHash
+    similarity), within a freshness window.
+    """
+
+    def __init__(self, max_age: Optional[float] = None, similarity: float = 0.8,
+                 max_candidates: int = 5000):
+        self.max_age = max_age
+        self.similarity = similarity
+        self.max_candidates = max_candidates
+
+    def fresh_posts(self):
+        queryset = BlogPost.objects.exclude(content_size=0)
+        if self.max_age:
+            queryset = queryset.filter(created_at__gte=timezone.now() - timedelta(seconds=self.max_age))
+        return queryset.order_by('-created_at')
+
+    def find_exact(self, title: str, prompts: str) -> Optional[BlogPost]:
+        """The newest fresh post generated for the same normalized request"""
+        return self.fresh_posts().filter(request_key=request_key(title, prompts)).first()
+
+    def find_similar(self, title: str, prompts: str, limit: int = 3) -> List[Tuple[BlogPost, float]]:
+        """Fresh posts whose request is a near-duplicate, most similar first"""
+        signature = request_signature(title, prompts)
+        # Only posts sharing an LSH band with the request, found through the band index
+        bands = RequestBand.objects.filter(key__in=band_keys(signature)).values('post_id')
+        candidates = (
+            self.fresh_posts()
+            .filter(id__in=bands)
+            .only('id', 'title', 'created_at', 'request_signature')[:self.max_candidates]
+        )
+        matches = []
+        for post in candidates:
+            score = MinHasher.similarity(signature, post.request_signature)
+            if score >= self.similarity:
+                matches.append((post, score))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:limit]
+
+
+def get_generation_cache() -> Optional[GenerationCache]:
+    """The generation cache configured in settings, or None when disabled"""
+    from django.conf import settings
+    config = settings.BLOG_GENERATION_CACHE
+    if not config.get('ENABLED', True):
+        return None
+    return GenerationCache(
+        max_age=config.get('MAX_AGE'),
+        similarity=config.get('SIMILARITY', 0.8),
+        max_candidates=config.get('MAX_CANDIDATES', 5000)
+    )
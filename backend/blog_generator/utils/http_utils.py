@@ -0,0 +1,148 @@
+# backend/blog_generator/utils/http_utils.py
+
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, BinaryIO, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_etags, quote_etag
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=start-end` Range header into an inclusive (start, end) pair.
+    Returns None for headers we do not handle (serve the full body instead) and
+    raises ValueError when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or end < start:
+        raise ValueError("Range not satisfiable")
+    return start, min(end, size - 1)
+
+
+def read_range(fileobj: BinaryIO, start: int, end: int):
+    """Yield the bytes between start and end (inclusive) in chunks"""
+    try:
+        fileobj.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = fileobj.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+async def iterate_in_thread(iterable: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    Async iterator over a blocking one. Every step runs in one thread of
+    its own, so iterators holding a database cursor or an open file stay
+    on the thread (and connection) that opened them.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1)
+    iterator = iter(iterable)
+    done = object()
+
+    def close():
+        # Runs the generator's cleanup, e.g. after a client disconnect
+        if hasattr(iterator, 'close'):
+            iterator.close()
+        connections.close_all()
+
+    try:
+        while True:
+            chunk = await loop.run_in_executor(executor, next, iterator, done)
+            if chunk is done:
+                break
+            yield chunk
+    finally:
+        await loop.run_in_executor(executor, close)
+        executor.shutdown(wait=False)
+
+
+def stream_body(iterable: Iterable[bytes]):
+    """
+    Content for a StreamingHttpResponse. Under ASGI (BLOG_ASYNC_STREAMING)
+    Django would read a blocking iterator to the end before sending anything.
+    """
+    if settings.BLOG_ASYNC_STREAMING:
+        return iterate_in_thread(iterable)
+    return iterable
+
+
+def serve_file(request, fileobj: BinaryIO, size: int, content_type: str, etag: str,
+               last_modified=None, filename: Optional[str] = None):
+    """
+    Stream a file-like object with ETag/Last-Modified validators,
+    answering conditional requests with 304 and Range requests with 206.
+    last_modified is a datetime; etag is an unquoted validator string.
+    """
+    etag = quote_etag(etag)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        fileobj.close()
+    else:
+        byte_range = None
+        range_header = request.META.get('HTTP_RANGE')
+        # A stale If-Range means the client's partial copy is outdated: send everything
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if range_header and (not if_range or etag in parse_etags(if_range)):
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                fileobj.close()
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f"bytes */{size}"
+                return response
+
+        if byte_range is None and not settings.BLOG_ASYNC_STREAMING:
+            response = FileResponse(fileobj, content_type=content_type, filename=filename or '')
+            response['Content-Length'] = str(size)
+        else:
+            # FileResponse, too, is read to the end first under ASGI
+            start, end = byte_range or (0, size - 1)
+            response = StreamingHttpResponse(
+                stream_body(read_range(fileobj, start, end)),
+                status=206 if byte_range else 200,
+                content_type=content_type
+            )
+            if byte_range:
+                response['Content-Range'] = f"bytes {start}-{end}/{size}"
+            response['Content-Length'] = str(end - start + 1)
+            if filename:
+                response['Content-Disposition'] = content_disposition_header(False, filename)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(timestamp)
+    # Clients may cache, but must revalidate so edits show up immediately
+    response['Cache-Control'] = 'no-cache'
+    return response
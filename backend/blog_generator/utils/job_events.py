@@ -0,0 +1,161 @@
+# backend/blog_generator/utils/job_events.py
+
+import asyncio
+import json
+import threading
+import time
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from ..models import GenerationEvent, GenerationJob
+
+# Comment line sent on idle streams so proxies keep the connection open
+HEARTBEAT_INTERVAL = 15
+
+
+class JobEventRecorder:
+    """
+    Records a job's stage changes and the writer's streamed markdown as
+    GenerationEvent rows. Tokens are batched for a short interval so a
+    streaming LLM does not cost one database write per token.
+    """
+
+    def __init__(self, job: GenerationJob, flush_interval: Optional[float] = None):
+        self.job = job
+        self.flush_interval = (
+            settings.BLOG_EVENT_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        )
+        self._lock = threading.Lock()
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def record(self, kind: str, data: dict) -> GenerationEvent:
+        return GenerationEvent.objects.create(job_id=self.job.pk, kind=kind, data=data)
+
+    def stage(self, stage: str):
+        """Progress callback: store the job's stage and announce it"""
+        self.flush()
+        self.job.set_stage(stage)
+        self.record(GenerationEvent.KIND_STAGE, {'stage': stage})
+
+    def token(self, text: str):
+        """Token callback: buffer streamed markdown, storing it at most every flush_interval"""
+        with self._lock:
+            self._pending.append(text)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            text = ''.join(self._pending)
+            self._pending = []
+            self._last_flush = time.monotonic()
+        if text:
+            self.record(GenerationEvent.KIND_TOKENS, {'text': text})
+
+    def finish(self):
+        """Store any buffered text and the job's final status"""
+        self.flush()
+        self.record(GenerationEvent.KIND_DONE, done_data(self.job))
+
+
+def done_data(job: GenerationJob) -> dict:
+    return {
+        'status': job.status,
+        'blog_post': job.blog_post_id,
+        'error': job.error,
+    }
+
+
+def format_event(event_id, kind: str, data: dict) -> str:
+    """One Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {kind}")
+    lines.append(f"data: {json.dumps(data)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def poll_job_events(job_id: int, after: int) -> List[Tuple[Optional[int], str, dict, bool]]:
+    """
+    A job's events after event id `after` as (id, kind, data, last) tuples;
+    `last` marks where the stream ends. Jobs finished by a worker that
+    recorded no events get a synthesized done event.
+    """
+    messages = []
+    for event in GenerationEvent.objects.filter(job_id=job_id, id__gt=after):
+        # A failed job may have been resumed since; then the stream goes on
+        last = event.kind == GenerationEvent.KIND_DONE and not GenerationEvent.objects.filter(
+            job_id=job_id, id__gt=event.id, kind=GenerationEvent.KIND_RESUMED
+        ).exists()
+        messages.append((event.id, event.kind, event.data, last))
+        if last:
+            return messages
+
+    if not messages:
+        job = GenerationJob.objects.filter(pk=job_id).first()
+        if job is None or job.is_finished:
+            data = done_data(job) if job else {'status': 'missing', 'blog_post': None, 'error': ''}
+            messages.append((None, GenerationEvent.KIND_DONE, data, True))
+    return messages
+
+
+def stream_job_events(job_id: int, after: int = 0,
+                      poll_interval: Optional[float] = None) -> Iterator[str]:
+    """
+    Yield a job's events as Server-Sent Events, starting after event id
+    `after` (the client's Last-Event-ID), until the job is done.
+    """
+    if poll_interval is None:
+        poll_interval = settings.BLOG_EVENT_POLL_INTERVAL
+    last_sent = time.monotonic()
+
+    while True:
+        messages = poll_job_events(job_id, after)
+        for event_id, kind, data, last in messages:
+            after = event_id or after
+            yield format_event(event_id, kind, data)
+            if last:
+                return
+
+        if messages:
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent >= HEARTBEAT_INTERVAL:
+            last_sent = time.monotonic()
+            yield ": keep-alive\n\n"
+
+        time.sleep(poll_interval)
+
+
+async def astream_job_events(job_id: int, after: int = 0,
+                             poll_interval: Optional[float] = None) -> AsyncIterator[str]:
+    """
+    stream_job_events for ASGI: waiting between polls holds no thread,
+    so one process can serve many open streams
+    """
+    if poll_interval is None:
+        poll_interval = settings.BLOG_EVENT_POLL_INTERVAL
+    last_sent = time.monotonic()
+    # Not thread-sensitive: polls of many streams must not queue behind one
+    # another (and behind every sync view) on the single shared thread
+    poll = sync_to_async(poll_job_events, thread_sensitive=False)
+
+    while True:
+        messages = await poll(job_id, after)
+        for event_id, kind, data, last in messages:
+            after = event_id or after
+            yield format_event(event_id, kind, data)
+            if last:
+                return
+
+        if messages:
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent >= HEARTBEAT_INTERVAL:
+            last_sent = time.monotonic()
+            yield ": keep-alive\n\n"
+
+        await asyncio.sleep(poll_interval)
@@ -0,0 +1,336 @@
+# backend/blog_generator/utils/job_queue.py
+
+import datetime
+import threading
+import time
+from typing import Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from ..models import (
+    BlogPost, GenerationBatch, GenerationEvent, GenerationJob, GenerationStep, GenerationTrace
+)
+from .job_events import JobEventRecorder
+from .tracing import Tracer, use_tracer
+
+
+class JobQueue:
+    """
+    Bounded local worker pool backed by the GenerationJob table.
+
+    Web server processes start their worker threads at startup (see
+    apps.py), or run_job_workers runs them in a process of its own.
+    Workers claim jobs with a conditional UPDATE, so several processes can
+    share the same database table without handing one job out twice.
+
+    A heartbeat thread keeps the jobs this process runs marked alive and
+    queues again the running jobs of processes that stopped doing so (a
+    crash or restart); they resume after their last completed step.
+    """
+
+    def __init__(self, max_workers: int, poll_interval: float = 1.0, stale_after: float = 600):
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._running = set()
+
+    def start(self):
+        """Spawn the worker and heartbeat threads if they are not running yet"""
+        with self._lock:
+            if self._threads or self.max_workers < 1:
+                return
+            targets = [(f"blog-job-worker-{index}", self._worker_loop) for index in range(self.max_workers)]
+            targets.append(('blog-job-heartbeat', self._heartbeat_loop))
+            for name, target in targets:
+                thread = threading.Thread(target=target, name=name, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def enqueue(self, title: str, prompts: str) -> GenerationJob:
+        """Persist a new job and wake up an idle worker"""
+        job = GenerationJob.objects.create(title=title, prompts=prompts)
+        self.start()
+        self.notify()
+        return job
+
+    def enqueue_batch(self, items: Iterable[Tuple[str, str]], max_concurrency: int,
+                      cached: Optional[dict] = None) -> GenerationBatch:
+        """
+        Persist a batch of (title, prompts) jobs. At most max_concurrency of
+        them run at once. cached maps item indexes to earlier posts that
+        answer them; those jobs are created already finished.
+        """
+        cached = cached or {}
+        now = timezone.now()
+        with transaction.atomic():
+            batch = GenerationBatch.objects.create(max_concurrency=max_concurrency)
+            jobs = []
+            for index, (title, prompts) in enumerate(items):
+                job = GenerationJob(batch=batch, title=title, prompts=prompts)
+                if index in cached:
+                    job.status = GenerationJob.STATUS_SUCCEEDED
+                    job.stage = 'cached'
+                    job.blog_post = cached[index]
+                    job.started_at = job.finished_at = now
+                jobs.append(job)
+            GenerationJob.objects.bulk_create(jobs)
+        self.start()
+        self.notify()
+        return batch
+
+    def complete_from_cache(self, title: str, prompts: str, blog_post: BlogPost) -> GenerationJob:
+        """Record a request answered by an earlier generation as an already finished job"""
+        now = timezone.now()
+        return GenerationJob.objects.create(
+            title=title,
+            prompts=prompts,
+            status=GenerationJob.STATUS_SUCCEEDED,
+            stage='cached',
+            blog_post=blog_post,
+            started_at=now,
+            finished_at=now
+        )
+
+    def resume(self, job: GenerationJob) -> bool:
+        """
+        Queue a failed job again. It restarts after its last completed step.
+        Returns False if the job is not in the failed state.
+        """
+        resumed = GenerationJob.objects.filter(
+            pk=job.pk,
+            status=GenerationJob.STATUS_FAILED
+        ).update(
+            status=GenerationJob.STATUS_QUEUED,
+            stage='',
+            error='',
+            finished_at=None,
+            updated_at=timezone.now()
+        )
+        if resumed:
+            job.refresh_from_db()
+            JobEventRecorder(job).record(GenerationEvent.KIND_RESUMED, {})
+            self.start()
+            self.notify()
+        return bool(resumed)
+
+    def notify(self):
+        self._wakeup.set()
+
+    @staticmethod
+    def claimable() -> Q:
+        """Jobs outside a batch, or in a batch below its concurrency limit"""
+        open_batches = (
+            GenerationBatch.objects
+            .annotate(running=Count('jobs', filter=Q(jobs__status=GenerationJob.STATUS_RUNNING)))
+            .filter(running__lt=F('max_concurrency'))
+            .values('id')
+        )
+        return Q(batch__isnull=True) | Q(batch__in=open_batches)
+
+    def claim_next(self) -> Optional[GenerationJob]:
+        """Atomically move the oldest claimable queued job to running and return it"""
+        candidates = (
+            GenerationJob.objects
+            .filter(self.claimable(), status=GenerationJob.STATUS_QUEUED)
+            .order_by('created_at', 'id')
+            .values_list('id', flat=True)[:self.max_workers]
+        )
+        for job_id in list(candidates):
+            with transaction.atomic():
+                # The batch limit is checked again in the same statement
+                claimed = GenerationJob.objects.filter(
+                    self.claimable(),
+                    id=job_id,
+                    status=GenerationJob.STATUS_QUEUED
+                ).update(
+                    status=GenerationJob.STATUS_RUNNING,
+                    started_at=timezone.now(),
+                    updated_at=timezone.now()
+                )
+            if claimed:
+                return GenerationJob.objects.get(id=job_id)
+        return None
+
+    def requeue_stale(self) -> int:
+        """Queue again running jobs whose process stopped marking them alive"""
+        cutoff = timezone.now() - datetime.timedelta(seconds=self.stale_after)
+        with self._lock:
+            running = list(self._running)
+        requeued = GenerationJob.objects.filter(
+            status=GenerationJob.STATUS_RUNNING,
+            updated_at__lt=cutoff
+        ).exclude(id__in=running).update(
+            status=GenerationJob.STATUS_QUEUED,
+            stage='',
+            started_at=None,
+            updated_at=timezone.now()
+        )
+        if requeued:
+            print(f"Requeued {requeued} stale generation jobs")
+            self.notify()
+        return requeued
+
+    def _heartbeat_loop(self):
+        interval = max(1.0, min(60.0, self.stale_after / 4))
+        while True:
+            close_old_connections()
+            try:
+                with self._lock:
+                    running = list(self._running)
+                if running:
+                    GenerationJob.objects.filter(
+                        id__in=running,
+                        status=GenerationJob.STATUS_RUNNING
+                    ).update(updated_at=timezone.now())
+                self.requeue_stale()
+            except Exception as e:
+                print(f"Error in generation job heartbeat: {str(e)}")
+            time.sleep(interval)
+
+    def _worker_loop(self):
+        while True:
+            close_old_connections()
+            try:
+                job = self.claim_next()
+            except Exception as e:
+                print(f"Error claiming generation job: {str(e)}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            with self._lock:
+                self._running.add(job.id)
+            try:
+                self.run_job(job)
+            finally:
+                with self._lock:
+                    self._running.discard(job.id)
+
+    def run_job(self, job: GenerationJob):
+        """Run a claimed job to completion and record the outcome"""
+        events = JobEventRecorder(job)
+        try:
+            blog_post = run_generation(job, events)
+            job.blog_post = blog_post
+            job.status = GenerationJob.STATUS_SUCCEEDED
+            job.stage = 'done'
+        except Exception as e:
+            print(f"Error running generation job {job.id}: {str(e)}")
+            job.status = GenerationJob.STATUS_FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = timezone.now()
+            job.save(update_fields=['blog_post', 'status', 'stage', 'error', 'finished_at', 'updated_at'])
+            try:
+                events.finish()
+            except Exception as e:
+                print(f"Error recording events for job {job.id}: {str(e)}")
+            close_old_connections()
+
+
+def run_generation(job: GenerationJob, events: Optional[JobEventRecorder] = None) -> BlogPost:
+    """Run the crew for a job and store the resulting blog post and its trace"""
+    tracer = Tracer()
+    blog_post = None
+    try:
+        with use_tracer(tracer):
+            blog_post = generate_post(job, events or JobEventRecorder(job))
+        return blog_post
+    finally:
+        try:
+            GenerationTrace.from_tracer(
+                tracer,
+                job=job,
+                blog_post=blog_post,
+                succeeded=blog_post is not None
+            ).save()
+        except Exception as e:
+            print(f"Error saving trace for job {job.id}: {str(e)}")
+
+
+class JobCheckpoints:
+    """Task checkpoints of a job, stored as GenerationStep rows"""
+
+    def __init__(self, job: GenerationJob):
+        self.job = job
+
+    def load(self, key: str, names) -> dict:
+        return dict(
+            GenerationStep.objects
+            .filter(job=self.job, name__in=list(names))
+            .values_list('name', 'output')
+        )
+
+    def save(self, key: str, name: str, output: str, duration: float = 0):
+        # One upsert statement: a SELECT then INSERT in a transaction cannot
+        # wait for SQLite's write lock and fails while other jobs write
+        GenerationStep.objects.bulk_create(
+            [GenerationStep(job=self.job, name=name, output=output, duration=duration)],
+            update_conflicts=True,
+            unique_fields=['job', 'name'],
+            update_fields=['output', 'duration']
+        )
+
+    def discard(self, key: str, names):
+        # Steps of finished jobs are kept as a record of the run
+        pass
+
+
+def generate_post(job: GenerationJob, events: JobEventRecorder) -> BlogPost:
+    from ..agents.blog_agents import BlogCrewAgent
+
+    agent = BlogCrewAgent()
+    generated_content = agent.generate_blog(
+        job.title,
+        job.prompts,
+        progress_callback=events.stage,
+        token_callback=events.token,
+        checkpoints=JobCheckpoints(job)
+    )
+    events.flush()
+
+    if not generated_content:
+        raise ValueError("Failed to generate content")
+
+    # The generated text is the initial markdown; it is stored once
+    blog_post = BlogPost.objects.create(
+        title=job.title,
+        prompts=job.prompts,
+        markdown_content=generated_content
+    )
+
+    # Render HTML and PDF once here so reads only serve stored files
+    events.stage('rendering')
+    try:
+        blog_post.render_artifacts()
+    except Exception as e:
+        # The post is still usable; reads will retry the render
+        print(f"Error rendering blog {blog_post.id}: {str(e)}")
+
+    return blog_post
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue, creating it on first use"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(
+                max_workers=settings.BLOG_JOB_WORKERS,
+                poll_interval=settings.BLOG_JOB_POLL_INTERVAL,
+                stale_after=settings.BLOG_JOB_STALE_AFTER
+            )
+        return _job_queue
@@ -349,107 +349,190 @@
 
 import markdown
 from weasyprint import HTML, CSS
-from typing import Tuple
+from weasyprint.text.fonts import FontConfiguration
+from typing import Optional, Tuple
 import base64
-from io import BytesIO
+import threading
+from .diagrams import get_diagram_renderer
+from .render_cache import content_key, get_render_cache
+from .tracing import current_tracer, trace_count
+
+# Bump when the rendering pipeline changes in a way the extensions and
+# stylesheet below do not capture, so cached renders are not reused
+RENDERER_VERSION = '2'
+
+MARKDOWN_EXTENSIONS = [
+    'extra',
+    'codehilite',
+    'tables',
+    'toc',
+    'fenced_code',
+    'sane_lists'
+]
+
+STYLESHEET = """@page {
+    margin: 2.5cm;
+    @top-center {
+        content: "Blog Post";
+    }
+    @bottom-center {
+        content: counter(page);
+    }
+}
+body {
+    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
+    line-height: 1.6;
+    font-size: 11pt;
+}
+h1, h2, h3 {
+    color: #1a1a1a;
+    margin-top: 1.5em;
+    margin-bottom: 0.5em;
+}
+h1 { font-size: 24pt; }
+h2 { font-size: 18pt; }
+h3 { font-size: 14pt; }
+code {
+    font-family: "SFMono-Regular", Consolas, "Liberation Mono", Menlo, Courier, monospace;
+    background-color: #f6f8fa;
+    padding: 0.2em 0.4em;
+    border-radius: 3px;
+    font-size: 85%;
+}
+pre {
+    background-color: #f6f8fa;
+    padding: 16px;
+    border-radius: 6px;
+    overflow-x: auto;
+    line-height: 1.45;
+}
+blockquote {
+    border-left: 4px solid #dfe2e5;
+    color: #6a737d;
+    margin: 0;
+    padding-left: 1em;
+}
+img {
+    max-width: 100%;
+    height: auto;
+}
+table {
+    border-collapse: collapse;
+    width: 100%;
+    margin: 1em 0;
+}
+th, td {
+    border: 1px solid #dfe2e5;
+    padding: 6px 13px;
+}
+th {
+    background-color: #f6f8fa;
+}
+a {
+    color: #0366d6;
+    text-decoration: none;
+}
+ul, ol {
+    padding-left: 2em;
+}
+li {
+    margin: 0.25em 0;
+}
+.mermaid {
+    text-align: center;
+}
+.diagram {
+    text-align: center;
+    margin: 1em 0;
+}
+.diagram svg {
+    max-width: 100%;
+    height: auto;
+}
+"""
+
+
+class RenderEngine:
+    """
+    Rendering state that is expensive to build and safe to reuse: a
+    markdown.Markdown parser with its extensions, the parsed stylesheet and
+    WeasyPrint's font configuration. Each thread gets its own set, since
+    none of them may be shared between concurrent renders.
+    """
+
+    def __init__(self, extensions=None, stylesheet: str = STYLESHEET):
+        self.extensions = list(extensions or MARKDOWN_EXTENSIONS)
+        self.stylesheet_source = stylesheet
+        self._local = threading.local()
+
+    def markdown_parser(self) -> markdown.Markdown:
+        parser = getattr(self._local, 'parser', None)
+        if parser is None:
+            parser = markdown.Markdown(extensions=self.extensions)
+            self._local.parser = parser
+        return parser
+
+    def markdown_to_html(self, markdown_text: str) -> str:
+        # reset() clears per-document state such as the toc and footnotes
+        return self.markdown_parser().reset().convert(markdown_text)
+
+    def font_config(self) -> FontConfiguration:
+        font_config = getattr(self._local, 'font_config', None)
+        if font_config is None:
+            font_config = FontConfiguration()
+            self._local.font_config = font_config
+        return font_config
+
+    def stylesheet(self) -> CSS:
+        css = getattr(self._local, 'css', None)
+        if css is None:
+            css = CSS(string=self.stylesheet_source, font_config=self.font_config())
+            self._local.css = css
+        return css
+
+    def write_pdf(self, document_html: str) -> bytes:
+        """Render an HTML document without inline styles to PDF with the parsed stylesheet"""
+        return HTML(string=document_html).write_pdf(
+            stylesheets=[self.stylesheet()],
+            font_config=self.font_config()
+        )
+
+
+_render_engine = None
+
+
+def get_render_engine() -> RenderEngine:
+    """Return the process-wide render engine"""
+    global _render_engine
+    if _render_engine is None:
+        _render_engine = RenderEngine()
+    return _render_engine
+
 
 class MarkdownConverter:
+    _fingerprint: Optional[str] = None
+
     @staticmethod
     def markdown_to_html(markdown_text: str) -> str:
-        """Convert markdown to HTML with extensions"""
-        return markdown.markdown(
-            markdown_text,
-            extensions=[
-                'extra',
-                'codehilite',
-                'tables',
-                'toc',
-                'fenced_code',
-                'sane_lists'
-            ]
-        )
+        """Convert markdown to HTML with extensions, with diagram fences rendered to inline SVG"""
+        diagram_renderer = get_diagram_renderer()
+        markdown_text, diagrams = diagram_renderer.substitute(markdown_text)
+        html_content = get_render_engine().markdown_to_html(markdown_text)
+        return diagram_renderer.inline(html_content, diagrams)
     
     @staticmethod
-    def get_styled_html(html_content: str) -> str:
-        """Returns HTML with styling"""
+    def get_styled_html(html_content: str, inline_css: bool = True) -> str:
+        """
+        Returns HTML with styling. PDF rendering leaves the stylesheet out
+        and applies the engine's pre-parsed copy instead.
+        """
+        style = f"<style>\n{STYLESHEET}</style>" if inline_css else ""
         return f"""
         <!DOCTYPE html>
         <html>
             <head>
                 <meta charset="UTF-8">
-                <style>
-                    @page {{
-                        margin: 2.5cm;
-                        @top-center {{
-                            content: "Blog Post";
-                        }}
-                        @bottom-center {{
-                            content: counter(page);
-                        }}
-                    }}
-                    body {{
-                        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-                        line-height: 1.6;
-                        font-size: 11pt;
-                    }}
-                    h1, h2, h3 {{
-                        color: #1a1a1a;
-                        margin-top: 1.5em;
-                        margin-bottom: 0.5em;
-                    }}
-                    h1 {{ font-size: 24pt; }}
-                    h2 {{ font-size: 18pt; }}
-                    h3 {{ font-size: 14pt; }}
-                    code {{
-                        font-family: "SFMono-Regular", Consolas, "Liberation Mono", Menlo, Courier, monospace;
-                        background-color: #f6f8fa;
-                        padding: 0.2em 0.4em;
-                        border-radius: 3px;
-                        font-size: 85%;
-                    }}
-                    pre {{
-                        background-color: #f6f8fa;
-                        padding: 16px;
-                        border-radius: 6px;
-                        overflow-x: auto;
-                        line-height: 1.45;
-                    }}
-                    blockquote {{
-                        border-left: 4px solid #dfe2e5;
-                        color: #6a737d;
-                        margin: 0;
-                        padding-left: 1em;
-                    }}
-                    img {{
-                        max-width: 100%;
-                        height: auto;
-                    }}
-                    table {{
-                        border-collapse: collapse;
-                        width: 100%;
-                        margin: 1em 0;
-                    }}
-                    th, td {{
-                        border: 1px solid #dfe2e5;
-                        padding: 6px 13px;
-                    }}
-                    th {{
-                        background-color: #f6f8fa;
-                    }}
-                    a {{
-                        color: #0366d6;
-                        text-decoration: none;
-                    }}
-                    ul, ol {{
-                        padding-left: 2em;
-                    }}
-                    li {{
-                        margin: 0.25em 0;
-                    }}
-                    .mermaid {{
-                        text-align: center;
-                    }}
-                </style>
+                {style}
             </head>
             <body>
                 {html_content}
@@ -457,6 +540,69 @@ class MarkdownConverter:
         </html>
         """
 
+    @classmethod
+    def renderer_fingerprint(cls) -> str:
+        """Hash of everything besides the markdown that affects the rendered output"""
+        if cls._fingerprint is None:
+            cls._fingerprint = content_key(
+                RENDERER_VERSION,
+                ','.join(MARKDOWN_EXTENSIONS),
+                cls.get_styled_html(''),
+                get_diagram_renderer().fingerprint()
+            )
+        return cls._fingerprint
+
+    @classmethod
+    def cache_key(cls, markdown_text: str) -> str:
+        """Content-addressed cache key for a markdown document"""
+        return content_key(cls.renderer_fingerprint(), markdown_text)
+
+    @classmethod
+    def invalidate(cls, markdown_text: str):
+        """Drop any cached render of the given markdown"""
+        key = cls.cache_key(markdown_text)
+        cache = get_render_cache()
+        cache.delete(f"{key}.pdf")
+        cache.delete(f"{key}.html")
+
+    @classmethod
+    def render(cls, markdown_text: str, use_cache: bool = True) -> Tuple[bytes, str]:
+        """
+        Convert markdown to PDF bytes and styled HTML, reusing cached renders
+        Returns:
+            Tuple[bytes, str]: (pdf_bytes, html_content)
+        """
+        key = cls.cache_key(markdown_text)
+        cache = get_render_cache()
+
+        if use_cache:
+            pdf_bytes = cache.get(f"{key}.pdf")
+            html_bytes = cache.get(f"{key}.html")
+            if pdf_bytes is not None and html_bytes is not None:
+                trace_count('render_cache_hits')
+                return pdf_bytes, html_bytes.decode('utf-8')
+            trace_count('render_cache_misses')
+
+        with current_tracer().span('render', 'pdf'):
+            # Convert markdown to HTML
+            html_content = cls.markdown_to_html(markdown_text)
+            styled_html = cls.get_styled_html(html_content)
+
+            # Convert to PDF with the engine's pre-parsed stylesheet
+            pdf_bytes = get_render_engine().write_pdf(
+                cls.get_styled_html(html_content, inline_css=False)
+            )
+
+        if use_cache:
+            try:
+                cache.set(f"{key}.pdf", pdf_bytes)
+                cache.set(f"{key}.html", styled_html.encode('utf-8'))
+            except Exception as e:
+                # A failing cache store must never fail the render itself
+                print(f"Render cache write error: {str(e)}")
+
+        return pdf_bytes, styled_html
+
     @staticmethod
     def create_pdf(markdown_text: str) -> Tuple[str, str]:
         """
@@ -465,16 +611,10 @@ class MarkdownConverter:
             Tuple[str, str]: (base64_encoded_pdf, html_content)
         """
         try:
-            # Convert markdown to HTML
-            html_content = MarkdownConverter.markdown_to_html(markdown_text)
-            styled_html = MarkdownConverter.get_styled_html(html_content)
-            
-            # Convert to PDF using BytesIO
-            pdf_buffer = BytesIO()
-            HTML(string=styled_html).write_pdf(pdf_buffer)
+            pdf_bytes, styled_html = MarkdownConverter.render(markdown_text)
             
             # Convert to base64
-            pdf_base64 = base64.b64encode(pdf_buffer.getvalue()).decode('utf-8')
+            pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
             
             return pdf_base64, styled_html
             
@@ -0,0 +1,145 @@
+# backend/blog_generator/utils/post_search.py
+
+import datetime
+import re
+from typing import Iterable, Mapping, Optional, Tuple
+
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+FTS_TABLE = 'blog_generator_blogpost_fts'
+POST_TABLE = 'blog_generator_blogpost'
+
+SearchValues = Tuple[str, str, str]
+
+# SQLite: a contentless FTS5 table. The post text is stored compressed, so
+# the database cannot index it itself; update_search_index writes it on save
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, prompts, markdown_content,
+        content='', tokenize='porter unicode61'
+    )""",
+]
+SQLITE_DROP = [
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# PostgreSQL: a tsvector column with a GIN index, filled on save
+POSTGRES_CREATE = [
+    f"ALTER TABLE {POST_TABLE} ADD COLUMN search_vector tsvector",
+    f"CREATE INDEX {POST_TABLE}_search_vector ON {POST_TABLE} USING GIN (search_vector)",
+]
+POSTGRES_DROP = [
+    f"DROP INDEX IF EXISTS {POST_TABLE}_search_vector",
+    f"ALTER TABLE {POST_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', %s), 'A') || "
+    "setweight(to_tsvector('english', %s), 'B') || "
+    "setweight(to_tsvector('english', %s), 'C')"
+)
+
+
+def create_search_index(apps, schema_editor):
+    """Migration step: create the (empty) full-text index for the current database"""
+    statements = {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def update_search_index(post_id: int, values: Optional[SearchValues],
+                        previous: Optional[SearchValues] = None, using=None):
+    """
+    Index a post's (title, prompts, markdown), replacing the previously
+    indexed values; values=None removes the post. A contentless FTS5 table
+    can only remove exactly what was indexed, hence `previous`.
+    """
+    using = using or connection
+    with using.cursor() as cursor:
+        if using.vendor == 'sqlite':
+            if previous is not None:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, prompts, markdown_content) "
+                    "VALUES ('delete', %s, %s, %s, %s)",
+                    [post_id, *previous]
+                )
+            if values is not None:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (rowid, title, prompts, markdown_content) VALUES (%s, %s, %s, %s)",
+                    [post_id, *values]
+                )
+        elif using.vendor == 'postgresql' and values is not None:
+            cursor.execute(
+                f"UPDATE {POST_TABLE} SET search_vector = {POSTGRES_VECTOR} WHERE id = %s",
+                [*values, post_id]
+            )
+
+
+def index_posts(rows: Iterable[Tuple[int, str, str, str]], using=None):
+    """Index newly stored posts given as (id, title, prompts, markdown) rows"""
+    for post_id, *values in rows:
+        update_search_index(post_id, tuple(values), using=using)
+
+
+def search_posts(queryset: QuerySet, query: str) -> QuerySet:
+    """Posts matching every word of the query in their title, prompts or content"""
+    words = re.findall(r'\w+', query.lower())
+    if not words:
+        return queryset.none()
+
+    if connection.vendor == 'sqlite':
+        # Quoted terms, so FTS5 query syntax in user input is taken literally
+        match = ' '.join(f'"{word}"' for word in words)
+        return queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,)
+        ))
+    if connection.vendor == 'postgresql':
+        return queryset.filter(id__in=RawSQL(
+            f"SELECT id FROM {POST_TABLE} WHERE search_vector @@ plainto_tsquery('english', %s)",
+            (' '.join(words),)
+        ))
+
+    # Other databases have no index here, and the content is compressed;
+    # fall back to scanning titles and prompts
+    for word in words:
+        queryset = queryset.filter(Q(title__icontains=word) | Q(prompts__icontains=word))
+    return queryset
+
+
+def parse_timestamp(value: str, end_of_day: bool = False) -> datetime.datetime:
+    """An ISO date or datetime; a bare date covers the whole day when end_of_day"""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date: {value}")
+        parsed = datetime.datetime.combine(day, datetime.time.max if end_of_day else datetime.time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_posts(queryset: QuerySet, params: Mapping[str, str]) -> QuerySet:
+    """
+    Apply the ?q= (full-text), ?since= and ?until= (ISO date or datetime,
+    inclusive) filters. Raises ValueError for unparsable dates.
+    """
+    since = params.get('since')
+    until = params.get('until')
+    query = params.get('q')
+    if since:
+        queryset = queryset.filter(created_at__gte=parse_timestamp(since))
+    if until:
+        queryset = queryset.filter(created_at__lte=parse_timestamp(until, end_of_day=True))
+    if query and query.strip():
+        queryset = search_posts(queryset, query)
+    return queryset
@@ -0,0 +1,180 @@
+# backend/blog_generator/utils/render_cache.py
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+
+
+class RenderCacheBackend:
+    """Interface for render cache stores. Keys are hex digests, values are bytes."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryLRUCache(RenderCacheBackend):
+    """In-process LRU cache that evicts by total size of the stored values"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        # Values larger than the whole cache would only evict everything else
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._entries[key] = value
+            self.current_bytes += len(value)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def delete(self, key: str):
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                self.current_bytes -= len(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+class DiskCache(RenderCacheBackend):
+    """On-disk store, one file per key, shared by every process on the host"""
+
+    def __init__(self, location):
+        self.location = str(location)
+        os.makedirs(self.location, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        # Fan out into subdirectories so no single directory grows too large
+        return os.path.join(self.location, key[:2], key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, key: str, value: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so readers never see partial values
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def delete(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        for root, _, files in os.walk(self.location):
+            for name in files:
+                try:
+                    os.unlink(os.path.join(root, name))
+                except OSError:
+                    pass
+
+
+class TieredCache(RenderCacheBackend):
+    """Memory LRU in front of a disk store; disk hits are promoted to memory"""
+
+    def __init__(self, memory: MemoryLRUCache, disk: DiskCache):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: bytes):
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+
+def content_key(*parts: str) -> str:
+    """Hash the given strings into a cache key"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def create_backend(config: dict) -> RenderCacheBackend:
+    """Build a cache backend from a BLOG_RENDER_CACHE style dict"""
+    backend = config.get('BACKEND', 'tiered')
+    if backend == 'memory':
+        return MemoryLRUCache(config.get('MAX_BYTES', 64 * 1024 * 1024))
+    if backend == 'disk':
+        return DiskCache(config['LOCATION'])
+    if backend == 'tiered':
+        return TieredCache(
+            MemoryLRUCache(config.get('MAX_BYTES', 64 * 1024 * 1024)),
+            DiskCache(config['LOCATION'])
+        )
+    raise ValueError(f"Unknown render cache backend: {backend}")
+
+
+_render_cache = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCacheBackend:
+    """Return the process-wide render cache configured in settings"""
+    global _render_cache
+    with _render_cache_lock:
+        if _render_cache is None:
+            _render_cache = create_backend(settings.BLOG_RENDER_CACHE)
+        return _render_cache
@@ -0,0 +1,19 @@
+# backend/blog_generator/utils/render_worker.py
+
+from typing import Tuple
+
+# Runs in export worker processes, which are spawned rather than forked
+# (the parent may have job worker threads running). A spawned process starts
+# without Django set up, so this module imports no models at import time.
+
+
+def setup_worker():
+    """Process pool initializer: configure Django from DJANGO_SETTINGS_MODULE"""
+    import django
+    django.setup()
+
+
+def render_markdown(markdown_text: str) -> Tuple[bytes, str]:
+    """Render one document; runs in a worker process"""
+    from .markdown_utils import MarkdownConverter
+    return MarkdownConverter.render(markdown_text)
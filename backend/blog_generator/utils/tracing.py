@@ -0,0 +1,158 @@
+# backend/blog_generator/utils/tracing.py
+
+import asyncio
+import contextvars
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class Tracer:
+    """
+    Collects timing spans, counters and LLM token usage for one generation run.
+    Spans have a kind ('stage', 'tool', 'render', ...), a name and a duration.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Dict[str, int] = {}
+        self.usage: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, duration: float, **attrs):
+        span = {
+            'kind': kind,
+            'name': name,
+            'offset': round(time.perf_counter() - self.started - duration, 6),
+            'duration': round(duration, 6),
+        }
+        span.update(attrs)
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, kind: str, name: str, **attrs):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, time.perf_counter() - start, **attrs)
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_usage(self, **tokens):
+        with self._lock:
+            for name, value in tokens.items():
+                self.usage[name] = self.usage.get(name, 0) + int(value or 0)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+class NullTracer(Tracer):
+    """Tracer used when nothing is being traced; records nothing"""
+
+    def record(self, kind: str, name: str, duration: float, **attrs):
+        pass
+
+    def count(self, name: str, amount: int = 1):
+        pass
+
+    def add_usage(self, **tokens):
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+_current_tracer = contextvars.ContextVar('blog_tracer', default=NULL_TRACER)
+
+
+def current_tracer() -> Tracer:
+    return _current_tracer.get()
+
+
+@contextmanager
+def use_tracer(tracer: Tracer):
+    """Make tracer the current one for code running in this context"""
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+def trace_count(name: str, amount: int = 1):
+    current_tracer().count(name, amount)
+
+
+def traced_tool(name: str, func: Callable) -> Callable:
+    """Wrap a tool function (or coroutine function) so each call is recorded as a 'tool' span"""
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with current_tracer().span('tool', name):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with current_tracer().span('tool', name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(values: List[float]) -> Dict[str, Any]:
+    return {
+        'count': len(values),
+        'sum': round(sum(values), 6),
+        'p50': percentile(values, 0.5),
+        'p95': percentile(values, 0.95),
+    }
+
+
+def aggregate_traces(traces: Iterable) -> Dict[str, Any]:
+    """
+    Aggregate GenerationTrace rows into p50/p95 wall time per stage and per
+    tool, p50/p95 tokens per generation and summed counters.
+    """
+    stages: Dict[str, List[float]] = {}
+    tools: Dict[str, List[float]] = {}
+    totals: List[float] = []
+    tokens: Dict[str, List[float]] = {}
+    counters: Dict[str, int] = {}
+
+    for trace in traces:
+        totals.append(trace.total_seconds)
+        for span in trace.spans:
+            if span.get('kind') == 'stage':
+                stages.setdefault(span['name'], []).append(span['duration'])
+            elif span.get('kind') == 'tool':
+                tools.setdefault(span['name'], []).append(span['duration'])
+        for name in ('prompt_tokens', 'completion_tokens', 'cached_prompt_tokens', 'total_tokens'):
+            tokens.setdefault(name, []).append(getattr(trace, name))
+        for name, value in trace.counters.items():
+            counters[name] = counters.get(name, 0) + value
+
+    return {
+        'generations': summarize(totals),
+        'stages': {name: summarize(values) for name, values in stages.items()},
+        'tools': {name: summarize(values) for name, values in tools.items()},
+        'tokens': {name: summarize(values) for name, values in tokens.items()},
+        'counters': counters,
+    }
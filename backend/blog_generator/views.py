@@ -3,18 +3,104 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from .models import BlogPost
-from .serializers import BlogPostSerializer
-from .agents.blog_agents import BlogCrewAgent
-from .utils.markdown_utils import MarkdownConverter
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.views import APIView
+from .models import BlogPost, GenerationBatch, GenerationJob, GenerationStep, GenerationTrace
+from .serializers import (
+    BatchRequestSerializer, BlogPostSerializer, BlogPostSummarySerializer,
+    GenerationBatchSerializer, GenerationJobSerializer
+)
+from .pagination import BlogPostCursorPagination
+from .renderers import EventStreamRenderer, PassthroughRenderer, PrometheusRenderer
+from .utils.export import EXPORT_FORMATS, export_posts
+from .utils.generation_cache import get_generation_cache
+from .utils.job_events import astream_job_events, stream_job_events
+from .utils.job_queue import get_job_queue
+from .utils.post_search import filter_posts
+from .utils.http_utils import serve_file, stream_body
+from .utils.render_cache import content_key
+from .utils.tracing import aggregate_traces
+from io import BytesIO
 import os
 from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.utils.text import slugify
+from django.db.models import F, Prefetch
 import tempfile
 import json
 
+# Model columns behind serializer fields whose names differ
+FIELD_COLUMNS = {
+    'hash': ['content_hash'],
+    'markdown_content': ['content_data'],
+    'generated_content': ['content_data', 'generated_data'],
+}
+
+# How generate_blog may reuse earlier generations: identical requests only,
+# near-duplicates too, or never
+REUSE_MODES = ('exact', 'similar', 'never')
+
+def find_reusable(title, prompts, reuse, similar=True):
+    """
+    An earlier post that can answer this request under the reuse mode, and
+    the near-duplicates found when there is no exact match
+    """
+    cache = get_generation_cache() if reuse != 'never' else None
+    if cache is None:
+        return None, []
+    cached_post = cache.find_exact(title, prompts)
+    if cached_post is not None or not similar:
+        return cached_post, []
+    matches = cache.find_similar(title, prompts)
+    if reuse == 'similar' and matches:
+        return matches[0][0], matches
+    return None, matches
+
 class BlogPostViewSet(viewsets.ModelViewSet):
     queryset = BlogPost.objects.all()
     serializer_class = BlogPostSerializer
+    pagination_class = BlogPostCursorPagination
+
+    def requested_fields(self):
+        """Field names from the comma separated ?fields= parameter, or None"""
+        fields = self.request.query_params.get('fields')
+        if not fields:
+            return None
+        return [name.strip() for name in fields.split(',') if name.strip()]
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return BlogPostSummarySerializer
+        return BlogPostSerializer
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ('list', 'retrieve'):
+            kwargs.setdefault('fields', self.requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+
+        # ?q= full-text search, ?since= / ?until= on created_at
+        try:
+            queryset = filter_posts(queryset, self.request.query_params)
+        except ValueError as e:
+            raise ValidationError({"error": str(e)})
+
+        # Only load the columns the page will serialize; the large
+        # content columns are never read unless explicitly requested
+        fields = self.requested_fields() or BlogPostSummarySerializer.default_fields
+        model_fields = {field.name for field in BlogPost._meta.concrete_fields}
+        columns = {column for name in fields for column in FIELD_COLUMNS.get(name, [name])}
+        columns = (columns & model_fields) | {'id', 'created_at'}
+        queryset = queryset.only(*columns)
+        if 'size' in fields:
+            queryset = queryset.annotate(size=F('content_size'))
+        return queryset
+
     @action(detail=False, methods=['post'])
     def generate_blog(self, request):
         title = request.data.get('title')
@@ -26,89 +112,261 @@ class BlogPostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        reuse = request.data.get('reuse', 'exact')
+        if reuse not in REUSE_MODES:
+            return Response(
+                {"error": f"reuse must be one of: {', '.join(REUSE_MODES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
-            # Initialize CrewAI agent and generate content
-            agent = BlogCrewAgent()
-            generated_content = agent.generate_blog(title, prompts)
+            queue = get_job_queue()
+            cached_post, similar = find_reusable(title, prompts, reuse)
 
-            if not generated_content:
+            if cached_post is not None:
+                # Answer from the earlier generation without running the crew
+                job = queue.complete_from_cache(title, prompts, cached_post)
                 return Response(
-                    {"error": "Failed to generate content"},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                    GenerationJobSerializer(job, context={'request': request}).data,
+                    status=status.HTTP_200_OK
                 )
 
-            # Create blog post
-            blog_post = BlogPost.objects.create(
-                title=title,
-                prompts=prompts,
-                generated_content=generated_content,
-                markdown_content=generated_content
+            # Queue the generation; the worker pool runs the crew in the background
+            job = queue.enqueue(title, prompts)
+            data = GenerationJobSerializer(job, context={'request': request}).data
+            # Offer near-duplicates the client can use instead of waiting
+            data['similar_posts'] = [
+                {
+                    'id': post.id,
+                    'title': post.title,
+                    'created_at': post.created_at,
+                    'similarity': round(score, 3),
+                }
+                for post, score in similar
+            ]
+            return Response(data, status=status.HTTP_202_ACCEPTED)
+
+        except Exception as e:
+            print(f"Error queueing blog generation: {str(e)}")
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-            # Convert to PDF and get base64 string
-            try:
-                pdf_base64, html_content = MarkdownConverter.create_pdf(generated_content)
-                response_data = BlogPostSerializer(blog_post).data
-                response_data['pdf_base64'] = pdf_base64
-                response_data['html_content'] = html_content
-                
-                return Response(
-                    response_data,
-                    status=status.HTTP_201_CREATED
-                )
-            except Exception as pdf_error:
-                print(f"PDF generation error: {str(pdf_error)}")
-                # If PDF conversion fails, still return the blog post without PDF
-                return Response(
-                    BlogPostSerializer(blog_post).data,
-                    status=status.HTTP_201_CREATED
-                )
+    @action(detail=False, methods=['post'])
+    def generate_batch(self, request):
+        """
+        Queue many generations at once. At most max_concurrency of them run
+        at the same time; follow their progress at the returned batch URL.
+        """
+        serializer = BatchRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        data = serializer.validated_data
+        items = [(item['title'], item['prompts']) for item in data['items']]
+
+        try:
+            cached = {}
+            for index, (title, prompts) in enumerate(items):
+                cached_post, _ = find_reusable(title, prompts, data['reuse'], similar=False)
+                if cached_post is not None:
+                    cached[index] = cached_post
+
+            batch = get_job_queue().enqueue_batch(
+                items,
+                max_concurrency=data.get('max_concurrency', settings.BLOG_BATCH_CONCURRENCY),
+                cached=cached
+            )
+            batch = GenerationBatchViewSet.queryset.get(pk=batch.pk)
+            return Response(
+                GenerationBatchSerializer(batch, context={'request': request}).data,
+                status=status.HTTP_202_ACCEPTED
+            )
 
         except Exception as e:
-            print(f"Error generating blog: {str(e)}")
+            print(f"Error queueing blog batch: {str(e)}")
             return Response(
                 {"error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def retrieve(self, request, *args, **kwargs):
+    @action(detail=False, methods=['get'], renderer_classes=[PassthroughRenderer])
+    def export(self, request):
+        """
+        ZIP of the selected posts (?ids=1,2,3, default all, narrowed by the
+        list's ?q=/?since=/?until= filters) in the requested formats
+        (?formats=pdf,html,md), streamed while it is being written
+        """
+        formats = request.query_params.get('formats', ','.join(EXPORT_FORMATS)).split(',')
+        unknown = set(formats) - set(EXPORT_FORMATS)
+        if unknown:
+            return Response(
+                {"error": f"Unknown formats: {', '.join(sorted(unknown))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        posts = BlogPost.objects.order_by('id')
+        ids = request.query_params.get('ids')
+        if ids:
+            try:
+                posts = posts.filter(id__in=[int(value) for value in ids.split(',') if value])
+            except ValueError:
+                return Response(
+                    {"error": "ids must be a comma separated list of post ids"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        try:
+            posts = filter_posts(posts, request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            stream_body(export_posts(posts.iterator(chunk_size=50), formats, settings.BLOG_EXPORT_WORKERS)),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = 'attachment; filename="blog-export.zip"'
+        return response
+
+    def get_artifact_post(self):
+        """The requested post, with HTML/PDF rendered first if missing or stale"""
+        instance = self.get_object()
+        if instance.artifacts_stale:
+            instance.render_artifacts()
+        return instance
+
+    @action(detail=True, methods=['get'], renderer_classes=[PassthroughRenderer])
+    def pdf(self, request, pk=None):
+        instance = self.get_artifact_post()
+        if not instance.pdf_file:
+            raise Http404("No PDF available for this blog post")
+        return serve_file(
+            request,
+            instance.pdf_file.open('rb'),
+            instance.pdf_file.size,
+            'application/pdf',
+            etag=f"{instance.content_hash}.pdf",
+            last_modified=instance.rendered_at,
+            filename=f"{slugify(instance.title) or 'blog'}.pdf"
+        )
+
+    @action(detail=True, methods=['get'], renderer_classes=[PassthroughRenderer])
+    def html(self, request, pk=None):
+        instance = self.get_artifact_post()
+        content = instance.rendered_html.encode('utf-8')
+        return serve_file(
+            request,
+            BytesIO(content),
+            len(content),
+            'text/html; charset=utf-8',
+            etag=f"{instance.content_hash}.html",
+            last_modified=instance.rendered_at
+        )
+
+    @action(detail=True, methods=['get'], renderer_classes=[PassthroughRenderer])
+    def markdown(self, request, pk=None):
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        data = serializer.data
+        content = instance.markdown_content.encode('utf-8')
+        return serve_file(
+            request,
+            BytesIO(content),
+            len(content),
+            'text/markdown; charset=utf-8',
+            etag=f"{content_key(instance.markdown_content)}.md",
+            last_modified=instance.updated_at,
+            filename=f"{slugify(instance.title) or 'blog'}.md"
+        )
 
-        # Generate PDF for retrieved post
-        if instance.markdown_content:
+    def perform_update(self, serializer):
+        instance = serializer.save()
+        # Re-render once on write so reads keep serving stored files
+        if instance.artifacts_stale:
             try:
-                pdf_base64, html_content = MarkdownConverter.create_pdf(instance.markdown_content)
-                data['pdf_base64'] = pdf_base64
-                data['html_content'] = html_content
+                instance.render_artifacts()
             except Exception as e:
-                print(f"Error generating PDF: {str(e)}")
+                print(f"Error rendering blog {instance.id}: {str(e)}")
 
-        return Response(data)
+    def perform_destroy(self, instance):
+        # The model removes its stored PDF file and cached renders
+        instance.delete()
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        data = serializer.data
 
-        # Generate PDFs for each blog post
-        for item in data:
-            blog_post = queryset.get(id=item['id'])
-            if blog_post.markdown_content:
-                try:
-                    pdf_base64, html_content = MarkdownConverter.create_pdf(blog_post.markdown_content)
-                    item['pdf_base64'] = pdf_base64
-                    item['html_content'] = html_content
-                except Exception as e:
-                    print(f"Error generating PDF for blog {blog_post.id}: {str(e)}")
+class GenerationJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Poll the state, stage and result of queued blog generations"""
+    queryset = (
+        GenerationJob.objects
+        .select_related('blog_post')
+        .prefetch_related(Prefetch('steps', queryset=GenerationStep.objects.defer('output')))
+        .order_by('-created_at')
+    )
+    serializer_class = GenerationJobSerializer
 
-        return Response(data)
+    @action(detail=True, methods=['post'])
+    def resume(self, request, pk=None):
+        """Queue a failed job again; it restarts from its first incomplete step"""
+        job = self.get_object()
+        if not get_job_queue().resume(job):
+            return Response(
+                {"error": f"Only failed jobs can be resumed; this job is {job.status}"},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response(
+            self.get_serializer(job).data,
+            status=status.HTTP_202_ACCEPTED
+        )
 
+    @action(detail=True, methods=['get'], renderer_classes=[EventStreamRenderer, PassthroughRenderer])
+    def events(self, request, pk=None):
+        """
+        Server-Sent Events stream of stage changes, then the writer's markdown
+        as it is generated, ending with a done event. Reconnecting clients
+        resume after their Last-Event-ID (or ?after=).
+        """
+        job = self.get_object()
+        after = request.headers.get('Last-Event-ID') or request.query_params.get('after') or 0
+        try:
+            after = int(after)
+        except ValueError:
+            return Response(
+                {"error": "Last-Event-ID must be an event id"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
+        # Under ASGI the stream waits on the event loop instead of holding a worker thread
+        if settings.BLOG_ASYNC_STREAMING:
+            stream = astream_job_events(job.id, after)
+        else:
+            stream = stream_job_events(job.id, after)
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
 
-    def perform_destroy(self, instance):
-        # Clean up PDF file if it exists
-        if hasattr(instance, 'pdf_path') and instance.pdf_path:
-            MarkdownConverter.cleanup_pdf(instance.pdf_path)
-        instance.delete()
\ No newline at end of file
+
+class GenerationBatchViewSet(viewsets.ReadOnlyModelViewSet):
+    """Per-item progress of batches queued with generate_batch"""
+    queryset = (
+        GenerationBatch.objects
+        .prefetch_related(Prefetch('jobs', queryset=GenerationJob.objects.defer('prompts').order_by('id')))
+        .order_by('-created_at')
+    )
+    serializer_class = GenerationBatchSerializer
+
+
+class MetricsView(APIView):
+    """
+    p50/p95 wall time per stage and tool call, token usage and cache counters
+    over the most recent generations. ?format=prometheus for scraping.
+    """
+    renderer_classes = [JSONRenderer, BrowsableAPIRenderer, PrometheusRenderer]
+
+    def get(self, request):
+        window = settings.BLOG_METRICS_WINDOW
+        traces = GenerationTrace.objects.order_by('-created_at').only(
+            'total_seconds', 'prompt_tokens', 'completion_tokens',
+            'cached_prompt_tokens', 'total_tokens', 'spans', 'counters'
+        )[:window]
+        return Response(aggregate_traces(traces))
@@ -0,0 +1,6 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_maker_project.settings')
+os.environ.setdefault('BLOG_ASYNC_STREAMING', 'true')
+application = get_asgi_application()
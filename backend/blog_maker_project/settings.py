@@ -57,12 +57,17 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'blog_maker_project.wsgi.application'
+ASGI_APPLICATION = 'blog_maker_project.asgi.application'
 
 # Database
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Background job workers write concurrently with request threads
+            'timeout': 20,
+        },
     }
 }
 
@@ -110,8 +115,136 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# Uploaded and generated files (rendered blog PDFs)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # OpenAI API Configuration
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
\ No newline at end of file
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+
+# Background generation jobs. Web server processes start BLOG_JOB_WORKERS
+# worker threads; set it to 0 there when `manage.py run_job_workers` runs
+# the jobs in a dedicated process instead
+BLOG_JOB_WORKERS = int(os.getenv('BLOG_JOB_WORKERS', '4'))
+BLOG_JOB_POLL_INTERVAL = float(os.getenv('BLOG_JOB_POLL_INTERVAL', '1.0'))
+# Running jobs are marked alive regularly; one not marked for this many
+# seconds belonged to a process that died and is queued again
+BLOG_JOB_STALE_AFTER = float(os.getenv('BLOG_JOB_STALE_AFTER', '600'))
+# Server-Sent Events: how often a stream checks for new events, and how
+# long the writer's tokens are batched before they are stored
+BLOG_EVENT_POLL_INTERVAL = float(os.getenv('BLOG_EVENT_POLL_INTERVAL', '0.25'))
+BLOG_EVENT_FLUSH_INTERVAL = float(os.getenv('BLOG_EVENT_FLUSH_INTERVAL', '0.25'))
+# Give streamed responses (event streams, exports, files) async iterators.
+# Only for ASGI servers (asgi.py turns it on): each server type buffers the
+# whole body of a streaming response whose iterator is of the other kind
+BLOG_ASYNC_STREAMING = os.getenv('BLOG_ASYNC_STREAMING', 'false').lower() == 'true'
+
+# Cache for rendered PDF/HTML, keyed by markdown and renderer fingerprint.
+# BACKEND is one of 'memory', 'disk' or 'tiered' (memory in front of disk).
+BLOG_RENDER_CACHE = {
+    'BACKEND': os.getenv('BLOG_RENDER_CACHE_BACKEND', 'tiered'),
+    'LOCATION': os.getenv('BLOG_RENDER_CACHE_DIR', os.path.join(BASE_DIR, 'render_cache')),
+    'MAX_BYTES': int(os.getenv('BLOG_RENDER_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+}
+
+# Web search results, shared by all workers through a SQLite file
+BLOG_SEARCH_CACHE = {
+    'PATH': os.getenv('BLOG_SEARCH_CACHE_PATH', os.path.join(BASE_DIR, 'cache', 'search_cache.sqlite3')),
+    'TTL': int(os.getenv('BLOG_SEARCH_CACHE_TTL', str(24 * 3600))),
+    'MAX_ENTRIES': int(os.getenv('BLOG_SEARCH_CACHE_MAX_ENTRIES', '10000')),
+}
+
+# Scraper HTTP client: connection pool, per-host concurrency and on-disk HTTP cache
+BLOG_FETCH = {
+    'CACHE_DIR': os.getenv('BLOG_FETCH_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'http')),
+    'CACHE_MAX_BYTES': int(os.getenv('BLOG_FETCH_CACHE_MAX_BYTES', str(256 * 1024 * 1024))),
+    'CACHE_MAX_AGE': int(os.getenv('BLOG_FETCH_CACHE_MAX_AGE', str(7 * 24 * 3600))),
+    'MAX_PER_HOST': int(os.getenv('BLOG_FETCH_MAX_PER_HOST', '4')),
+    'POOL_SIZE': int(os.getenv('BLOG_FETCH_POOL_SIZE', '20')),
+    'TIMEOUT': float(os.getenv('BLOG_FETCH_TIMEOUT', '10')),
+    'MAX_WORKERS': int(os.getenv('BLOG_FETCH_MAX_WORKERS', '8')),
+}
+
+# How the scraper turns pages into text: 'streaming' (main-content detection) or 'soup'
+BLOG_SCRAPER_EXTRACTOR = os.getenv('BLOG_SCRAPER_EXTRACTOR', 'streaming')
+
+# Number of most recent generation traces aggregated by /api/metrics/
+BLOG_METRICS_WINDOW = int(os.getenv('BLOG_METRICS_WINDOW', '500'))
+
+# Parallel research stage run before the crew: sub-queries are searched and
+# their result pages scraped concurrently, then merged into one context
+BLOG_RESEARCH = {
+    'ENABLED': os.getenv('BLOG_RESEARCH_ENABLED', 'true').lower() == 'true',
+    'MAX_QUERIES': int(os.getenv('BLOG_RESEARCH_MAX_QUERIES', '6')),
+    'RESULTS_PER_QUERY': int(os.getenv('BLOG_RESEARCH_RESULTS_PER_QUERY', '3')),
+    'MAX_WORKERS': int(os.getenv('BLOG_RESEARCH_MAX_WORKERS', '8')),
+    'MAX_CONTEXT_CHARS': int(os.getenv('BLOG_RESEARCH_MAX_CONTEXT_CHARS', '12000')),
+}
+
+# Reuse of earlier generations for repeated requests. Posts older than MAX_AGE
+# seconds are never reused; near-duplicates need a MinHash similarity of at
+# least SIMILARITY over the normalized title and prompts.
+BLOG_GENERATION_CACHE = {
+    'ENABLED': os.getenv('BLOG_GENERATION_CACHE_ENABLED', 'true').lower() == 'true',
+    'MAX_AGE': int(os.getenv('BLOG_GENERATION_CACHE_MAX_AGE', str(7 * 24 * 3600))),
+    'SIMILARITY': float(os.getenv('BLOG_GENERATION_CACHE_SIMILARITY', '0.8')),
+    'MAX_CANDIDATES': int(os.getenv('BLOG_GENERATION_CACHE_MAX_CANDIDATES', '5000')),
+}
+
+# Agent LLM completions keyed by the exact request, for cheap retries and replay
+BLOG_LLM_CACHE = {
+    'ENABLED': os.getenv('BLOG_LLM_CACHE_ENABLED', 'true').lower() == 'true',
+    'PATH': os.getenv('BLOG_LLM_CACHE_PATH', os.path.join(BASE_DIR, 'cache', 'llm_cache.sqlite3')),
+    'TTL': int(os.getenv('BLOG_LLM_CACHE_TTL', str(7 * 24 * 3600))),
+    'MAX_ENTRIES': int(os.getenv('BLOG_LLM_CACHE_MAX_ENTRIES', '20000')),
+}
+
+# Outputs of the tasks of failed runs, so retrying a request resumes after
+# the last completed task
+BLOG_TASK_CHECKPOINTS = {
+    'PATH': os.getenv('BLOG_TASK_CHECKPOINTS_PATH', os.path.join(BASE_DIR, 'cache', 'task_checkpoints.sqlite3')),
+    'TTL': int(os.getenv('BLOG_TASK_CHECKPOINTS_TTL', str(24 * 3600))),
+}
+
+# Batch generation: default and maximum jobs of one batch running at once,
+# and the largest batch accepted
+BLOG_BATCH_CONCURRENCY = int(os.getenv('BLOG_BATCH_CONCURRENCY', '4'))
+BLOG_BATCH_MAX_CONCURRENCY = int(os.getenv('BLOG_BATCH_MAX_CONCURRENCY', '16'))
+BLOG_BATCH_MAX_ITEMS = int(os.getenv('BLOG_BATCH_MAX_ITEMS', '500'))
+
+# Bulk export: processes rendering stale posts (defaults to the CPU count)
+BLOG_EXPORT_WORKERS = int(os.getenv('BLOG_EXPORT_WORKERS', '0')) or None
+
+# Diagram fences rendered to inline SVG: Mermaid through the mermaid-cli,
+# graphviz through the dot binary. Missing tools leave the source as code.
+BLOG_DIAGRAMS = {
+    'MERMAID_CLI': os.getenv('BLOG_MERMAID_CLI', 'mmdc'),
+    'TIMEOUT': int(os.getenv('BLOG_DIAGRAM_TIMEOUT', '30')),
+}
+
+# Local research corpus: every scraped page is kept and indexed with FTS5,
+# and agents and the research stage look there before searching the web.
+# Pages older than MAX_AGE seconds count as stale; a research sub-query with
+# at least MIN_LOCAL_HITS fresh matches skips the web search.
+BLOG_RESEARCH_CORPUS = {
+    'ENABLED': os.getenv('BLOG_RESEARCH_CORPUS_ENABLED', 'true').lower() == 'true',
+    'PATH': os.getenv('BLOG_RESEARCH_CORPUS_PATH', os.path.join(BASE_DIR, 'cache', 'research_corpus.sqlite3')),
+    'MAX_AGE': int(os.getenv('BLOG_RESEARCH_CORPUS_MAX_AGE', str(7 * 24 * 3600))),
+    'CHUNK_CHARS': int(os.getenv('BLOG_RESEARCH_CORPUS_CHUNK_CHARS', '1200')),
+    'MAX_PAGES': int(os.getenv('BLOG_RESEARCH_CORPUS_MAX_PAGES', '50000')),
+    'RESULTS': int(os.getenv('BLOG_RESEARCH_CORPUS_RESULTS', '5')),
+    'MIN_LOCAL_HITS': int(os.getenv('BLOG_RESEARCH_CORPUS_MIN_LOCAL_HITS', '2')),
+}
+
+# Scraped pages are split into passages of about PASSAGE_CHARS, ranked against
+# the query with BM25, and the best are packed into MAX_TOKENS per tool result
+# instead of returning the first 5000 characters.
+BLOG_CONTEXT_PACKING = {
+    'ENABLED': os.getenv('BLOG_CONTEXT_PACKING_ENABLED', 'true').lower() == 'true',
+    'PASSAGE_CHARS': int(os.getenv('BLOG_CONTEXT_PACKING_PASSAGE_CHARS', '600')),
+    'MAX_TOKENS': int(os.getenv('BLOG_CONTEXT_PACKING_MAX_TOKENS', '800')),
+    'EXTRACT_CHARS': int(os.getenv('BLOG_CONTEXT_PACKING_EXTRACT_CHARS', '50000')),
+}
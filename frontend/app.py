@@ -10,6 +10,8 @@ import time
 class BlogGeneratorApp:
     def __init__(self):
         self.API_BASE_URL = "http://localhost:8000/api"
+        self.POLL_INTERVAL = 2  # seconds between job status checks
+        self.JOB_TIMEOUT = 1800  # give up polling after 30 minutes
     
     @staticmethod
     def display_pdf_base64(pdf_base64: str):
@@ -21,6 +23,82 @@ class BlogGeneratorApp:
         except Exception as e:
             st.error(f"Error displaying PDF: {str(e)}")
     
+    def fetch_pdf(self, blog_data: dict) -> Optional[bytes]:
+        """Download the raw PDF of a blog post from its binary endpoint"""
+        pdf_url = blog_data.get('links', {}).get('pdf')
+        if not pdf_url:
+            return None
+        try:
+            response = requests.get(pdf_url, timeout=120)
+            response.raise_for_status()
+            return response.content
+        except requests.exceptions.RequestException as e:
+            st.error(f"Error downloading PDF: {str(e)}")
+            return None
+
+    def wait_for_job(self, job_id: int) -> dict:
+        """Poll a generation job until it finishes, showing its current stage"""
+        status_box = st.empty()
+        deadline = time.time() + self.JOB_TIMEOUT
+        while time.time() < deadline:
+            response = requests.get(f"{self.API_BASE_URL}/jobs/{job_id}/", timeout=30)
+            job_data = response.json()
+            if job_data.get('status') in ('succeeded', 'failed'):
+                status_box.empty()
+                return job_data
+            stage = job_data.get('stage') or job_data.get('status')
+            status_box.info(f"Current stage: {stage}")
+            time.sleep(self.POLL_INTERVAL)
+        raise requests.exceptions.Timeout()
+
+    @staticmethod
+    def iter_sse(response):
+        """Yield (event, data) pairs from a Server-Sent Events response"""
+        event, data = 'message', []
+        for line in response.iter_lines(decode_unicode=True):
+            if line is None:
+                continue
+            if not line:
+                if data:
+                    yield event, json.loads('\n'.join(data))
+                event, data = 'message', []
+            elif line.startswith('event:'):
+                event = line[len('event:'):].strip()
+            elif line.startswith('data:'):
+                data.append(line[len('data:'):].strip())
+
+    def stream_job(self, job_id: int) -> dict:
+        """
+        Follow a generation job's event stream, showing the stage and the
+        post as it is written. Falls back to polling if the stream breaks.
+        """
+        status_box = st.empty()
+        preview = st.empty()
+        content = ""
+        try:
+            with requests.get(
+                f"{self.API_BASE_URL}/jobs/{job_id}/events/",
+                headers={"Accept": "text/event-stream"},
+                stream=True,
+                timeout=(10, 60)  # the server sends a keep-alive at least every 15 s
+            ) as response:
+                response.raise_for_status()
+                for event, data in self.iter_sse(response):
+                    if event == 'stage':
+                        status_box.info(f"Current stage: {data['stage']}")
+                    elif event == 'tokens':
+                        content += data['text']
+                        preview.markdown(content)
+                    elif event == 'done':
+                        status_box.empty()
+                        preview.empty()
+                        return data
+        except requests.exceptions.RequestException:
+            pass
+        status_box.empty()
+        preview.empty()
+        return self.wait_for_job(job_id)
+
     def generate_blog(self):
         st.write("### Create Your Blog Post")
         
@@ -44,16 +122,36 @@ class BlogGeneratorApp:
                     response = requests.post(
                         f"{self.API_BASE_URL}/blogs/generate_blog/",
                         json={"title": title, "prompts": prompts},
-                        timeout=300  # 5-minute timeout
+                        timeout=30
                     )
                     
                     try:
-                        blog_data = response.json()
+                        job_data = response.json()
                     except json.JSONDecodeError:
                         st.error(f"Invalid response from server: {response.text}")
                         return
 
-                    if response.status_code == 201:
+                    if response.status_code not in (200, 202):
+                        error_msg = job_data.get('error', 'Unknown error')
+                        st.error(f"Error generating blog: {error_msg}")
+                        return
+
+                    if response.status_code == 200:
+                        # Answered from an earlier generation of the same request
+                        st.info("Reusing a recently generated post for this request.")
+                    else:
+                        job_data = self.stream_job(job_data['id'])
+                    if job_data.get('status') == 'succeeded':
+                        response = requests.get(
+                            f"{self.API_BASE_URL}/blogs/{job_data['blog_post']}/",
+                            timeout=60
+                        )
+                        blog_data = response.json()
+                        pdf_bytes = self.fetch_pdf(blog_data)
+                    else:
+                        blog_data = {'error': job_data.get('error') or 'Unknown error'}
+
+                    if job_data.get('status') == 'succeeded' and response.status_code == 200:
                         st.success("Blog post generated successfully!")
                         
                         # Create tabs for different views
@@ -68,8 +166,8 @@ class BlogGeneratorApp:
                         
                         with tab2:
                             st.markdown("### PDF Preview")
-                            if 'pdf_base64' in blog_data and blog_data['pdf_base64']:
-                                self.display_pdf_base64(blog_data['pdf_base64'])
+                            if pdf_bytes:
+                                self.display_pdf_base64(base64.b64encode(pdf_bytes).decode('utf-8'))
                             else:
                                 st.warning("PDF preview not available")
                         
@@ -87,10 +185,9 @@ class BlogGeneratorApp:
                                 ):
                                     st.success("Markdown file downloaded!")
                         
-                        if 'pdf_base64' in blog_data and blog_data['pdf_base64']:
+                        if pdf_bytes:
                             with col2:
                                 try:
-                                    pdf_bytes = base64.b64decode(blog_data['pdf_base64'])
                                     if st.download_button(
                                         label="Download PDF",
                                         data=pdf_bytes,
@@ -105,7 +202,7 @@ class BlogGeneratorApp:
                         st.error(f"Error generating blog: {error_msg}")
                 
                 except requests.exceptions.Timeout:
-                    st.error("Request timed out. The server took too long to respond.")
+                    st.error("Timed out waiting for the blog post to be generated.")
                 except requests.exceptions.RequestException as e:
                     st.error(f"Error connecting to the server: {str(e)}")
                 except Exception as e: